@@ -0,0 +1,27 @@
+"""Add user last_seen column
+
+Revision ID: 3a7d9c2e5b18
+Revises: e1f6b8d3a942
+Create Date: 2026-10-17 21:14:08.302517
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3a7d9c2e5b18"
+down_revision: str | None = "e1f6b8d3a942"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("user", sa.Column("last_seen", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("user", "last_seen")
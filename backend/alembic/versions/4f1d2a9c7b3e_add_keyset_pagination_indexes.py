@@ -0,0 +1,30 @@
+"""Add keyset pagination indexes
+
+Revision ID: 4f1d2a9c7b3e
+Revises: c8368fa169ad
+Create Date: 2026-10-17 09:12:31.482113
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f1d2a9c7b3e"
+down_revision: str | None = "c8368fa169ad"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Composite (created_at, id) indexes serve both directions of the
+    # row-value comparison used by cursor pagination. Permissions page by
+    # (resource, action), which _resource_action_uc already indexes.
+    op.create_index("ix_user_created_at_id", "user", ["created_at", "id"], unique=False)
+    op.create_index("ix_role_created_at_id", "role", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_role_created_at_id", table_name="role")
+    op.drop_index("ix_user_created_at_id", table_name="user")
@@ -0,0 +1,61 @@
+"""Add file and file_blob tables
+
+Revision ID: 7c4e9a2b1d05
+Revises: d5a83c1e6f20
+Create Date: 2026-10-17 15:46:19.207731
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e9a2b1d05"
+down_revision: str | None = "d5a83c1e6f20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "file_blob",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_file_blob_id"), "file_blob", ["id"], unique=False)
+    op.create_index(op.f("ix_file_blob_sha256"), "file_blob", ["sha256"], unique=True)
+    op.create_table(
+        "file",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("original_filename", sa.String(length=255), nullable=False),
+        sa.Column("content_type", sa.String(length=100), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.Column("blob_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["blob_id"], ["file_blob.id"]),
+        sa.ForeignKeyConstraint(["owner_id"], ["user.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_file_id"), "file", ["id"], unique=False)
+    op.create_index(op.f("ix_file_name"), "file", ["name"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_file_name"), table_name="file")
+    op.drop_index(op.f("ix_file_id"), table_name="file")
+    op.drop_table("file")
+    op.drop_index(op.f("ix_file_blob_sha256"), table_name="file_blob")
+    op.drop_index(op.f("ix_file_blob_id"), table_name="file_blob")
+    op.drop_table("file_blob")
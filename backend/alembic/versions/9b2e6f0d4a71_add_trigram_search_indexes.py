@@ -0,0 +1,57 @@
+"""Add trigram search indexes
+
+Revision ID: 9b2e6f0d4a71
+Revises: 4f1d2a9c7b3e
+Create Date: 2026-10-17 11:04:52.913406
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2e6f0d4a71"
+down_revision: str | None = "4f1d2a9c7b3e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The indexed expressions must match app.utils.search.search_document exactly
+# for the planner to use them.
+USER_DOCUMENT = (
+    "coalesce(username, '') || ' ' || coalesce(email, '') || ' ' || "
+    "coalesce(full_name, '') || ' ' || coalesce(first_name, '') || ' ' || "
+    "coalesce(last_name, '')"
+)
+ROLE_DOCUMENT = (
+    "coalesce(name, '') || ' ' || coalesce(display_name, '') || ' ' || "
+    "coalesce(description, '')"
+)
+PERMISSION_DOCUMENT = (
+    "coalesce(name, '') || ' ' || coalesce(display_name, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(resource, '') || ' ' || "
+    "coalesce(action, '')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        'CREATE INDEX ix_user_search_trgm ON "user" '
+        f"USING gin (({USER_DOCUMENT}) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_role_search_trgm ON role "
+        f"USING gin (({ROLE_DOCUMENT}) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_permission_search_trgm ON permission "
+        f"USING gin (({PERMISSION_DOCUMENT}) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    # pg_trgm is left installed; other objects may depend on it.
+    op.drop_index("ix_permission_search_trgm", table_name="permission")
+    op.drop_index("ix_role_search_trgm", table_name="role")
+    op.drop_index("ix_user_search_trgm", table_name="user")
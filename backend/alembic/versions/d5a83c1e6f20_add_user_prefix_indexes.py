@@ -0,0 +1,41 @@
+"""Add user prefix indexes
+
+Revision ID: d5a83c1e6f20
+Revises: 9b2e6f0d4a71
+Create Date: 2026-10-17 13:27:08.551294
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a83c1e6f20"
+down_revision: str | None = "9b2e6f0d4a71"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # text_pattern_ops lets LIKE 'prefix%' use the btree regardless of the
+    # database collation.
+    op.create_index(
+        "ix_user_username_prefix",
+        "user",
+        [sa.text("lower(username) text_pattern_ops")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_user_full_name_prefix",
+        "user",
+        [sa.text("lower(full_name) text_pattern_ops")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_full_name_prefix", table_name="user")
+    op.drop_index("ix_user_username_prefix", table_name="user")
@@ -0,0 +1,34 @@
+"""Add file listing indexes
+
+Revision ID: e1f6b8d3a942
+Revises: 7c4e9a2b1d05
+Create Date: 2026-10-17 17:02:44.618350
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f6b8d3a942"
+down_revision: str | None = "7c4e9a2b1d05"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # (created_at, id) serves the unfiltered cursor listing; the owner-led
+    # index serves per-owner listings and owner lookups.
+    op.create_index("ix_file_created_at_id", "file", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_file_owner_id_created_at_id",
+        "file",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_file_owner_id_created_at_id", table_name="file")
+    op.drop_index("ix_file_created_at_id", table_name="file")
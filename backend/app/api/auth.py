@@ -2,10 +2,19 @@
 Authentication API routes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import (
+    get_current_principal,
+    get_current_user,
+    get_db,
+    get_token_payload,
+)
+from app.core.permissions import AuthPrincipal
+from app.core.revocation import get_token_denylist
 from app.models.user import User
 from app.schemas.auth import (
     AuthUser,
@@ -13,25 +22,37 @@ from app.schemas.auth import (
     PasswordReset,
     PasswordResetRequest,
     RefreshToken,
+    SessionInfo,
     UserLogin,
     UserRegister,
 )
 from app.schemas.common import Message
 from app.services.auth import AuthService
+from app.services.sessions import SessionStoreUnavailableError, get_session_registry
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
+async def login(
+    user_credentials: UserLogin,
+    user_agent: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
     """User login."""
     auth_service = AuthService(db)
 
-    login_result = await auth_service.login(
-        username=user_credentials.username,
-        password=user_credentials.password,
-        remember_me=user_credentials.remember_me,
-    )
+    try:
+        login_result = await auth_service.login(
+            username=user_credentials.username,
+            password=user_credentials.password,
+            remember_me=user_credentials.remember_me,
+            device=user_agent[:200] if user_agent else None,
+        )
+    except SessionStoreUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        ) from e
 
     if not login_result:
         raise HTTPException(
@@ -64,7 +85,12 @@ async def refresh_token(refresh_data: RefreshToken, db: AsyncSession = Depends(g
     """Refresh access token."""
     auth_service = AuthService(db)
 
-    token_data = await auth_service.refresh_token(refresh_data.refresh_token)
+    try:
+        token_data = await auth_service.refresh_token(refresh_data.refresh_token)
+    except SessionStoreUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        ) from e
 
     if not token_data:
         raise HTTPException(
@@ -77,12 +103,59 @@ async def refresh_token(refresh_data: RefreshToken, db: AsyncSession = Depends(g
 
 
 @router.post("/logout", response_model=Message)
-async def logout(current_user: User = Depends(get_current_user)):
-    """User logout."""
-    # TODO: Implement token blacklisting if needed
+async def logout(
+    payload: dict[str, Any] = Depends(get_token_payload),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """User logout.
+
+    Ends the token's session, which revokes its refresh token and every
+    access token issued under it.
+    """
+    await get_token_denylist().revoke(payload)
+
+    if payload.get("sid"):
+        await get_session_registry().end(payload["sid"], current_user.id)
+
     return Message(message="Logged out successfully")
 
 
+@router.post("/logout-all", response_model=Message)
+async def logout_everywhere(
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """End every session of the current user, on every device."""
+    ended = await get_session_registry().end_all(current_user.id)
+    return Message(message=f"Logged out of {ended} sessions")
+
+
+@router.get("/sessions", response_model=list[SessionInfo])
+async def list_sessions(
+    payload: dict[str, Any] = Depends(get_token_payload),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """List the current user's active sessions."""
+    sessions = await get_session_registry().list_for_user(current_user.id)
+    return [
+        SessionInfo(**session, current=session["session_id"] == payload.get("sid"))
+        for session in sessions
+    ]
+
+
+@router.delete("/sessions/{session_id}", response_model=Message)
+async def end_session(
+    session_id: str,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """End one of the current user's sessions."""
+    if not await get_session_registry().end(session_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
+        )
+
+    return Message(message="Session ended")
+
+
 @router.post("/password-reset-request", response_model=Message)
 async def request_password_reset(
     reset_request: PasswordResetRequest, db: AsyncSession = Depends(get_db)
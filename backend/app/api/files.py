@@ -2,16 +2,41 @@
 File upload and management API endpoints.
 """
 
+import mimetypes
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.deps import get_current_user, get_db
-from app.models.user import User
+from app.core.deps import get_current_principal, get_db
+from app.core.permissions import AuthPrincipal
+from app.schemas.file import UploadSessionCreate
+from app.services.counting import CountStrategy, cursor_page_strategy
+from app.services.file import FileService
+from app.services.storage import (
+    BlobStore,
+    ShardedDirectory,
+    UploadSession,
+    UploadSessionError,
+    UploadSessionStore,
+    UploadTooLargeError,
+    iter_upload_file,
+)
+from app.services.thumbnails import get_thumbnail_generator
 from app.utils.helpers import generate_uuid_string, safe_filename
+from app.utils.http import format_http_date, is_not_modified
 from app.utils.validators import validate_file_extension, validate_file_size
 
 router = APIRouter()
@@ -20,12 +45,55 @@ router = APIRouter()
 UPLOAD_DIR = Path(settings.upload_dir)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Files uploaded before content-addressed storage, by their public name
+legacy_files = ShardedDirectory(UPLOAD_DIR)
+blob_store = BlobStore(UPLOAD_DIR / "blobs")
+blob_store.root.mkdir(exist_ok=True)
+upload_sessions = UploadSessionStore(UPLOAD_DIR / ".sessions")
+
+
+def _unique_filename(original_filename: str) -> str:
+    """Generate a unique storage name keeping the original extension."""
+    file_extension = (
+        original_filename.rsplit(".", maxsplit=1)[-1]
+        if "." in original_filename
+        else ""
+    )
+    return (
+        f"{generate_uuid_string()}.{file_extension}"
+        if file_extension
+        else generate_uuid_string()
+    )
+
+
+async def _schedule_thumbnails(stored_file) -> None:
+    """Render resized variants of an uploaded image in the background."""
+    source = await blob_store.locate(stored_file.sha256)
+    if source:
+        get_thumbnail_generator().schedule(
+            stored_file.sha256, source, stored_file.original_filename
+        )
+
+
+def _file_info(stored_file) -> dict:
+    """Describe a stored file."""
+    return {
+        "id": stored_file.id,
+        "filename": stored_file.name,
+        "original_filename": stored_file.original_filename,
+        "size": stored_file.size,
+        "sha256": stored_file.sha256,
+        "content_type": stored_file.content_type,
+        "created_at": stored_file.created_at,
+        "url": f"/api/files/{stored_file.name}",
+    }
+
 
 @router.post("/upload")
 async def upload_file(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Upload a file."""
     # Validate file extension
@@ -35,56 +103,46 @@ async def upload_file(
             detail=f"File type not allowed. Allowed types: {', '.join(settings.allowed_extensions)}",
         )
 
-    # Read file content to check size
-    content = await file.read()
-    file_size = len(content)
-
-    # Validate file size
-    if not validate_file_size(file_size, settings.max_file_size):
+    # Reject early when the multipart part already declares its size
+    if file.size is not None and not validate_file_size(
+        file.size, settings.max_file_size
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File too large. Maximum size: {settings.max_file_size} bytes",
         )
 
-    # Generate unique filename
-    file_extension = file.filename.split(".")[-1] if "." in file.filename else ""
-    unique_filename = (
-        f"{generate_uuid_string()}.{file_extension}"
-        if file_extension
-        else generate_uuid_string()
-    )
-
-    # Save file
-    file_path = UPLOAD_DIR / unique_filename
-
+    # Stream file to disk, enforcing the size limit as it is copied, then
+    # store it once per distinct content
+    file_service = FileService(db, blob_store)
     try:
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
-
-        return {
-            "filename": unique_filename,
-            "original_filename": file.filename,
-            "size": file_size,
-            "content_type": file.content_type,
-            "url": f"/api/files/{unique_filename}",
-        }
-
-    except Exception:
-        # Clean up file if something went wrong
-        if file_path.exists():
-            file_path.unlink()
-
+        staged = await blob_store.stage(iter_upload_file(file))
+        stored_file = await file_service.create(
+            staged,
+            name=_unique_filename(file.filename),
+            original_filename=file.filename,
+            content_type=file.content_type,
+            owner_id=current_user.id,
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save file",
-        )
+        ) from e
+
+    await _schedule_thumbnails(stored_file)
+    return _file_info(stored_file)
 
 
 @router.post("/upload-multiple")
 async def upload_multiple_files(
     files: list[UploadFile] = File(...),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Upload multiple files."""
     if len(files) > 10:  # Limit to 10 files at once
@@ -93,6 +151,7 @@ async def upload_multiple_files(
             detail="Too many files. Maximum 10 files allowed",
         )
 
+    file_service = FileService(db, blob_store)
     uploaded_files = []
     failed_files = []
 
@@ -108,46 +167,21 @@ async def upload_multiple_files(
                 )
                 continue
 
-            # Read file content to check size
-            content = await file.read()
-            file_size = len(content)
-
-            # Validate file size
-            if not validate_file_size(file_size, settings.max_file_size):
-                failed_files.append(
-                    {
-                        "filename": file.filename,
-                        "error": f"File too large. Maximum size: {settings.max_file_size} bytes",
-                    }
-                )
-                continue
-
-            # Generate unique filename
-            file_extension = (
-                file.filename.split(".")[-1] if "." in file.filename else ""
+            # Stream file to disk, enforcing the size limit as it is copied
+            staged = await blob_store.stage(iter_upload_file(file))
+            stored_file = await file_service.create(
+                staged,
+                name=_unique_filename(file.filename),
+                original_filename=file.filename,
+                content_type=file.content_type,
+                owner_id=current_user.id,
             )
-            unique_filename = (
-                f"{generate_uuid_string()}.{file_extension}"
-                if file_extension
-                else generate_uuid_string()
-            )
-
-            # Save file
-            file_path = UPLOAD_DIR / unique_filename
 
-            with open(file_path, "wb") as buffer:
-                buffer.write(content)
-
-            uploaded_files.append(
-                {
-                    "filename": unique_filename,
-                    "original_filename": file.filename,
-                    "size": file_size,
-                    "content_type": file.content_type,
-                    "url": f"/api/files/{unique_filename}",
-                }
-            )
+            await _schedule_thumbnails(stored_file)
+            uploaded_files.append(_file_info(stored_file))
 
+        except UploadTooLargeError as e:
+            failed_files.append({"filename": file.filename, "error": str(e)})
         except Exception:
             failed_files.append(
                 {"filename": file.filename, "error": "Failed to save file"}
@@ -161,17 +195,240 @@ async def upload_multiple_files(
     }
 
 
+def _session_status(session: UploadSession, received: list[int]) -> dict:
+    """Describe an upload session and the byte ranges received so far."""
+    ranges = []
+    for part_number in received:
+        start, end = session.part_range(part_number)
+        if ranges and ranges[-1][1] == start:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+
+    return {
+        "upload_id": session.upload_id,
+        "filename": session.filename,
+        "size": session.size,
+        "part_size": session.part_size,
+        "part_count": session.part_count,
+        "received_parts": received,
+        "received_ranges": ranges,
+        "received_bytes": sum(end - start for start, end in ranges),
+    }
+
+
+async def _get_upload_session(upload_id: str, owner_id: int) -> UploadSession:
+    """Get an upload session owned by the current user."""
+    session = await upload_sessions.get(upload_id)
+    if not session or session.owner_id != owner_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found"
+        )
+    return session
+
+
+@router.post("/uploads")
+async def create_upload_session(
+    upload_data: UploadSessionCreate,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """Start a resumable upload.
+
+    The client then PUTs each part's raw bytes to
+    /uploads/{upload_id}/parts/{n} (in any order, retrying as needed) and
+    finally POSTs /uploads/{upload_id}/complete.
+    """
+    if not validate_file_extension(upload_data.filename, settings.allowed_extensions):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {', '.join(settings.allowed_extensions)}",
+        )
+
+    if not validate_file_size(upload_data.size, settings.max_upload_size):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum size: {settings.max_upload_size} bytes",
+        )
+
+    part_size = upload_data.part_size or settings.upload_part_size
+    if not validate_file_size(part_size, settings.max_upload_part_size):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Part too large. Maximum size: {settings.max_upload_part_size} bytes",
+        )
+    # Only a file sent as a single part may have it smaller
+    if part_size < min(settings.min_upload_part_size, upload_data.size):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Part too small. Minimum size: {settings.min_upload_part_size} bytes",
+        )
+    if -(-upload_data.size // part_size) > settings.max_upload_parts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many parts. Maximum: {settings.max_upload_parts}",
+        )
+
+    await upload_sessions.purge_expired(settings.upload_session_ttl)
+    session = await upload_sessions.create(
+        owner_id=current_user.id,
+        filename=upload_data.filename,
+        size=upload_data.size,
+        part_size=part_size,
+        content_type=upload_data.content_type,
+    )
+    return _session_status(session, [])
+
+
+@router.get("/uploads/{upload_id}")
+async def get_upload_session(
+    upload_id: str,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """Get received parts and byte ranges of a resumable upload."""
+    session = await _get_upload_session(upload_id, current_user.id)
+    received = await upload_sessions.received_parts(session)
+    return _session_status(session, received)
+
+
+@router.put("/uploads/{upload_id}/parts/{part_number}")
+async def upload_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """Upload one part of a resumable upload as the raw request body."""
+    session = await _get_upload_session(upload_id, current_user.id)
+
+    try:
+        stored = await upload_sessions.save_part(session, part_number, request.stream())
+    except (UploadSessionError, UploadTooLargeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+    return {"part_number": part_number, "size": stored.size, "sha256": stored.sha256}
+
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_upload_session(
+    upload_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """Assemble the parts of a resumable upload into a stored file."""
+    session = await _get_upload_session(upload_id, current_user.id)
+
+    try:
+        staged = await upload_sessions.complete(session, blob_store.staging_path())
+    except UploadSessionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+    file_service = FileService(db, blob_store)
+    stored_file = await file_service.create(
+        staged,
+        name=_unique_filename(session.filename),
+        original_filename=session.filename,
+        content_type=session.content_type,
+        owner_id=current_user.id,
+    )
+    await _schedule_thumbnails(stored_file)
+    return _file_info(stored_file)
+
+
+@router.delete("/uploads/{upload_id}")
+async def abort_upload_session(
+    upload_id: str,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """Abort a resumable upload and discard its parts."""
+    session = await _get_upload_session(upload_id, current_user.id)
+    await upload_sessions.abort(session)
+    return {"message": "Upload aborted"}
+
+
 @router.get("/{filename}")
 async def download_file(
+    *,
     filename: str,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    inline: bool = Query(False),
+    w: int | None = Query(None, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
-    """Download a file."""
+    """Download a file.
+
+    Supports Range requests and conditional GETs (If-None-Match,
+    If-Modified-Since). With inline=true the file is served with its type
+    guessed from the original name for in-browser previews.
+
+    For images, w asks for a variant at least that many pixels wide. The
+    narrowest such variant is served, or the original if it is smaller or
+    its variants are still being rendered.
+    """
     # Sanitize filename
     safe_name = safe_filename(filename)
-    file_path = UPLOAD_DIR / safe_name
 
-    if not file_path.exists():
+    file_service = FileService(db, blob_store)
+    stored_file = await file_service.get_by_name(safe_name)
+    if stored_file:
+        path = await blob_store.locate(stored_file.sha256)
+        if path is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+            )
+
+        etag = f'"{stored_file.sha256}"'
+        serve_name = stored_file.original_filename
+
+        if w is not None:
+            thumbnails = get_thumbnail_generator()
+            variant = await thumbnails.find(
+                stored_file.sha256, stored_file.original_filename, w
+            )
+            if variant:
+                path, width = variant
+                etag = f'"{stored_file.sha256}-w{width}"'
+                serve_name = f"{Path(serve_name).stem}-w{width}{path.suffix}"
+            elif not await thumbnails.is_rendered(stored_file.sha256):
+                # Images stored before variants existed get them on demand
+                thumbnails.schedule(
+                    stored_file.sha256, path, stored_file.original_filename
+                )
+
+        # Content behind a name never changes, so the content hash is a
+        # strong validator and clients can always revalidate cheaply. Once a
+        # variant is ready the ETag changes and clients pick it up.
+        headers = {
+            "ETag": etag,
+            "Last-Modified": format_http_date(stored_file.created_at),
+            "Cache-Control": "private, no-cache",
+            "X-Content-Type-Options": "nosniff",
+        }
+        if is_not_modified(request.headers, etag, stored_file.created_at):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        # FileResponse answers Range/If-Range requests with 206 and uses the
+        # server's zero-copy pathsend extension when it is available.
+        media_type = "application/octet-stream"
+        if inline:
+            media_type = mimetypes.guess_type(serve_name)[0] or media_type
+        return FileResponse(
+            path=path,
+            filename=serve_name,
+            media_type=media_type,
+            headers=headers,
+            content_disposition_type="inline" if inline else "attachment",
+        )
+
+    # Files uploaded before content-addressed storage, in the flat or the
+    # sharded layout depending on whether they have been migrated yet
+    file_path = await legacy_files.locate(safe_name)
+
+    if file_path is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
         )
@@ -185,14 +442,20 @@ async def download_file(
 async def delete_file(
     filename: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Delete a file."""
     # Sanitize filename
     safe_name = safe_filename(filename)
-    file_path = UPLOAD_DIR / safe_name
 
-    if not file_path.exists():
+    file_service = FileService(db, blob_store)
+    if await file_service.delete(safe_name):
+        return {"message": "File deleted successfully"}
+
+    # Files uploaded before content-addressed storage, in either layout
+    file_path = await legacy_files.locate(safe_name)
+
+    if file_path is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
         )
@@ -210,25 +473,37 @@ async def delete_file(
 
 @router.get("/")
 async def list_files(
-    current_user: User = Depends(get_current_user),
+    *,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
+    owner_id: int | None = Query(None),
+    count: CountStrategy = Query(CountStrategy.EXACT),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
-    """List all uploaded files."""
-    files = []
-
-    for file_path in UPLOAD_DIR.iterdir():
-        if file_path.is_file():
-            stat = file_path.stat()
-            files.append(
-                {
-                    "filename": file_path.name,
-                    "size": stat.st_size,
-                    "created_at": stat.st_ctime,
-                    "modified_at": stat.st_mtime,
-                    "url": f"/api/files/{file_path.name}",
-                }
-            )
+    """List uploaded files, newest first, with cursor pagination.
+
+    Pass the returned next_cursor (or prev_cursor) back as cursor to move
+    between pages.
+    """
+    file_service = FileService(db, blob_store)
+
+    try:
+        file_page = await file_service.get_all_by_cursor(
+            limit=limit, cursor=cursor, owner_id=owner_id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from e
+    total = await file_service.count_files(
+        owner_id=owner_id, count_strategy=cursor_page_strategy(count, cursor)
+    )
 
     return {
-        "files": files,
-        "total": len(files),
+        "files": [_file_info(stored_file) for stored_file in file_page.items],
+        "total": total.total,
+        "total_is_exact": total.exact,
+        "next_cursor": file_page.next_cursor,
+        "prev_cursor": file_page.prev_cursor,
     }
@@ -0,0 +1,34 @@
+"""
+Public signing key discovery routes.
+"""
+
+from fastapi import APIRouter, Request, Response, status
+
+from app.core.config import settings
+from app.core.signing import get_key_ring
+from app.utils.http import is_not_modified
+
+router = APIRouter()
+
+
+@router.get("/.well-known/jwks.json")
+async def get_jwks(request: Request):
+    """Publish the public keys that verify this service's tokens.
+
+    Other services verify tokens offline against this key set, matching the
+    kid header of each token. Responses may be cached for JWKS_MAX_AGE
+    seconds and revalidated with If-None-Match.
+    """
+    key_ring = get_key_ring()
+    headers = {
+        "ETag": key_ring.jwks_etag,
+        "Cache-Control": f"public, max-age={settings.jwks_max_age}",
+    }
+    if is_not_modified(request.headers, key_ring.jwks_etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(
+        content=key_ring.jwks_body,
+        media_type="application/jwk-set+json",
+        headers=headers,
+    )
@@ -2,44 +2,126 @@
 Permission management API endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.deps import get_db, require_permission
-from app.models.user import User
+from app.core.deps import get_db, get_session_factory, require_permission
+from app.core.permissions import AuthPrincipal
 from app.schemas.permission import (
     PermissionCreate,
     PermissionResponse,
     PermissionUpdate,
 )
+from app.services.counting import CountStrategy
 from app.services.permission import PermissionService
+from app.utils.pagination import set_cursor_headers, set_total_count_headers
+from app.utils.records import RecordFormat, export_response
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[PermissionResponse])
 async def get_permissions(
+    *,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: str | None = Query(None),
     resource: str | None = Query(None),
     action: str | None = Query(None),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: str | None = Query(None),
+    count: CountStrategy = Query(CountStrategy.EXACT),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("permission:read")),
+    current_user: AuthPrincipal = Depends(require_permission("permission:read")),
 ):
-    """Get all permissions with pagination and filtering."""
+    """Get all permissions with pagination and filtering.
+
+    In cursor mode the next/previous page cursors are returned in the
+    X-Next-Cursor and X-Prev-Cursor headers. In offset mode the total is
+    returned in X-Total-Count, computed with the requested count strategy.
+    """
     permission_service = PermissionService(db)
+
+    if cursor or pagination == "cursor":
+        try:
+            permission_page = await permission_service.get_all_by_cursor(
+                limit=limit,
+                cursor=cursor,
+                search=search,
+                resource=resource,
+                action=action,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            ) from e
+        set_cursor_headers(response, permission_page)
+        return permission_page.items
+
     permissions, total = await permission_service.get_all(
-        skip=skip, limit=limit, search=search, resource=resource, action=action
+        skip=skip,
+        limit=limit,
+        search=search,
+        resource=resource,
+        action=action,
+        count_strategy=count,
     )
+    set_total_count_headers(response, total.total, total.exact)
     return permissions
 
 
+PERMISSION_EXPORT_FIELDS = [
+    "id",
+    "name",
+    "display_name",
+    "description",
+    "resource",
+    "action",
+    "is_active",
+    "is_system",
+    "created_at",
+    "updated_at",
+]
+
+
+@router.get("/export")
+async def export_permissions(
+    *,
+    export_format: RecordFormat = Query(RecordFormat.CSV, alias="format"),
+    gzip: bool = Query(False),
+    search: str | None = Query(None),
+    resource: str | None = Query(None),
+    action: str | None = Query(None),
+    is_active: bool | None = Query(None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    current_user: AuthPrincipal = Depends(require_permission("permission:read")),
+):
+    """Export permissions matching filters as CSV or NDJSON.
+
+    Rows are streamed from a server-side cursor as they are fetched.
+    """
+
+    async def records():
+        async with session_factory() as session:
+            async for permission in PermissionService(session).stream_permissions(
+                search=search, resource=resource, action=action, is_active=is_active
+            ):
+                yield {
+                    field: getattr(permission, field)
+                    for field in PERMISSION_EXPORT_FIELDS
+                }
+
+    return export_response(
+        records(), PERMISSION_EXPORT_FIELDS, export_format, "permissions", gzip=gzip
+    )
+
+
 @router.get("/{permission_id}", response_model=PermissionResponse)
 async def get_permission(
     permission_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("permission:read")),
+    current_user: AuthPrincipal = Depends(require_permission("permission:read")),
 ):
     """Get permission by ID."""
     permission_service = PermissionService(db)
@@ -57,7 +139,7 @@ async def get_permission(
 async def create_permission(
     permission_data: PermissionCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("permission:create")),
+    current_user: AuthPrincipal = Depends(require_permission("permission:create")),
 ):
     """Create a new permission."""
     permission_service = PermissionService(db)
@@ -79,7 +161,7 @@ async def update_permission(
     permission_id: int,
     permission_data: PermissionUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("permission:update")),
+    current_user: AuthPrincipal = Depends(require_permission("permission:update")),
 ):
     """Update permission by ID."""
     permission_service = PermissionService(db)
@@ -110,7 +192,7 @@ async def update_permission(
 async def delete_permission(
     permission_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("permission:delete")),
+    current_user: AuthPrincipal = Depends(require_permission("permission:delete")),
 ):
     """Delete permission by ID."""
     permission_service = PermissionService(db)
@@ -151,7 +233,7 @@ async def delete_permission(
 @router.get("/resources/", response_model=list[str])
 async def get_permission_resources(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("permission:read")),
+    current_user: AuthPrincipal = Depends(require_permission("permission:read")),
 ):
     """Get all unique permission resources."""
     permission_service = PermissionService(db)
@@ -162,7 +244,7 @@ async def get_permission_resources(
 @router.get("/actions/", response_model=list[str])
 async def get_permission_actions(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("permission:read")),
+    current_user: AuthPrincipal = Depends(require_permission("permission:read")),
 ):
     """Get all unique permission actions."""
     permission_service = PermissionService(db)
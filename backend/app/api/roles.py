@@ -2,36 +2,118 @@
 Role management API endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.deps import get_db, require_permission
-from app.models.user import User
-from app.schemas.role import RoleCreate, RoleResponse, RoleUpdate
+from app.core.deps import get_db, get_session_factory, require_permission
+from app.core.permissions import AuthPrincipal
+from app.schemas.common import AssignmentResult
+from app.schemas.role import (
+    RoleCreate,
+    RolePermissionsBulkAssign,
+    RolePermissionsReplace,
+    RoleResponse,
+    RoleUpdate,
+)
+from app.services.counting import CountStrategy
 from app.services.role import RoleService
+from app.utils.pagination import set_cursor_headers, set_total_count_headers
+from app.utils.records import RecordFormat, export_response
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[RoleResponse])
 async def get_roles(
+    *,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: str | None = Query(None),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: str | None = Query(None),
+    count: CountStrategy = Query(CountStrategy.EXACT),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("role:read")),
+    current_user: AuthPrincipal = Depends(require_permission("role:read")),
 ):
-    """Get all roles with pagination and search."""
+    """Get all roles with pagination and search.
+
+    In cursor mode the next/previous page cursors are returned in the
+    X-Next-Cursor and X-Prev-Cursor headers. In offset mode the total is
+    returned in X-Total-Count, computed with the requested count strategy.
+    """
     role_service = RoleService(db)
-    roles, total = await role_service.get_all(skip=skip, limit=limit, search=search)
+
+    if cursor or pagination == "cursor":
+        try:
+            role_page = await role_service.get_all_by_cursor(
+                limit=limit, cursor=cursor, search=search
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            ) from e
+        set_cursor_headers(response, role_page)
+        return role_page.items
+
+    roles, total = await role_service.get_all(
+        skip=skip, limit=limit, search=search, count_strategy=count
+    )
+    set_total_count_headers(response, total.total, total.exact)
     return roles
 
 
+ROLE_EXPORT_FIELDS = [
+    "id",
+    "name",
+    "display_name",
+    "description",
+    "is_active",
+    "is_system",
+    "created_at",
+    "updated_at",
+    "permissions",
+]
+
+
+@router.get("/export")
+async def export_roles(
+    *,
+    export_format: RecordFormat = Query(RecordFormat.CSV, alias="format"),
+    gzip: bool = Query(False),
+    search: str | None = Query(None),
+    is_active: bool | None = Query(None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    current_user: AuthPrincipal = Depends(require_permission("role:read")),
+):
+    """Export roles matching filters as CSV or NDJSON.
+
+    Rows are streamed from a server-side cursor as they are fetched.
+    Permission names are listed in the permissions field, separated by
+    semicolons in CSV.
+    """
+
+    async def records():
+        async with session_factory() as session:
+            async for role in RoleService(session).stream_roles(
+                search=search, is_active=is_active
+            ):
+                record = {field: getattr(role, field) for field in ROLE_EXPORT_FIELDS}
+                record["permissions"] = [
+                    permission.name for permission in role.permissions
+                ]
+                yield record
+
+    return export_response(
+        records(), ROLE_EXPORT_FIELDS, export_format, "roles", gzip=gzip
+    )
+
+
 @router.get("/{role_id}", response_model=RoleResponse)
 async def get_role(
     role_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("role:read")),
+    current_user: AuthPrincipal = Depends(require_permission("role:read")),
 ):
     """Get role by ID."""
     role_service = RoleService(db)
@@ -47,7 +129,7 @@ async def get_role(
 async def create_role(
     role_data: RoleCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("role:create")),
+    current_user: AuthPrincipal = Depends(require_permission("role:create")),
 ):
     """Create a new role."""
     role_service = RoleService(db)
@@ -68,7 +150,7 @@ async def update_role(
     role_id: int,
     role_data: RoleUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("role:update")),
+    current_user: AuthPrincipal = Depends(require_permission("role:update")),
 ):
     """Update role by ID."""
     role_service = RoleService(db)
@@ -97,7 +179,7 @@ async def update_role(
 async def delete_role(
     role_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("role:delete")),
+    current_user: AuthPrincipal = Depends(require_permission("role:delete")),
 ):
     """Delete role by ID."""
     role_service = RoleService(db)
@@ -124,7 +206,7 @@ async def assign_permission_to_role(
     role_id: int,
     permission_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("role:update")),
+    current_user: AuthPrincipal = Depends(require_permission("role:update")),
 ):
     """Assign permission to role."""
     role_service = RoleService(db)
@@ -144,7 +226,7 @@ async def remove_permission_from_role(
     role_id: int,
     permission_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("role:update")),
+    current_user: AuthPrincipal = Depends(require_permission("role:update")),
 ):
     """Remove permission from role."""
     role_service = RoleService(db)
@@ -157,3 +239,60 @@ async def remove_permission_from_role(
 
     role = await role_service.get_by_id(role_id)
     return role
+
+
+@router.put("/{role_id}/permissions", response_model=AssignmentResult)
+async def replace_role_permissions(
+    role_id: int,
+    permissions_data: RolePermissionsReplace,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(require_permission("role:update")),
+):
+    """Replace a role's permissions, returning how many were added and removed."""
+    role_service = RoleService(db)
+    result = await role_service.set_permissions(
+        role_id, permissions_data.permission_ids
+    )
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Role or permission not found"
+        )
+
+    return result
+
+
+@router.post("/permissions/bulk-assign", response_model=AssignmentResult)
+async def bulk_assign_permissions(
+    assignment: RolePermissionsBulkAssign,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(require_permission("role:update")),
+):
+    """Assign every listed permission to every listed role.
+
+    Pairs that already exist are skipped; added counts the new ones.
+    """
+    role_service = RoleService(db)
+    result = await role_service.assign_permissions(
+        assignment.role_ids, assignment.permission_ids
+    )
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Role or permission not found"
+        )
+
+    return result
+
+
+@router.post("/permissions/bulk-remove", response_model=AssignmentResult)
+async def bulk_remove_permissions(
+    assignment: RolePermissionsBulkAssign,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(require_permission("role:update")),
+):
+    """Remove every listed permission from every listed role."""
+    role_service = RoleService(db)
+    return await role_service.remove_permissions(
+        assignment.role_ids, assignment.permission_ids
+    )
@@ -2,62 +2,193 @@
 User management API routes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.deps import (
+    get_current_principal,
     get_current_user,
     get_db,
+    get_session_factory,
     require_user_delete,
     require_user_read,
     require_user_write,
 )
+from app.core.permissions import AuthPrincipal
 from app.models.user import User
-from app.schemas.common import Message, PaginatedResponse
+from app.schemas.common import AssignmentResult, Message, PaginatedResponse
 from app.schemas.user import (
     PasswordChange,
     UserCreate,
+    UserImportResult,
     UserProfile,
     UserResponse,
+    UserRolesBulkAssign,
+    UserRolesReplace,
     UserSettings,
+    UserSuggestion,
     UserUpdate,
 )
+from app.services.counting import CountStrategy, cursor_page_strategy
 from app.services.user import UserService
+from app.services.user_import import UserImportService
+from app.utils.records import (
+    RecordFormat,
+    RecordFormatError,
+    export_response,
+    iter_records,
+)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=PaginatedResponse[UserResponse])
 async def get_users(
+    *,
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     search: str | None = Query(None),
     department: str | None = Query(None),
     is_active: bool | None = Query(None),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: str | None = Query(None),
+    count: CountStrategy = Query(CountStrategy.EXACT),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_user_read),
+    current_user: AuthPrincipal = Depends(require_user_read),
 ):
-    """Get users with pagination and filters."""
+    """Get users with pagination and filters.
+
+    Passing a cursor (or pagination=cursor for the first page) switches to
+    keyset pagination, which costs the same at any depth. The count strategy
+    trades total accuracy for speed on large tables; pagination.total_is_exact
+    reports whether the total was counted exactly.
+    """
     user_service = UserService(db)
 
+    if cursor or pagination == "cursor":
+        try:
+            user_page = await user_service.get_users_by_cursor(
+                limit=size,
+                cursor=cursor,
+                search=search,
+                department=department,
+                is_active=is_active,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            ) from e
+        total = await user_service.count_users(
+            search=search,
+            department=department,
+            is_active=is_active,
+            count_strategy=cursor_page_strategy(count, cursor),
+        )
+
+        return PaginatedResponse.create_from_cursor(
+            items=[UserResponse.model_validate(user) for user in user_page.items],
+            total=total.total,
+            size=size,
+            next_cursor=user_page.next_cursor,
+            prev_cursor=user_page.prev_cursor,
+            total_is_exact=total.exact,
+        )
+
     skip = (page - 1) * size
     users, total = await user_service.get_users(
-        skip=skip, limit=size, search=search, department=department, is_active=is_active
+        skip=skip,
+        limit=size,
+        search=search,
+        department=department,
+        is_active=is_active,
+        count_strategy=count,
     )
 
     return PaginatedResponse.create(
         items=[UserResponse.model_validate(user) for user in users],
-        total=total,
+        total=total.total,
         page=page,
         size=size,
+        total_is_exact=total.exact,
     )
 
 
+USER_EXPORT_FIELDS = [
+    "id",
+    "username",
+    "email",
+    "full_name",
+    "first_name",
+    "last_name",
+    "phone",
+    "department",
+    "position",
+    "employee_id",
+    "is_active",
+    "is_verified",
+    "is_superuser",
+    "last_login",
+    "last_seen",
+    "created_at",
+    "updated_at",
+    "roles",
+]
+
+
+@router.get("/export")
+async def export_users(
+    *,
+    export_format: RecordFormat = Query(RecordFormat.CSV, alias="format"),
+    gzip: bool = Query(False),
+    search: str | None = Query(None),
+    department: str | None = Query(None),
+    is_active: bool | None = Query(None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    current_user: AuthPrincipal = Depends(require_user_read),
+):
+    """Export users matching filters as CSV or NDJSON.
+
+    Rows are streamed from a server-side cursor as they are fetched, so
+    exports of any size use constant memory. Role names are listed in the
+    roles field, separated by semicolons in CSV.
+    """
+
+    async def records():
+        async with session_factory() as session:
+            async for user in UserService(session).stream_users(
+                search=search, department=department, is_active=is_active
+            ):
+                record = {field: getattr(user, field) for field in USER_EXPORT_FIELDS}
+                record["roles"] = [role.name for role in user.roles]
+                yield record
+
+    return export_response(
+        records(), USER_EXPORT_FIELDS, export_format, "users", gzip=gzip
+    )
+
+
+@router.get("/suggest", response_model=list[UserSuggestion])
+async def suggest_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(require_user_read),
+):
+    """Suggest active users by username or full name prefix.
+
+    Intended for pickers that query on every keystroke: returns only ids and
+    names, and never counts.
+    """
+    user_service = UserService(db)
+    rows = await user_service.suggest_users(q, limit=limit)
+    return [UserSuggestion.from_row(row) for row in rows]
+
+
 @router.post("/", response_model=UserResponse)
 async def create_user(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_user_write),
+    current_user: AuthPrincipal = Depends(require_user_write),
 ):
     """Create new user."""
     user_service = UserService(db)
@@ -77,11 +208,54 @@ async def create_user(
     return UserResponse.model_validate(user)
 
 
+# Content types accepted for each import format
+IMPORT_CONTENT_TYPES = {
+    "text/csv": RecordFormat.CSV,
+    "application/x-ndjson": RecordFormat.NDJSON,
+    "application/ndjson": RecordFormat.NDJSON,
+    "application/jsonl": RecordFormat.NDJSON,
+}
+
+
+@router.post("/import", response_model=UserImportResult)
+async def import_users(
+    request: Request,
+    import_format: RecordFormat | None = Query(None, alias="format"),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(require_user_write),
+):
+    """Create users in bulk from a CSV or NDJSON request body.
+
+    The body is streamed and imported in batches; CSV needs a header row of
+    UserCreate field names. The format is taken from the format parameter or
+    the Content-Type. Rows that fail are listed in the report by row number
+    while the rest are imported.
+    """
+    if import_format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0]
+        import_format = IMPORT_CONTENT_TYPES.get(content_type.strip().lower())
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass format",
+        )
+
+    import_service = UserImportService(db)
+    try:
+        return await import_service.import_users(
+            iter_records(request.stream(), import_format)
+        )
+    except RecordFormatError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_user_read),
+    current_user: AuthPrincipal = Depends(require_user_read),
 ):
     """Get user by ID."""
     user_service = UserService(db)
@@ -100,7 +274,7 @@ async def update_user(
     user_id: int,
     user_data: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_user_write),
+    current_user: AuthPrincipal = Depends(require_user_write),
 ):
     """Update user."""
     user_service = UserService(db)
@@ -132,7 +306,7 @@ async def update_user(
 async def delete_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_user_delete),
+    current_user: AuthPrincipal = Depends(require_user_delete),
 ):
     """Delete user."""
     # Prevent self-deletion
@@ -156,7 +330,7 @@ async def delete_user(
 async def activate_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_user_write),
+    current_user: AuthPrincipal = Depends(require_user_write),
 ):
     """Activate user."""
     user_service = UserService(db)
@@ -174,7 +348,7 @@ async def activate_user(
 async def deactivate_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_user_write),
+    current_user: AuthPrincipal = Depends(require_user_write),
 ):
     """Deactivate user."""
     # Prevent self-deactivation
@@ -199,7 +373,7 @@ async def assign_role_to_user(
     user_id: int,
     role_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_user_write),
+    current_user: AuthPrincipal = Depends(require_user_write),
 ):
     """Assign role to user."""
     user_service = UserService(db)
@@ -218,7 +392,7 @@ async def remove_role_from_user(
     user_id: int,
     role_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_user_write),
+    current_user: AuthPrincipal = Depends(require_user_write),
 ):
     """Remove role from user."""
     user_service = UserService(db)
@@ -232,6 +406,57 @@ async def remove_role_from_user(
     return Message(message="Role removed successfully")
 
 
+@router.put("/{user_id}/roles", response_model=AssignmentResult)
+async def replace_user_roles(
+    user_id: int,
+    roles_data: UserRolesReplace,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(require_user_write),
+):
+    """Replace a user's roles, returning how many were added and removed."""
+    user_service = UserService(db)
+    result = await user_service.set_roles(user_id, roles_data.role_ids)
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User or role not found"
+        )
+
+    return result
+
+
+@router.post("/roles/bulk-assign", response_model=AssignmentResult)
+async def bulk_assign_roles(
+    assignment: UserRolesBulkAssign,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(require_user_write),
+):
+    """Assign every listed role to every listed user.
+
+    Pairs that already exist are skipped; added counts the new ones.
+    """
+    user_service = UserService(db)
+    result = await user_service.assign_roles(assignment.user_ids, assignment.role_ids)
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User or role not found"
+        )
+
+    return result
+
+
+@router.post("/roles/bulk-remove", response_model=AssignmentResult)
+async def bulk_remove_roles(
+    assignment: UserRolesBulkAssign,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthPrincipal = Depends(require_user_write),
+):
+    """Remove every listed role from every listed user."""
+    user_service = UserService(db)
+    return await user_service.remove_roles(assignment.user_ids, assignment.role_ids)
+
+
 # Profile management endpoints
 @router.get("/me/profile", response_model=UserResponse)
 async def get_my_profile(current_user: User = Depends(get_current_user)):
@@ -243,7 +468,7 @@ async def get_my_profile(current_user: User = Depends(get_current_user)):
 async def update_my_profile(
     profile_data: UserProfile,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Update current user's profile."""
     user_service = UserService(db)
@@ -261,7 +486,7 @@ async def update_my_profile(
 async def update_my_settings(
     settings_data: UserSettings,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Update current user's settings."""
     user_service = UserService(db)
@@ -279,7 +504,7 @@ async def update_my_settings(
 async def change_my_password(
     password_data: PasswordChange,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
 ):
     """Change current user's password."""
     user_service = UserService(db)
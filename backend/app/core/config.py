@@ -22,6 +22,11 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
 
+    # In-process L1 cache in front of Redis
+    cache_l1_enabled: bool = Field(default=False, alias="CACHE_L1_ENABLED")
+    cache_l1_max_size: int = Field(default=10000, alias="CACHE_L1_MAX_SIZE")
+    cache_l1_ttl: int = Field(default=30, alias="CACHE_L1_TTL")  # seconds
+
     # JWT
     secret_key: str = Field(alias="SECRET_KEY")
     algorithm: str = Field(default="HS256", alias="ALGORITHM")
@@ -29,6 +34,25 @@ class Settings(BaseSettings):
         default=30, alias="ACCESS_TOKEN_EXPIRE_MINUTES"
     )
     refresh_token_expire_days: int = Field(default=7, alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    remember_me_access_token_expire_hours: int = Field(
+        default=24, alias="REMEMBER_ME_ACCESS_TOKEN_EXPIRE_HOURS"
+    )
+    remember_me_refresh_token_expire_days: int = Field(
+        default=30, alias="REMEMBER_ME_REFRESH_TOKEN_EXPIRE_DAYS"
+    )
+    refresh_reuse_grace_seconds: int = Field(
+        default=10, alias="REFRESH_REUSE_GRACE_SECONDS"
+    )  # a just-rotated refresh token still refreshes, for concurrent tabs; 0 disables
+
+    # JWT Signing Keys
+    jwt_signing_keys_dir: str | None = Field(
+        default=None, alias="JWT_SIGNING_KEYS_DIR"
+    )  # ES256 <kid>.pem keys; unset signs with SECRET_KEY
+    jwt_active_kid: str | None = Field(default=None, alias="JWT_ACTIVE_KID")
+    jwt_accept_legacy_tokens: bool = Field(
+        default=True, alias="JWT_ACCEPT_LEGACY_TOKENS"
+    )  # still verify SECRET_KEY tokens without a kid
+    jwks_max_age: int = Field(default=300, alias="JWKS_MAX_AGE")  # seconds
 
     # CORS
     allowed_origins: list[str] = Field(
@@ -39,11 +63,42 @@ class Settings(BaseSettings):
     # File Upload
     max_file_size: int = Field(default=10485760, alias="MAX_FILE_SIZE")  # 10MB
     upload_dir: str = Field(default="uploads", alias="UPLOAD_DIR")
+    upload_chunk_size: int = Field(
+        default=1048576, alias="UPLOAD_CHUNK_SIZE"
+    )  # 1MB per read/write
     allowed_extensions: list[str] = Field(
         default=["jpg", "jpeg", "png", "gif", "pdf", "doc", "docx"],
         alias="ALLOWED_EXTENSIONS",
     )
 
+    # Resumable Uploads
+    max_upload_size: int = Field(
+        default=1073741824, alias="MAX_UPLOAD_SIZE"
+    )  # 1GB per resumable upload
+    upload_part_size: int = Field(
+        default=5242880, alias="UPLOAD_PART_SIZE"
+    )  # 5MB default part size
+    min_upload_part_size: int = Field(
+        default=5242880, alias="MIN_UPLOAD_PART_SIZE"
+    )  # 5MB, except for the last part
+    max_upload_part_size: int = Field(
+        default=67108864, alias="MAX_UPLOAD_PART_SIZE"
+    )  # 64MB
+    max_upload_parts: int = Field(default=10000, alias="MAX_UPLOAD_PARTS")
+    upload_session_ttl: int = Field(
+        default=86400, alias="UPLOAD_SESSION_TTL"
+    )  # seconds
+
+    # Image Thumbnails
+    thumbnail_widths: list[int] = Field(
+        default=[64, 256, 1024], alias="THUMBNAIL_WIDTHS"
+    )  # pixels
+    thumbnail_executor: str = Field(
+        default="process", alias="THUMBNAIL_EXECUTOR"
+    )  # "thread" or "process"
+    thumbnail_workers: int = Field(default=2, alias="THUMBNAIL_WORKERS")
+    thumbnail_quality: int = Field(default=85, alias="THUMBNAIL_QUALITY")  # JPEG, 1-95
+
     # Email (Optional)
     smtp_host: str | None = Field(default=None, alias="SMTP_HOST")
     smtp_port: int | None = Field(default=587, alias="SMTP_PORT")
@@ -55,6 +110,72 @@ class Settings(BaseSettings):
     bcrypt_rounds: int = Field(default=12, alias="BCRYPT_ROUNDS")
     session_timeout_minutes: int = Field(default=60, alias="SESSION_TIMEOUT_MINUTES")
 
+    # Authorization Cache
+    auth_cache_enabled: bool = Field(default=True, alias="AUTH_CACHE_ENABLED")
+    auth_cache_ttl: int = Field(default=300, alias="AUTH_CACHE_TTL")  # seconds
+
+    # Verified Token Cache
+    token_cache_enabled: bool = Field(default=True, alias="TOKEN_CACHE_ENABLED")
+    token_cache_max_size: int = Field(default=10000, alias="TOKEN_CACHE_MAX_SIZE")
+
+    # Token Revocation
+    token_denylist_capacity: int = Field(
+        default=100000, alias="TOKEN_DENYLIST_CAPACITY"
+    )  # revoked tokens the local Bloom filter is sized for
+    token_denylist_error_rate: float = Field(
+        default=0.001, alias="TOKEN_DENYLIST_ERROR_RATE"
+    )  # share of valid tokens confirmed against Redis
+    token_denylist_rebuild_interval: float = Field(
+        default=300.0, alias="TOKEN_DENYLIST_REBUILD_INTERVAL"
+    )  # seconds between rebuilds that drop expired ids
+
+    # Permission Claims
+    permission_claims_enabled: bool = Field(
+        default=False, alias="PERMISSION_CLAIMS_ENABLED"
+    )  # embed effective permissions in access tokens
+    permission_claims_reload_interval: float = Field(
+        default=300.0, alias="PERMISSION_CLAIMS_RELOAD_INTERVAL"
+    )  # seconds between reloads of the catalog and stale cutoffs
+
+    # List Counts
+    count_estimate_threshold: int = Field(
+        default=10000, alias="COUNT_ESTIMATE_THRESHOLD"
+    )  # estimates below this are replaced by an exact count
+    count_cache_ttl: int = Field(default=30, alias="COUNT_CACHE_TTL")  # seconds
+
+    # Bulk User Import
+    user_import_batch_size: int = Field(
+        default=1000, alias="USER_IMPORT_BATCH_SIZE"
+    )  # rows per transaction
+    user_import_max_errors: int = Field(
+        default=1000, alias="USER_IMPORT_MAX_ERRORS"
+    )  # row errors listed in the report
+
+    # Exports
+    export_batch_size: int = Field(
+        default=1000, alias="EXPORT_BATCH_SIZE"
+    )  # rows fetched per server-side cursor round trip
+
+    # Activity Recording
+    activity_flush_interval: float = Field(
+        default=5.0, alias="ACTIVITY_FLUSH_INTERVAL"
+    )  # seconds; also the most activity lost if a worker dies
+    activity_max_pending: int = Field(
+        default=10000, alias="ACTIVITY_MAX_PENDING"
+    )  # buffered users that trigger an early flush
+    activity_batch_size: int = Field(
+        default=1000, alias="ACTIVITY_BATCH_SIZE"
+    )  # users per UPDATE statement
+
+    # Password Hashing Pool
+    password_hash_executor: str = Field(
+        default="thread", alias="PASSWORD_HASH_EXECUTOR"
+    )  # "thread" or "process"
+    password_hash_workers: int = Field(default=4, alias="PASSWORD_HASH_WORKERS")
+    password_hash_max_concurrency: int = Field(
+        default=8, alias="PASSWORD_HASH_MAX_CONCURRENCY"
+    )
+
     @field_validator("allowed_origins", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
@@ -71,6 +192,50 @@ class Settings(BaseSettings):
             return [ext.strip() for ext in v.split(",")]
         return v
 
+    @field_validator("thumbnail_widths", mode="before")
+    @classmethod
+    def parse_thumbnail_widths(cls, v):
+        """Parse thumbnail widths from string or list."""
+        if isinstance(v, str):
+            return [int(width.strip()) for width in v.split(",")]
+        return v
+
+    @field_validator("password_hash_executor")
+    @classmethod
+    def validate_password_hash_executor(cls, v):
+        """Validate password hash executor type."""
+        if v not in ("thread", "process"):
+            raise ValueError("PASSWORD_HASH_EXECUTOR must be 'thread' or 'process'")
+        return v
+
+    @field_validator("thumbnail_executor")
+    @classmethod
+    def validate_thumbnail_executor(cls, v):
+        """Validate thumbnail executor type."""
+        if v not in ("thread", "process"):
+            raise ValueError("THUMBNAIL_EXECUTOR must be 'thread' or 'process'")
+        return v
+
+    @property
+    def max_access_token_lifetime(self) -> int:
+        """Longest access token lifetime, remember me included, in seconds."""
+        return max(
+            self.access_token_expire_minutes * 60,
+            self.remember_me_access_token_expire_hours * 3600,
+        )
+
+    @property
+    def max_refresh_token_lifetime(self) -> int:
+        """Longest refresh token lifetime, remember me included, in seconds."""
+        return (
+            max(
+                self.refresh_token_expire_days,
+                self.remember_me_refresh_token_expire_days,
+            )
+            * 24
+            * 3600
+        )
+
     model_config = {"env_file": ".env", "case_sensitive": False}
 
 
@@ -2,14 +2,20 @@
 Dependency injection for FastAPI.
 """
 
+from typing import Any
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import get_async_session
+from app.core.database import AsyncSessionLocal, get_async_session
+from app.core.permissions import AuthPrincipal
 from app.core.redis import CacheManager, get_cache_manager
-from app.core.security import verify_token
+from app.core.revocation import verify_active_token
 from app.models.user import User
+from app.services.activity import get_activity_recorder
+from app.services.permission_claims import get_permission_claims
+from app.services.principal import PrincipalService
 from app.services.user import UserService
 
 # Security scheme
@@ -22,27 +28,42 @@ async def get_db() -> AsyncSession:
         yield session
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the session factory, for work that outlives the request.
+
+    Streaming responses keep running after request dependencies have been
+    torn down, so they open their own sessions from this factory.
+    """
+    return AsyncSessionLocal
+
+
 async def get_cache() -> CacheManager:
     """Get cache manager dependency."""
     return await get_cache_manager()
 
 
-async def get_current_user_id(
+async def get_token_payload(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> int:
-    """Get current user ID from JWT token."""
-    token = credentials.credentials
-    user_id = verify_token(token, "access")
+) -> dict[str, Any]:
+    """Get the verified, unrevoked payload of the bearer access token."""
+    payload = await verify_active_token(credentials.credentials, "access")
 
-    if user_id is None:
+    if payload is None or payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    return payload
+
+
+async def get_current_user_id(
+    payload: dict[str, Any] = Depends(get_token_payload),
+) -> int:
+    """Get current user ID from JWT token."""
     try:
-        return int(user_id)
+        return int(payload["sub"])
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -71,6 +92,41 @@ async def get_current_user(
     return user
 
 
+async def get_current_principal(
+    payload: dict[str, Any] = Depends(get_token_payload),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    cache: CacheManager = Depends(get_cache),
+) -> AuthPrincipal:
+    """Get current user's authorization context.
+
+    Read from the token's permission claim when it can be trusted, so
+    neither the database nor Redis is queried; otherwise served from the
+    principal cache when possible.
+    """
+    claims = get_permission_claims()
+    principal = claims.principal(payload) if claims else None
+    if principal:
+        get_activity_recorder().record_seen(user_id)
+        return principal
+
+    principal_service = PrincipalService(db, cache)
+    principal = await principal_service.get(user_id)
+
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+
+    get_activity_recorder().record_seen(user_id)
+    return principal
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -94,7 +150,9 @@ async def get_current_superuser(current_user: User = Depends(get_current_user))
 def require_permission(permission: str):
     """Dependency factory for permission checking."""
 
-    async def check_permission(current_user: User = Depends(get_current_user)) -> User:
+    async def check_permission(
+        current_user: AuthPrincipal = Depends(get_current_principal),
+    ) -> AuthPrincipal:
         if not current_user.is_superuser and not current_user.has_permission(
             permission
         ):
@@ -110,7 +168,9 @@ def require_permission(permission: str):
 def require_role(role: str):
     """Dependency factory for role checking."""
 
-    async def check_role(current_user: User = Depends(get_current_user)) -> User:
+    async def check_role(
+        current_user: AuthPrincipal = Depends(get_current_principal),
+    ) -> AuthPrincipal:
         if not current_user.is_superuser and not current_user.has_role(role):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail=f"Role '{role}' required"
@@ -143,14 +203,13 @@ async def get_current_user_optional(
         return None
 
     try:
-        token = credentials.credentials
-        user_id = verify_token(token, "access")
+        payload = await verify_active_token(credentials.credentials, "access")
 
-        if user_id is None:
+        if payload is None:
             return None
 
         user_service = UserService(db)
-        user = await user_service.get_by_id(int(user_id))
+        user = await user_service.get_by_id(int(payload["sub"]))
 
         if not user or not user.is_active:
             return None
@@ -0,0 +1,155 @@
+"""
+Asynchronous password hashing on a bounded worker pool.
+
+bcrypt is deliberately slow, so running it on the event loop stalls every
+other request served by the same worker. The hasher below moves the work to
+a thread or process pool and caps how many hashes may be in flight at once.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+
+@dataclass
+class HasherStats:
+    """Password hasher queue and throughput counters."""
+
+    in_flight: int = 0
+    waiting: int = 0
+    max_waiting: int = 0
+    completed: int = 0
+    failed: int = 0
+
+
+class PasswordHasher:
+    """Run password hashing and verification on a bounded executor."""
+
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: int = 4,
+        max_concurrency: int = 8,
+    ):
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.stats = HasherStats()
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_executor(self) -> Executor:
+        """Create the executor on first use."""
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency limiter bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, func, *args) -> Any:
+        """Run a blocking hashing function on the executor."""
+        semaphore = self._get_semaphore()
+
+        self.stats.waiting += 1
+        self.stats.max_waiting = max(self.stats.max_waiting, self.stats.waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            self.stats.waiting -= 1
+
+        self.stats.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+        except Exception:
+            self.stats.failed += 1
+            raise
+        finally:
+            self.stats.in_flight -= 1
+            semaphore.release()
+
+        self.stats.completed += 1
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Generate password hash."""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def get_stats(self) -> dict[str, int]:
+        """Get queue depth and throughput counters."""
+        return {
+            "in_flight": self.stats.in_flight,
+            "waiting": self.stats.waiting,
+            "max_waiting": self.stats.max_waiting,
+            "completed": self.stats.completed,
+            "failed": self.stats.failed,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    def shutdown(self) -> None:
+        """Shut down the executor."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._semaphore = None
+        self._semaphore_loop = None
+
+
+# Global password hasher
+password_hasher: PasswordHasher | None = None
+
+
+def init_password_hasher() -> None:
+    """Initialize password hasher."""
+    global password_hasher  # noqa: PLW0603 - process-wide singleton
+    password_hasher = PasswordHasher(
+        executor_type=settings.password_hash_executor,
+        max_workers=settings.password_hash_workers,
+        max_concurrency=settings.password_hash_max_concurrency,
+    )
+
+
+def close_password_hasher() -> None:
+    """Shut down password hasher."""
+    global password_hasher  # noqa: PLW0603 - process-wide singleton
+    if password_hasher:
+        password_hasher.shutdown()
+        password_hasher = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get password hasher."""
+    if not password_hasher:
+        init_password_hasher()
+    return password_hasher
+
+
+async def hash_password(password: str) -> str:
+    """Generate password hash without blocking the event loop."""
+    return await get_password_hasher().hash(password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await get_password_hasher().verify(plain_password, hashed_password)
@@ -0,0 +1,132 @@
+"""
+Local mirrors of state kept in Redis.
+
+A mirror holds a copy of some Redis state in process, so it is read
+without a round trip. It is loaded by scanning Redis and kept current by
+events every worker publishes over pub/sub: the listener subscribes before
+it scans, and events arriving during a scan are replayed into the result,
+so no change is missed. Mirrors are also reloaded periodically, dropping
+what has since expired in Redis.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any
+
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class RedisMirror(ABC):
+    """Local mirror of Redis state, kept current over pub/sub.
+
+    Subclasses name their channel and implement _mirror, _scan and _replace.
+    """
+
+    # Pub/sub channel events are published on
+    channel: str
+    # What is mirrored, for logs
+    name: str
+
+    def __init__(self, reload_interval: float = 300.0):
+        self.reload_interval = reload_interval
+        self._reload_log: list[dict[str, Any]] | None = None
+        self._reload_lock = asyncio.Lock()
+        self._tasks: list[asyncio.Task] = []
+
+    @abstractmethod
+    def _mirror(self, event: dict[str, Any]) -> None:
+        """Apply one event to the local state."""
+
+    @abstractmethod
+    async def _scan(self) -> Any:
+        """Read the whole state from Redis."""
+
+    @abstractmethod
+    def _replace(self, state: Any) -> None:
+        """Replace the local state with one read by _scan."""
+
+    def _apply(self, event: dict[str, Any]) -> None:
+        """Mirror one event locally."""
+        if self._reload_log is not None:
+            self._reload_log.append(event)
+        self._mirror(event)
+
+    async def _on_message(self, event: dict[str, Any]) -> None:
+        """Handle an event published by any worker."""
+        self._apply(event)
+
+    def _on_listen_error(self) -> None:  # noqa: B027 - optional hook
+        """Handle losing the subscription, before reconnecting."""
+
+    async def _publish(self, event: dict[str, Any]) -> None:
+        client = await get_redis()
+        await client.publish(self.channel, json.dumps(event))
+
+    async def reload(self) -> None:
+        """Rebuild the local mirror from Redis.
+
+        Events arriving during the scan are replayed into the new mirror.
+        """
+        async with self._reload_lock:
+            self._reload_log = events = []
+            try:
+                state = await self._scan()
+            finally:
+                self._reload_log = None
+
+            self._replace(state)
+            for event in events:
+                self._apply(event)
+
+    async def _listen(self) -> None:
+        """Mirror events published by other workers."""
+        while True:
+            try:
+                client = await get_redis()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(self.channel)
+                # Subscribed first, so nothing published during the load is missed
+                await self.reload()
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            await self._on_message(json.loads(message["data"]))
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Listener for %s failed, reconnecting", self.name)
+                self._on_listen_error()
+                await asyncio.sleep(1)
+
+    async def _reload_periodically(self) -> None:
+        """Reload periodically to drop what expired in Redis."""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await self.reload()
+            except Exception:
+                logger.exception("Failed to reload %s", self.name)
+
+    def start(self) -> None:
+        """Start mirroring Redis."""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._listen()),
+                asyncio.create_task(self._reload_periodically()),
+            ]
+
+    async def stop(self) -> None:
+        """Stop mirroring."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
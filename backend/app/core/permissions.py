@@ -0,0 +1,193 @@
+"""
+Effective permission sets for authorization checks, and their compact
+encoding in access tokens.
+"""
+
+import base64
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class EffectivePermissions:
+    """Flattened role and permission names for constant-time checks."""
+
+    roles: frozenset[str] = field(default_factory=frozenset)
+    permissions: frozenset[str] = field(default_factory=frozenset)
+
+    @classmethod
+    def from_roles(cls, roles: Iterable[Any]) -> "EffectivePermissions":
+        """Build effective permissions from loaded Role objects."""
+        role_names = set()
+        permission_names = set()
+        for role in roles:
+            role_names.add(role.name)
+            for permission in role.permissions:
+                permission_names.add(permission.name)
+
+        return cls(roles=frozenset(role_names), permissions=frozenset(permission_names))
+
+    def has_permission(self, permission_name: str) -> bool:
+        """Check if permission is granted."""
+        return permission_name in self.permissions
+
+    def has_role(self, role_name: str) -> bool:
+        """Check if role is held."""
+        return role_name in self.roles
+
+
+@dataclass(frozen=True, slots=True)
+class AuthPrincipal:
+    """Authorization context for the current request."""
+
+    id: int
+    is_active: bool
+    is_superuser: bool
+    access: EffectivePermissions = field(default_factory=EffectivePermissions)
+
+    @classmethod
+    def from_user(cls, user: Any) -> "AuthPrincipal":
+        """Build principal from a User with roles loaded."""
+        return cls(
+            id=user.id,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            access=user.effective_permissions,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AuthPrincipal":
+        """Build principal from its cached representation."""
+        return cls(
+            id=data["id"],
+            is_active=data["is_active"],
+            is_superuser=data["is_superuser"],
+            access=EffectivePermissions(
+                roles=frozenset(data["roles"]),
+                permissions=frozenset(data["permissions"]),
+            ),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert principal to a JSON-serializable dictionary."""
+        return {
+            "id": self.id,
+            "is_active": self.is_active,
+            "is_superuser": self.is_superuser,
+            "roles": sorted(self.access.roles),
+            "permissions": sorted(self.access.permissions),
+        }
+
+    def has_permission(self, permission_name: str) -> bool:
+        """Check if principal has specific permission."""
+        return self.access.has_permission(permission_name)
+
+    def has_role(self, role_name: str) -> bool:
+        """Check if principal has specific role."""
+        return self.access.has_role(role_name)
+
+
+def _encode_bits(positions: Iterable[int]) -> str:
+    """Encode bit positions as an unpadded base64url bitset."""
+    mask = 0
+    for position in positions:
+        mask |= 1 << position
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _decode_bits(bits: str) -> list[int]:
+    """Decode an unpadded base64url bitset into bit positions."""
+    data = base64.b64decode(
+        bits + "=" * (-len(bits) % 4), altchars=b"-_", validate=True
+    )
+    mask = int.from_bytes(data, "little")
+    positions = []
+    while mask:
+        lowest = mask & -mask
+        positions.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return positions
+
+
+@dataclass(frozen=True)
+class PermissionCatalog:
+    """Numbering of role and permission names for compact token claims.
+
+    A claim holds one bit per role and per permission, numbered by position
+    in the catalog. The version fingerprints that numbering, so a claim is
+    only read back with the catalog it was written with.
+    """
+
+    roles: tuple[str, ...] = ()
+    permissions: tuple[str, ...] = ()
+    version: str = field(init=False)
+    _role_bits: dict[str, int] = field(init=False, repr=False, compare=False)
+    _permission_bits: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        digest = hashlib.sha256(
+            "\n".join(self.roles).encode()
+            + b"\0"
+            + "\n".join(self.permissions).encode()
+        )
+        object.__setattr__(self, "version", digest.hexdigest()[:16])
+        object.__setattr__(
+            self, "_role_bits", {name: i for i, name in enumerate(self.roles)}
+        )
+        object.__setattr__(
+            self,
+            "_permission_bits",
+            {name: i for i, name in enumerate(self.permissions)},
+        )
+
+    def encode(self, principal: AuthPrincipal) -> dict[str, Any] | None:
+        """Encode a principal's access as a claim.
+
+        Returns None if the principal holds a role or permission missing
+        from the catalog, which a claim could not express.
+        """
+        try:
+            roles = [self._role_bits[name] for name in principal.access.roles]
+            permissions = [
+                self._permission_bits[name] for name in principal.access.permissions
+            ]
+        except KeyError:
+            return None
+
+        claim = {
+            "v": self.version,
+            "r": _encode_bits(roles),
+            "p": _encode_bits(permissions),
+        }
+        if principal.is_superuser:
+            claim["su"] = True
+        return claim
+
+    def decode(self, user_id: int, claim: Any) -> AuthPrincipal | None:
+        """Decode a claim written with this catalog.
+
+        Returns None for claims of another catalog version or malformed
+        claims. Only active users are issued claims.
+        """
+        if not isinstance(claim, dict) or claim.get("v") != self.version:
+            return None
+
+        try:
+            roles = _decode_bits(claim["r"])
+            permissions = _decode_bits(claim["p"])
+            access = EffectivePermissions(
+                roles=frozenset(self.roles[i] for i in roles),
+                permissions=frozenset(self.permissions[i] for i in permissions),
+            )
+        except (KeyError, TypeError, ValueError, IndexError):
+            return None
+
+        return AuthPrincipal(
+            id=user_id,
+            is_active=True,
+            is_superuser=bool(claim.get("su")),
+            access=access,
+        )
@@ -2,20 +2,35 @@
 Redis connection and cache management.
 """
 
+import asyncio
+import contextlib
 import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
 from typing import Any
 
 import redis.asyncio as redis
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Channel used to tell every worker to drop local cache entries
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+
 # Global Redis connection
 redis_client: redis.Redis | None = None
 
+# Global in-process cache and its invalidation listener
+local_cache: "LocalCache | None" = None
+invalidation_task: asyncio.Task | None = None
+
 
 async def init_redis() -> None:
     """Initialize Redis connection."""
-    global redis_client
+    global redis_client, local_cache  # noqa: PLW0603 - process-wide singleton
     redis_client = redis.from_url(
         settings.redis_url,
         encoding="utf-8",
@@ -24,12 +39,25 @@ async def init_redis() -> None:
         health_check_interval=30,
     )
 
+    if settings.cache_l1_enabled and local_cache is None:
+        local_cache = LocalCache(
+            max_size=settings.cache_l1_max_size, ttl=settings.cache_l1_ttl
+        )
+
 
 async def close_redis() -> None:
     """Close Redis connection."""
-    global redis_client
+    global redis_client, local_cache, invalidation_task  # noqa: PLW0603 - process-wide singleton
+    if invalidation_task:
+        invalidation_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await invalidation_task
+        invalidation_task = None
+    # Nothing invalidates the local cache once the listener is gone
+    local_cache = None
     if redis_client:
         await redis_client.close()
+        redis_client = None
 
 
 async def get_redis() -> redis.Redis:
@@ -55,6 +83,14 @@ class CacheManager:
         except Exception:
             return None
 
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        """Get multiple values from cache in one round trip."""
+        try:
+            values = await self.redis.mget(keys)
+            return [json.loads(value) if value else None for value in values]
+        except Exception:
+            return [None] * len(keys)
+
     async def set(self, key: str, value: Any, expire: int | None = None) -> bool:
         """Set value in cache."""
         try:
@@ -73,6 +109,13 @@ class CacheManager:
         except Exception:
             return False
 
+    async def incr(self, key: str) -> int | None:
+        """Increment integer value of key."""
+        try:
+            return await self.redis.incr(key)
+        except Exception:
+            return None
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         try:
@@ -103,7 +146,219 @@ class CacheManager:
             return False
 
 
+class LocalCache:
+    """In-process LRU cache with per-entry TTL and hit/miss counters.
+
+    generation counts invalidations. A value read from Redis is only stored
+    if no invalidation arrived while it was read, since the value may
+    predate it.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: int = 30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.instance_id = uuid.uuid4().hex
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.generation = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Get value from local cache, returning (hit, value)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None,
+        *,
+        generation: int | None = None,
+    ) -> None:
+        """Set value in local cache, evicting least recently used entries.
+
+        With generation, the value is dropped if an invalidation has
+        arrived since that generation.
+        """
+        if generation is not None and generation != self.generation:
+            return
+        ttl = min(ttl, self.ttl) if ttl else self.ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Delete key from local cache."""
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Clear local cache."""
+        self.generation += 1
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """Get cache counters."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TieredCacheManager(CacheManager):
+    """Cache manager with an in-process L1 cache in front of Redis.
+
+    Values returned from the L1 cache are shared objects and must not be
+    mutated by callers.
+    """
+
+    def __init__(self, redis_client: redis.Redis, local: LocalCache):
+        super().__init__(redis_client)
+        self.local = local
+
+    async def get(self, key: str) -> Any | None:
+        """Get value from local cache, falling back to Redis."""
+        hit, value = self.local.get(key)
+        if hit:
+            return value
+
+        generation = self.local.generation
+        value = await super().get(key)
+        if value is not None:
+            self.local.set(key, value, generation=generation)
+        return value
+
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        """Get multiple values, fetching only local misses from Redis."""
+        values: list[Any | None] = []
+        missing: list[int] = []
+        for index, key in enumerate(keys):
+            hit, value = self.local.get(key)
+            values.append(value)
+            if not hit:
+                missing.append(index)
+
+        if missing:
+            generation = self.local.generation
+            fetched = await super().get_many([keys[index] for index in missing])
+            for index, value in zip(missing, fetched, strict=True):
+                values[index] = value
+                if value is not None:
+                    self.local.set(keys[index], value, generation=generation)
+
+        return values
+
+    async def set(self, key: str, value: Any, expire: int | None = None) -> bool:
+        """Set value in Redis and invalidate other workers."""
+        result = await super().set(key, value, expire)
+        await self.invalidate(key)
+        if result:
+            self.local.set(key, value, expire)
+        return result
+
+    async def delete(self, key: str) -> bool:
+        """Delete key from Redis and every worker's local cache."""
+        result = await super().delete(key)
+        await self.invalidate(key)
+        return result
+
+    async def incr(self, key: str) -> int | None:
+        """Increment key in Redis and invalidate other workers."""
+        result = await super().incr(key)
+        await self.invalidate(key)
+        return result
+
+    async def flush_all(self) -> bool:
+        """Flush Redis and every worker's local cache."""
+        result = await super().flush_all()
+        await self.invalidate("*")
+        return result
+
+    async def invalidate(self, key: str) -> None:
+        """Drop key locally and publish invalidation to other workers."""
+        if key == "*":
+            self.local.clear()
+        else:
+            self.local.delete(key)
+
+        try:
+            await self.redis.publish(
+                CACHE_INVALIDATION_CHANNEL,
+                json.dumps({"origin": self.local.instance_id, "key": key}),
+            )
+        except Exception:
+            logger.warning("Failed to publish cache invalidation for %s", key)
+
+
+def get_local_cache() -> LocalCache | None:
+    """Get the in-process cache, if enabled."""
+    return local_cache
+
+
 async def get_cache_manager() -> CacheManager:
     """Get cache manager instance."""
     redis = await get_redis()
+    if local_cache is not None:
+        return TieredCacheManager(redis, local_cache)
     return CacheManager(redis)
+
+
+async def start_cache_invalidation_listener() -> None:
+    """Start listening for cache invalidations from other workers."""
+    global invalidation_task  # noqa: PLW0603 - process-wide singleton
+    if local_cache is None or invalidation_task is not None:
+        return
+    invalidation_task = asyncio.create_task(_listen_for_invalidations())
+
+
+async def _listen_for_invalidations() -> None:
+    """Drop local cache entries named in invalidation messages."""
+    while True:
+        try:
+            client = await get_redis()
+            pubsub = client.pubsub()
+            await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+            # Anything published while we were disconnected is lost
+            local_cache.clear()
+            try:
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    if data.get("origin") == local_cache.instance_id:
+                        continue
+                    if data.get("key") == "*":
+                        local_cache.clear()
+                    else:
+                        local_cache.delete(data.get("key"))
+            finally:
+                await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Cache invalidation listener failed, reconnecting")
+            local_cache.clear()
+            await asyncio.sleep(1)
@@ -0,0 +1,260 @@
+"""
+Token revocation backed by a Redis denylist with a local Bloom filter front.
+
+Revoked token ids (jti claims) and session ids (sid claims) are stored in
+Redis until the tokens they cover would have expired anyway. Every worker
+mirrors the revoked ids into a Bloom filter, kept current over pub/sub, so
+the common case of a token that was never revoked is answered locally
+without a Redis round trip. Only Bloom filter hits are confirmed against
+Redis.
+
+Revoking all of a user's tokens stores a cutoff time instead: tokens issued
+by then are rejected. Cutoffs are few and mirrored exactly, and compared
+to the millisecond, so a token issued right after a revocation is kept.
+"""
+
+import logging
+import time
+from typing import Any
+
+from app.core.config import settings
+from app.core.mirror import RedisMirror
+from app.core.redis import get_redis
+from app.core.security import decode_token, issued_at_ms, now_ms, token_cache
+from app.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# Revoked ids by the claim that carries them
+REVOKED_ID_KEYS = {
+    "jti": "auth:revoked:jti:{id}",
+    "sid": "auth:revoked:sid:{id}",
+}
+REVOKED_USER_KEY = "auth:revoked:user:{user_id}"
+TOKEN_REVOCATION_CHANNEL = "auth:revoked"
+
+# User cutoffs must outlast every token, refresh tokens included
+USER_CUTOFF_TTL = settings.max_refresh_token_lifetime
+
+
+class TokenDenylist(RedisMirror):
+    """Local mirror of the Redis token denylist.
+
+    Reloading rebuilds the Bloom filter, as it cannot forget ids of tokens
+    that have since expired.
+    """
+
+    channel = TOKEN_REVOCATION_CHANNEL
+    name = "token denylist"
+
+    def __init__(
+        self,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        rebuild_interval: float = 300.0,
+    ):
+        super().__init__(reload_interval=rebuild_interval)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(capacity, error_rate)
+        # Revocation times in milliseconds, by user id
+        self.user_cutoffs: dict[int, int] = {}
+        # Revocations confirmed by Redis, by id, until the token's exp
+        self.confirmed: dict[str, float] = {}
+
+    def _mirror(self, event: dict[str, Any]) -> None:
+        """Mirror one revocation locally."""
+        if "id" in event:
+            self.bloom.add(event["id"])
+        else:
+            user_id = int(event["user_id"])
+            self.user_cutoffs[user_id] = max(
+                self.user_cutoffs.get(user_id, 0), int(event["before"])
+            )
+
+    def _issued_before_cutoff(self, payload: dict[str, Any]) -> bool:
+        try:
+            cutoff = self.user_cutoffs.get(int(payload.get("sub")))
+        except (TypeError, ValueError):
+            return False
+        # Ties go to the revocation
+        return cutoff is not None and issued_at_ms(payload) <= cutoff
+
+    def is_known_revoked(self, payload: dict[str, Any]) -> bool:
+        """Check revocations known locally for certain, without Redis."""
+        if any(payload.get(claim) in self.confirmed for claim in REVOKED_ID_KEYS):
+            return True
+        return self._issued_before_cutoff(payload)
+
+    async def is_revoked(self, payload: dict[str, Any]) -> bool:
+        """Check whether a verified token has been revoked.
+
+        Tokens whose jti and sid are not in the Bloom filter are answered
+        locally. A filter hit is confirmed with Redis; if Redis cannot be
+        reached the token is treated as revoked.
+        """
+        if self.is_known_revoked(payload):
+            return True
+
+        for claim, key in REVOKED_ID_KEYS.items():
+            revoked_id = payload.get(claim)
+            if revoked_id is None or revoked_id not in self.bloom:
+                continue
+
+            try:
+                client = await get_redis()
+                revoked = bool(await client.exists(key.format(id=revoked_id)))
+            except Exception:
+                logger.warning("Failed to confirm token revocation for %s", revoked_id)
+                return True
+
+            if revoked:
+                self._confirm(revoked_id, float(payload.get("exp", 0)))
+                return True
+
+        return False
+
+    def _confirm(self, revoked_id: str, exp: float) -> None:
+        """Remember a confirmed revocation, dropping expired ones when full."""
+        if len(self.confirmed) >= self.capacity:
+            now = time.time()
+            self.confirmed = {
+                key: expires for key, expires in self.confirmed.items() if expires > now
+            }
+        if len(self.confirmed) < self.capacity:
+            self.confirmed[revoked_id] = exp
+
+    async def _revoke_id(self, claim: str, revoked_id: str, exp: float) -> None:
+        event = {"id": revoked_id}
+        self._apply(event)
+        self._confirm(revoked_id, exp)
+        try:
+            client = await get_redis()
+            key = REVOKED_ID_KEYS[claim].format(id=revoked_id)
+            await client.set(key, 1, ex=int(exp - time.time()) + 1)
+            await self._publish(event)
+        except Exception:
+            logger.warning("Failed to store token revocation for %s", revoked_id)
+
+    async def revoke(self, payload: dict[str, Any]) -> bool:
+        """Revoke one token until it expires.
+
+        Returns False for tokens that cannot be revoked individually, i.e.
+        those without a jti or already expired.
+        """
+        jti = payload.get("jti")
+        exp = float(payload.get("exp", 0))
+        if jti is None or exp <= time.time():
+            return False
+
+        await self._revoke_id("jti", jti, exp)
+        return True
+
+    async def revoke_session(self, session_id: str, ttl: int) -> None:
+        """Revoke every token of a session issued in the next ttl seconds."""
+        await self._revoke_id("sid", session_id, time.time() + ttl)
+
+    async def revoke_user(self, user_id: int) -> None:
+        """Revoke every token issued to a user so far."""
+        event = {"user_id": user_id, "before": now_ms()}
+        self._apply(event)
+        try:
+            client = await get_redis()
+            await client.set(
+                REVOKED_USER_KEY.format(user_id=user_id),
+                event["before"],
+                ex=USER_CUTOFF_TTL,
+            )
+            await self._publish(event)
+        except Exception:
+            logger.warning("Failed to store token revocation for user %s", user_id)
+
+    async def _scan(self) -> tuple[list[str], dict[int, int]]:
+        """Read every revoked id and user cutoff from Redis."""
+        client = await get_redis()
+        revoked_ids = [
+            key.rsplit(":", 1)[1]
+            for pattern in REVOKED_ID_KEYS.values()
+            async for key in client.scan_iter(match=pattern.format(id="*"), count=1000)
+        ]
+        user_keys = [
+            key
+            async for key in client.scan_iter(
+                match=REVOKED_USER_KEY.format(user_id="*"), count=1000
+            )
+        ]
+        cutoffs = await client.mget(user_keys) if user_keys else []
+        return revoked_ids, {
+            int(key.rsplit(":", 1)[1]): int(cutoff)
+            for key, cutoff in zip(user_keys, cutoffs, strict=True)
+            if cutoff is not None
+        }
+
+    def _replace(self, state: tuple[list[str], dict[int, int]]) -> None:
+        """Rebuild the Bloom filter and cutoffs from a scan."""
+        revoked_ids, user_cutoffs = state
+        bloom = BloomFilter(max(self.capacity, 2 * len(revoked_ids)), self.error_rate)
+        for revoked_id in revoked_ids:
+            bloom.add(revoked_id)
+        now = time.time()
+
+        self.bloom = bloom
+        self.user_cutoffs = user_cutoffs
+        self.confirmed = {
+            revoked_id: expires
+            for revoked_id, expires in self.confirmed.items()
+            if expires > now
+        }
+
+
+# Global token denylist
+token_denylist: TokenDenylist | None = None
+
+
+def init_token_denylist(start: bool = True) -> None:
+    """Initialize token denylist, mirroring Redis in the background if started."""
+    global token_denylist  # noqa: PLW0603 - process-wide singleton
+    token_denylist = TokenDenylist(
+        capacity=settings.token_denylist_capacity,
+        error_rate=settings.token_denylist_error_rate,
+        rebuild_interval=settings.token_denylist_rebuild_interval,
+    )
+    if start:
+        token_denylist.start()
+
+
+async def close_token_denylist() -> None:
+    """Stop mirroring the token denylist."""
+    global token_denylist  # noqa: PLW0603 - process-wide singleton
+    if token_denylist:
+        await token_denylist.stop()
+        token_denylist = None
+
+
+def get_token_denylist() -> TokenDenylist:
+    """Get token denylist."""
+    if not token_denylist:
+        init_token_denylist(start=False)
+    return token_denylist
+
+
+def _known_revoked(payload: dict[str, Any]) -> bool:
+    return token_denylist is not None and token_denylist.is_known_revoked(payload)
+
+
+# Cached tokens are rejected as soon as their revocation is known locally
+token_cache.add_revocation_check(_known_revoked)
+
+
+async def verify_active_token(
+    token: str, token_type: str = "access"
+) -> dict[str, Any] | None:
+    """Verify a JWT of the given type that has not been revoked."""
+    payload = decode_token(token)
+    if payload is None or payload.get("type") != token_type:
+        return None
+
+    if await get_token_denylist().is_revoked(payload):
+        token_cache.discard(token)
+        return None
+    return payload
@@ -2,22 +2,119 @@
 Security utilities for authentication and authorization.
 """
 
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from jose import JWTError, jwt
+from jose import JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.signing import get_key_ring
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Called with a verified payload; returns True if the token was revoked
+RevocationCheck = Callable[[dict[str, Any]], bool]
+
+
+class VerifiedTokenCache:
+    """In-process LRU cache of verified token payloads.
+
+    Entries are keyed by a digest of the token, so raw tokens are never held,
+    and expire at the token's own exp claim. Revocation checks run on every
+    lookup, cached or not, so a revoked token is rejected at once. Payloads
+    are copied in and out, so callers may change the ones they get.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.revocation_checks: list[RevocationCheck] = []
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Get the payload of a previously verified, unexpired token."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return dict(payload)
+
+    def set(self, token: str, payload: dict[str, Any]) -> None:
+        """Remember a verified token until its exp claim."""
+        key = self._key(token)
+        self._entries[key] = (float(payload["exp"]), dict(payload))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        """Forget a token."""
+        self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        """Forget every token."""
+        self._entries.clear()
+
+    def add_revocation_check(self, check: RevocationCheck) -> None:
+        """Register a check that rejects revoked tokens."""
+        self.revocation_checks.append(check)
+
+    def is_revoked(self, payload: dict[str, Any]) -> bool:
+        """Check whether any registered check rejects a payload."""
+        return any(check(payload) for check in self.revocation_checks)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = VerifiedTokenCache(max_size=settings.token_cache_max_size)
+
+
+def now_ms() -> int:
+    """Get the current time in whole milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+def issued_at_ms(payload: dict[str, Any]) -> int:
+    """Get when a token was issued, in milliseconds.
+
+    iat only has whole seconds, so tokens also record iat_ms; for tokens
+    without it, iat is taken as the start of its second.
+    """
+    if "iat_ms" in payload:
+        return int(payload["iat_ms"])
+    return int(payload.get("iat", 0)) * 1000
+
 
 def create_access_token(
-    subject: str | Any, expires_delta: timedelta | None = None
+    subject: str | Any,
+    expires_delta: timedelta | None = None,
+    session_id: str | None = None,
+    token_id: str | None = None,
+    claims: dict[str, Any] | None = None,
 ) -> str:
-    """Create JWT access token."""
+    """Create JWT access token, optionally bound to a login session.
+
+    Extra claims are added to the payload as given.
+    """
     if expires_delta:
         expire = datetime.now(UTC) + expires_delta
     else:
@@ -25,50 +122,92 @@ def create_access_token(
             minutes=settings.access_token_expire_minutes
         )
 
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-    encoded_jwt = jwt.encode(
-        to_encode, settings.secret_key, algorithm=settings.algorithm
-    )
-    return encoded_jwt
+    issued_at = now_ms()
+    to_encode = {
+        "exp": expire,
+        "iat": issued_at // 1000,
+        "iat_ms": issued_at,
+        "jti": token_id or uuid.uuid4().hex,
+        "sub": str(subject),
+        "type": "access",
+        **(claims or {}),
+    }
+    if session_id:
+        to_encode["sid"] = session_id
+    return get_key_ring().encode(to_encode)
 
 
 def create_refresh_token(
-    subject: str | Any, expires_delta: timedelta | None = None
+    subject: str | Any,
+    expires_delta: timedelta | None = None,
+    session_id: str | None = None,
+    token_id: str | None = None,
 ) -> str:
-    """Create JWT refresh token."""
+    """Create JWT refresh token, optionally bound to a login session."""
     if expires_delta:
         expire = datetime.now(UTC) + expires_delta
     else:
         expire = datetime.now(UTC) + timedelta(days=settings.refresh_token_expire_days)
 
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(
-        to_encode, settings.secret_key, algorithm=settings.algorithm
-    )
-    return encoded_jwt
+    issued_at = now_ms()
+    to_encode = {
+        "exp": expire,
+        "iat": issued_at // 1000,
+        "iat_ms": issued_at,
+        "jti": token_id or uuid.uuid4().hex,
+        "sub": str(subject),
+        "type": "refresh",
+    }
+    if session_id:
+        to_encode["sid"] = session_id
+    return get_key_ring().encode(to_encode)
 
 
-def verify_token(token: str, token_type: str = "access") -> str | None:
-    """Verify JWT token and return subject."""
+def decode_token(token: str) -> dict[str, Any] | None:
+    """Decode and verify a JWT, returning its payload.
+
+    Tokens seen before are served from the verified token cache, so only the
+    first presentation of a token pays for signature verification.
+    """
+    if settings.token_cache_enabled:
+        payload = token_cache.get(token)
+        if payload is not None:
+            if token_cache.is_revoked(payload):
+                token_cache.discard(token)
+                return None
+            return payload
+
     try:
-        payload = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.algorithm]
-        )
+        payload = get_key_ring().decode(token)
+    except JWTError:
+        return None
 
-        # Check token type
-        if payload.get("type") != token_type:
-            return None
+    # Check expiration
+    exp = payload.get("exp")
+    if not isinstance(exp, int | float) or time.time() > exp:
+        return None
 
-        # Check expiration
-        exp = payload.get("exp")
-        if exp is None or datetime.now(UTC) > datetime.fromtimestamp(exp, tz=UTC):
-            return None
+    if token_cache.is_revoked(payload):
+        return None
 
-        subject: str = payload.get("sub")
-        return subject
-    except JWTError:
+    if settings.token_cache_enabled:
+        token_cache.set(token, payload)
+    return payload
+
+
+def verify_token(token: str, token_type: str = "access") -> str | None:
+    """Verify JWT token and return subject."""
+    payload = decode_token(token)
+    if payload is None:
+        return None
+
+    # Check token type
+    if payload.get("type") != token_type:
         return None
 
+    subject: str = payload.get("sub")
+    return subject
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -86,20 +225,15 @@ def generate_password_reset_token(email: str) -> str:
     now = datetime.now(UTC)
     expires = now + delta
     exp = expires.timestamp()
-    encoded_jwt = jwt.encode(
-        {"exp": exp, "nbf": now, "sub": email, "type": "password_reset"},
-        settings.secret_key,
-        algorithm=settings.algorithm,
+    return get_key_ring().encode(
+        {"exp": exp, "nbf": now, "sub": email, "type": "password_reset"}
     )
-    return encoded_jwt
 
 
 def verify_password_reset_token(token: str) -> str | None:
     """Verify password reset token and return email."""
     try:
-        decoded_token = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.algorithm]
-        )
+        decoded_token = get_key_ring().decode(token)
 
         # Check token type
         if decoded_token.get("type") != "password_reset":
@@ -116,20 +250,15 @@ def generate_email_verification_token(email: str) -> str:
     now = datetime.now(UTC)
     expires = now + delta
     exp = expires.timestamp()
-    encoded_jwt = jwt.encode(
-        {"exp": exp, "nbf": now, "sub": email, "type": "email_verification"},
-        settings.secret_key,
-        algorithm=settings.algorithm,
+    return get_key_ring().encode(
+        {"exp": exp, "nbf": now, "sub": email, "type": "email_verification"}
     )
-    return encoded_jwt
 
 
 def verify_email_verification_token(token: str) -> str | None:
     """Verify email verification token and return email."""
     try:
-        decoded_token = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.algorithm]
-        )
+        decoded_token = get_key_ring().decode(token)
 
         # Check token type
         if decoded_token.get("type") != "email_verification":
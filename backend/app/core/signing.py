@@ -0,0 +1,155 @@
+"""
+JWT signing keys with key ids, rotation and a published JWKS.
+
+With JWT_SIGNING_KEYS_DIR set, tokens are signed with ES256 private keys
+stored as <kid>.pem in that directory, and every token names its key in
+the kid header. Only JWT_ACTIVE_KID signs; the other keys still verify,
+so a rotation overlaps:
+
+1. Add the new key. It is published in the JWKS but does not sign yet.
+2. Once downstream caches have picked it up, make it the active key.
+3. Once tokens signed by the old key have expired, keep only its public
+   half (<kid>.pub.pem) or remove it.
+
+Without a key directory, tokens are signed with SECRET_KEY (HS256) as
+before and the JWKS is empty.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from jose import JWTError, jwk, jwt
+
+from app.core.config import settings
+
+# Asymmetric algorithm for keys loaded from the key directory
+SIGNING_ALGORITHM = "ES256"
+
+
+@dataclass
+class SigningKey:
+    """A key that verifies tokens, and signs them if it has a private half."""
+
+    kid: str | None
+    algorithm: str
+    verify_key: Any
+    sign_key: Any = None
+    public_jwk: dict[str, Any] | None = None
+
+
+class KeyRing:
+    """Sign with the active key and verify with any key named by kid."""
+
+    def __init__(
+        self, keys: list[SigningKey], active_kid: str | None, legacy: SigningKey | None
+    ):
+        self.keys = {key.kid: key for key in keys}
+        self.legacy = legacy
+        self.active = self.keys.get(active_kid) if keys else legacy
+        if self.active is None or self.active.sign_key is None:
+            raise ValueError(f"No private signing key for active kid {active_kid!r}")
+
+        # Published keys never change while the ring is loaded, so the JWKS
+        # document and its validator are built once
+        self.jwks_body = json.dumps(
+            {"keys": [key.public_jwk for key in keys if key.public_jwk]},
+            separators=(",", ":"),
+        ).encode()
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks_body).hexdigest()[:32]}"'
+
+    @classmethod
+    def from_directory(
+        cls, path: Path, active_kid: str | None, legacy: SigningKey | None = None
+    ) -> "KeyRing":
+        """Load <kid>.pem private keys and <kid>.pub.pem public keys.
+
+        A public key kept next to its private key is only checked to match.
+        """
+        keys: dict[str, SigningKey] = {}
+        # Private keys first, so their public halves are recognized
+        key_files = sorted(
+            path.glob("*.pem"),
+            key=lambda key_file: (key_file.name.endswith(".pub.pem"), key_file.name),
+        )
+        for key_file in key_files:
+            pem = key_file.read_text()
+            public_only = key_file.name.endswith(".pub.pem")
+            kid = key_file.name.removesuffix(".pem").removesuffix(".pub")
+            key = jwk.construct(pem, SIGNING_ALGORITHM)
+            public_key = key if public_only else key.public_key()
+            public_jwk = {**public_key.to_dict(), "kid": kid, "use": "sig"}
+            if kid in keys:
+                if keys[kid].public_jwk != public_jwk:
+                    raise ValueError(
+                        f"Public key {key_file.name} does not match {kid}.pem"
+                    )
+                continue
+            keys[kid] = SigningKey(
+                kid=kid,
+                algorithm=SIGNING_ALGORITHM,
+                verify_key=public_key,
+                sign_key=None if public_only else pem,
+                public_jwk=public_jwk,
+            )
+        if not keys:
+            raise ValueError(f"No signing keys found in {path}")
+        return cls(list(keys.values()), active_kid, legacy)
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        """Sign claims with the active key."""
+        headers = {"kid": self.active.kid} if self.active.kid else None
+        return jwt.encode(
+            claims,
+            self.active.sign_key,
+            algorithm=self.active.algorithm,
+            headers=headers,
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """Verify a token with the key its kid names.
+
+        Each key only accepts its own algorithm. Tokens without a kid are
+        verified with the legacy secret, if one is configured.
+
+        Raises:
+            JWTError: If the token is malformed, names an unknown key or
+                fails verification.
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.get(kid) if kid is not None else self.legacy
+        if key is None:
+            raise JWTError(f"Unknown signing key {kid!r}")
+        return jwt.decode(token, key.verify_key, algorithms=[key.algorithm])
+
+
+# Global key ring
+key_ring: KeyRing | None = None
+
+
+def init_key_ring() -> None:
+    """Load signing keys from settings."""
+    global key_ring  # noqa: PLW0603 - process-wide singleton
+    legacy = SigningKey(
+        kid=None,
+        algorithm=settings.algorithm,
+        verify_key=settings.secret_key,
+        sign_key=settings.secret_key,
+    )
+    if settings.jwt_signing_keys_dir:
+        key_ring = KeyRing.from_directory(
+            Path(settings.jwt_signing_keys_dir),
+            settings.jwt_active_kid,
+            legacy if settings.jwt_accept_legacy_tokens else None,
+        )
+    else:
+        key_ring = KeyRing([], None, legacy)
+
+
+def get_key_ring() -> KeyRing:
+    """Get key ring."""
+    if not key_ring:
+        init_key_ring()
+    return key_ring
@@ -3,10 +3,13 @@ Database models package.
 """
 
 from .base import BaseModel
+from .file import File, FileBlob
 from .user import Permission, Role, RolePermission, User, UserRole
 
 __all__ = [
     "BaseModel",
+    "File",
+    "FileBlob",
     "Permission",
     "Role",
     "RolePermission",
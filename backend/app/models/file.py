@@ -0,0 +1,49 @@
+"""
+Stored file and content-addressed blob models.
+"""
+
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+from .base import BaseModel
+
+
+class FileBlob(BaseModel):
+    """File content stored once per distinct SHA256 digest."""
+
+    __tablename__ = "file_blob"
+
+    sha256 = Column(String(64), unique=True, index=True, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, default=0, nullable=False)  # files using this blob
+
+    def __repr__(self) -> str:
+        return f"<FileBlob(id={self.id}, sha256='{self.sha256}')>"
+
+
+class File(BaseModel):
+    """User-facing file pointing at a shared blob."""
+
+    __tablename__ = "file"
+
+    name = Column(String(100), unique=True, index=True, nullable=False)  # URL name
+    original_filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=True)
+    size = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=False)
+    owner_id = Column(
+        Integer, ForeignKey("user.id", ondelete="SET NULL"), nullable=True
+    )
+    blob_id = Column(Integer, ForeignKey("file_blob.id"), nullable=False)
+
+    # Relationships
+    blob = relationship("FileBlob")
+
+    __table_args__ = (
+        # Keyset pagination sort key (newest first), overall and per owner
+        Index("ix_file_created_at_id", "created_at", "id"),
+        Index("ix_file_owner_id_created_at_id", "owner_id", "created_at", "id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<File(id={self.id}, name='{self.name}')>"
@@ -9,16 +9,25 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
     UniqueConstraint,
+    event,
+    func,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
+
+from app.core.permissions import EffectivePermissions
+from app.utils.search import search_document
 
 from .base import BaseModel
 
+# Session.info key counting role permission changes made in the session
+ROLE_PERMISSION_CHANGES = "role_permission_changes"
+
 # Association tables for many-to-many relationships
 user_role_table = Table(
     "user_roles",
@@ -75,6 +84,7 @@ class User(BaseModel):
 
     # Authentication
     last_login = Column(DateTime, nullable=True)
+    last_seen = Column(DateTime, nullable=True)
     password_changed_at = Column(
         DateTime, default=lambda: datetime.now(UTC).replace(tzinfo=None)
     )
@@ -102,6 +112,31 @@ class User(BaseModel):
         "Role", secondary=user_role_table, back_populates="users", lazy="selectin"
     )
 
+    __table_args__ = (
+        # Keyset pagination sort key (newest first)
+        Index("ix_user_created_at_id", "created_at", "id"),
+        # Trigram index behind directory search (see app.utils.search)
+        Index(
+            "ix_user_search_trgm",
+            search_document(username, email, full_name, first_name, last_name).label(
+                "search_document"
+            ),
+            postgresql_using="gin",
+            postgresql_ops={"search_document": "gin_trgm_ops"},
+        ),
+        # Case-insensitive prefix lookups for autocomplete
+        Index(
+            "ix_user_username_prefix",
+            func.lower(username).label("username_lower"),
+            postgresql_ops={"username_lower": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_user_full_name_prefix",
+            func.lower(full_name).label("full_name_lower"),
+            postgresql_ops={"full_name_lower": "text_pattern_ops"},
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
 
@@ -115,17 +150,39 @@ class User(BaseModel):
         else:
             return self.username
 
+    @property
+    def effective_permissions(self) -> EffectivePermissions:
+        """Get role and permission names, built once per loaded instance.
+
+        The set is rebuilt after a role's permissions change in the session.
+        """
+        session = object_session(self)
+        changes = session.info.get(ROLE_PERMISSION_CHANGES, 0) if session else 0
+        cached = self.__dict__.get("_effective_permissions")
+        if cached is None or cached[0] != changes:
+            cached = (changes, EffectivePermissions.from_roles(self.roles))
+            self.__dict__["_effective_permissions"] = cached
+        return cached[1]
+
     def has_permission(self, permission_name: str) -> bool:
         """Check if user has specific permission."""
-        for role in self.roles:
-            for permission in role.permissions:
-                if permission.name == permission_name:
-                    return True
-        return False
+        return self.effective_permissions.has_permission(permission_name)
 
     def has_role(self, role_name: str) -> bool:
         """Check if user has specific role."""
-        return any(role.name == role_name for role in self.roles)
+        return self.effective_permissions.has_role(role_name)
+
+
+def _reset_effective_permissions(target: User, *args) -> None:
+    """Drop cached effective permissions when roles change or are reloaded."""
+    target.__dict__.pop("_effective_permissions", None)
+
+
+event.listen(User, "refresh", _reset_effective_permissions)
+event.listen(User, "expire", _reset_effective_permissions)
+event.listen(User.roles, "append", _reset_effective_permissions)
+event.listen(User.roles, "remove", _reset_effective_permissions)
+event.listen(User.roles, "set", _reset_effective_permissions)
 
 
 class Role(BaseModel):
@@ -150,10 +207,42 @@ class Role(BaseModel):
         lazy="selectin",
     )
 
+    __table_args__ = (
+        # Keyset pagination sort key (newest first)
+        Index("ix_role_created_at_id", "created_at", "id"),
+        Index(
+            "ix_role_search_trgm",
+            search_document(name, display_name, description).label("search_document"),
+            postgresql_using="gin",
+            postgresql_ops={"search_document": "gin_trgm_ops"},
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<Role(id={self.id}, name='{self.name}')>"
 
 
+def _reset_role_holders(target: Role, *args) -> None:
+    """Drop cached effective permissions of loaded users holding a role.
+
+    Users loaded with their roles do not populate the role's side of the
+    relationship, so besides resetting the role's loaded users, the change
+    is counted in the role's session, which stales every set cached there.
+    """
+    for user in target.__dict__.get("users") or ():
+        _reset_effective_permissions(user)
+    session = object_session(target)
+    if session is not None:
+        session.info[ROLE_PERMISSION_CHANGES] = (
+            session.info.get(ROLE_PERMISSION_CHANGES, 0) + 1
+        )
+
+
+event.listen(Role.permissions, "append", _reset_role_holders)
+event.listen(Role.permissions, "remove", _reset_role_holders)
+event.listen(Role.permissions, "set", _reset_role_holders)
+
+
 class Permission(BaseModel):
     """Permission model."""
 
@@ -178,6 +267,14 @@ class Permission(BaseModel):
 
     __table_args__ = (
         UniqueConstraint("resource", "action", name="_resource_action_uc"),
+        Index(
+            "ix_permission_search_trgm",
+            search_document(name, display_name, description, resource, action).label(
+                "search_document"
+            ),
+            postgresql_using="gin",
+            postgresql_ops={"search_document": "gin_trgm_ops"},
+        ),
     )
 
     def __repr__(self) -> str:
@@ -7,27 +7,47 @@ from .auth import (
     LoginResponse,
     PasswordResetRequest,
     RefreshToken,
+    SessionInfo,
     Token,
     TokenData,
 )
-from .common import ErrorResponse, HealthCheck, Message, PaginatedResponse
+from .common import (
+    AssignmentResult,
+    ErrorResponse,
+    HealthCheck,
+    Message,
+    PaginatedResponse,
+)
+from .file import UploadSessionCreate
 from .permission import (
     PermissionBase,
     PermissionCreate,
     PermissionResponse,
     PermissionUpdate,
 )
-from .role import RoleBase, RoleCreate, RolePermissionAssign, RoleResponse, RoleUpdate
+from .role import (
+    RoleBase,
+    RoleCreate,
+    RolePermissionAssign,
+    RolePermissionsBulkAssign,
+    RolePermissionsReplace,
+    RoleResponse,
+    RoleUpdate,
+)
 from .user import (
     PasswordChange,
     PasswordReset,
     UserBase,
     UserCreate,
+    UserImportError,
+    UserImportResult,
     UserInDB,
     UserLogin,
     UserProfile,
     UserRegister,
     UserResponse,
+    UserRolesBulkAssign,
+    UserRolesReplace,
     UserSettings,
     UserUpdate,
 )
@@ -36,6 +56,8 @@ __all__ = [
     # User schemas
     "UserBase",
     "UserCreate",
+    "UserImportError",
+    "UserImportResult",
     "UserUpdate",
     "UserInDB",
     "UserResponse",
@@ -43,12 +65,15 @@ __all__ = [
     "UserRegister",
     "UserProfile",
     "UserSettings",
+    "UserRolesBulkAssign",
+    "UserRolesReplace",
     "PasswordChange",
     "PasswordReset",
     # Auth schemas
     "Token",
     "TokenData",
     "RefreshToken",
+    "SessionInfo",
     "LoginResponse",
     "PasswordResetRequest",
     "EmailVerification",
@@ -58,13 +83,18 @@ __all__ = [
     "RoleUpdate",
     "RoleResponse",
     "RolePermissionAssign",
+    "RolePermissionsBulkAssign",
+    "RolePermissionsReplace",
     # Permission schemas
     "PermissionBase",
     "PermissionCreate",
     "PermissionUpdate",
     "PermissionResponse",
+    # File schemas
+    "UploadSessionCreate",
     # Common schemas
     "Message",
+    "AssignmentResult",
     "ErrorResponse",
     "PaginatedResponse",
     "HealthCheck",
@@ -36,6 +36,16 @@ class LoginResponse(BaseModel):
     user: dict  # User information
 
 
+class SessionInfo(BaseModel):
+    """Login session schema."""
+
+    session_id: str
+    device: str | None = None
+    created_at: datetime
+    last_refresh: datetime
+    current: bool = False
+
+
 class UserLogin(BaseModel):
     """User login schema."""
 
@@ -198,11 +208,7 @@ class AuthUser(BaseModel):
     @classmethod
     def from_user(cls, user) -> "AuthUser":
         """Create AuthUser from User model."""
-        # Extract all permissions from user's roles
-        permissions = set()
-        for role in user.roles:
-            for permission in role.permissions:
-                permissions.add(permission.name)
+        permissions = user.effective_permissions.permissions
 
         return cls(
             id=user.id,
@@ -237,5 +243,5 @@ class AuthUser(BaseModel):
             created_at=user.created_at,
             updated_at=user.updated_at,
             roles=[RoleInfo.model_validate(role) for role in user.roles],
-            permissions=list(permissions),
+            permissions=sorted(permissions),
         )
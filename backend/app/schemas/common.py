@@ -15,6 +15,13 @@ class Message(BaseModel):
     message: str
 
 
+class AssignmentResult(BaseModel):
+    """Counts of links changed by a bulk assignment."""
+
+    added: int = 0
+    removed: int = 0
+
+
 class ErrorResponse(BaseModel):
     """Error response schema."""
 
@@ -26,12 +33,15 @@ class ErrorResponse(BaseModel):
 class PaginationInfo(BaseModel):
     """Pagination information."""
 
-    page: int = Field(ge=1)
+    page: int | None = Field(default=None, ge=1)  # None in cursor mode
     page_size: int = Field(ge=1, le=100)
     total: int
+    total_is_exact: bool = True  # False when total is estimated or cached
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -42,7 +52,12 @@ class PaginatedResponse(BaseModel, Generic[T]):
 
     @classmethod
     def create(
-        cls, items: list[T], total: int, page: int, size: int
+        cls,
+        items: list[T],
+        total: int,
+        page: int,
+        size: int,
+        total_is_exact: bool = True,
     ) -> "PaginatedResponse[T]":
         """Create paginated response."""
         total_pages = (total + size - 1) // size  # Ceiling division
@@ -53,6 +68,7 @@ class PaginatedResponse(BaseModel, Generic[T]):
             page=page,
             page_size=size,
             total=total,
+            total_is_exact=total_is_exact,
             total_pages=total_pages,
             has_next=has_next,
             has_prev=has_prev
@@ -60,6 +76,31 @@ class PaginatedResponse(BaseModel, Generic[T]):
 
         return cls(items=items, pagination=pagination)
 
+    @classmethod
+    def create_from_cursor(
+        cls,
+        items: list[T],
+        total: int,
+        size: int,
+        *,
+        next_cursor: str | None = None,
+        prev_cursor: str | None = None,
+        total_is_exact: bool = True,
+    ) -> "PaginatedResponse[T]":
+        """Create cursor-paginated response."""
+        pagination = PaginationInfo(
+            page_size=size,
+            total=total,
+            total_is_exact=total_is_exact,
+            total_pages=(total + size - 1) // size,
+            has_next=next_cursor is not None,
+            has_prev=prev_cursor is not None,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+        return cls(items=items, pagination=pagination)
+
 
 class HealthCheck(BaseModel):
     """Health check response."""
@@ -69,3 +110,5 @@ class HealthCheck(BaseModel):
     version: str
     database: str = "connected"
     redis: str = "connected"
+    password_hasher: dict[str, int] | None = None
+    local_cache: dict[str, int] | None = None
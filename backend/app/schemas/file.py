@@ -0,0 +1,14 @@
+"""
+File upload Pydantic schemas.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class UploadSessionCreate(BaseModel):
+    """Resumable upload session creation schema."""
+
+    filename: str = Field(..., min_length=1, max_length=255)
+    size: int = Field(..., ge=1)  # total bytes the client will send
+    content_type: str | None = Field(None, max_length=100)
+    part_size: int | None = Field(None, ge=1)  # defaults to UPLOAD_PART_SIZE
@@ -61,3 +61,16 @@ class RolePermissionAssign(BaseModel):
     """Role permission assignment schema."""
 
     permission_id: int
+
+
+class RolePermissionsBulkAssign(BaseModel):
+    """Bulk role permission assignment schema, applied to every pair."""
+
+    role_ids: list[int] = Field(..., min_length=1, max_length=1000)
+    permission_ids: list[int] = Field(..., min_length=1, max_length=1000)
+
+
+class RolePermissionsReplace(BaseModel):
+    """Complete set of permissions to give a role."""
+
+    permission_ids: list[int] = Field(..., max_length=1000)
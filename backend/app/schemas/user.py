@@ -101,6 +101,7 @@ class UserInDB(UserBase):
     is_verified: bool = False
     is_superuser: bool = False
     last_login: datetime | None = None
+    last_seen: datetime | None = None
     password_changed_at: datetime | None = None
     language: str = "zh-CN"
     timezone: str = "Asia/Shanghai"
@@ -139,6 +140,7 @@ class UserResponse(BaseModel):
     is_verified: bool
     is_superuser: bool
     last_login: datetime | None = None
+    last_seen: datetime | None = None
     language: str
     timezone: str
     theme: str
@@ -182,6 +184,26 @@ class UserResponse(BaseModel):
             return self.username
 
 
+class UserSuggestion(BaseModel):
+    """User autocomplete suggestion."""
+
+    id: int
+    username: str
+    display_name: str
+
+    @classmethod
+    def from_row(cls, row) -> "UserSuggestion":
+        """Create suggestion from a row of id and name columns."""
+        if row.full_name:
+            display_name = row.full_name
+        elif row.first_name and row.last_name:
+            display_name = f"{row.first_name} {row.last_name}"
+        else:
+            display_name = row.username
+
+        return cls(id=row.id, username=row.username, display_name=display_name)
+
+
 class UserLogin(BaseModel):
     """User login schema."""
 
@@ -254,3 +276,34 @@ class PasswordReset(BaseModel):
         if not any(c.isdigit() for c in v):
             raise ValueError("Password must contain at least one digit")
         return v
+
+
+class UserImportError(BaseModel):
+    """A problem with one row of a user import."""
+
+    row: int
+    field: str | None = None
+    message: str
+
+
+class UserImportResult(BaseModel):
+    """Outcome of a bulk user import."""
+
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[UserImportError] = []
+    errors_truncated: bool = False
+
+
+class UserRolesBulkAssign(BaseModel):
+    """Bulk user role assignment schema, applied to every user/role pair."""
+
+    user_ids: list[int] = Field(..., min_length=1, max_length=10000)
+    role_ids: list[int] = Field(..., min_length=1, max_length=100)
+
+
+class UserRolesReplace(BaseModel):
+    """Complete set of roles to give a user."""
+
+    role_ids: list[int] = Field(..., max_length=100)
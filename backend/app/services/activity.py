@@ -0,0 +1,190 @@
+"""
+Write-behind recording of user login and last-seen times.
+
+Logins and authenticated requests only note the time in memory; a
+background task writes everything noted since the previous flush in a few
+batched UPDATE statements. At most one flush interval of activity is lost
+if a worker dies without shutting down cleanly.
+"""
+
+import asyncio
+import contextlib
+import logging
+from datetime import UTC, datetime
+from itertools import islice
+
+from sqlalchemy import DateTime, Integer, column, func, update, values
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Buffered activity kinds, named after the user columns they update
+ACTIVITY_COLUMNS = ("last_login", "last_seen")
+
+
+class ActivityRecorder:
+    """Buffer activity times per user and flush them in batches.
+
+    Only the latest time per user and kind is kept, so a user active many
+    times between flushes costs one row update. Flushes never move a time
+    backwards, so workers flushing out of order cannot undo each other.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        flush_interval: float = 5.0,
+        max_pending: int = 10000,
+        batch_size: int = 1000,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._pending: dict[str, dict[int, datetime]] = {
+            kind: {} for kind in ACTIVITY_COLUMNS
+        }
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered activity times."""
+        return sum(len(times) for times in self._pending.values())
+
+    def _merge(self, kind: str, user_id: int, at: datetime) -> None:
+        times = self._pending[kind]
+        if user_id not in times or times[user_id] < at:
+            times[user_id] = at
+
+    def _record(self, kind: str, user_id: int, at: datetime | None) -> None:
+        self._merge(kind, user_id, at or datetime.now(UTC).replace(tzinfo=None))
+        if self.pending >= self.max_pending:
+            self._flush_requested.set()
+
+    def record_login(self, user_id: int, at: datetime | None = None) -> None:
+        """Note a login, which also counts as being seen."""
+        self._record("last_login", user_id, at)
+        self._record("last_seen", user_id, at)
+
+    def record_seen(self, user_id: int, at: datetime | None = None) -> None:
+        """Note an authenticated request."""
+        self._record("last_seen", user_id, at)
+
+    async def _write(
+        self, session: AsyncSession, kind: str, times: dict[int, datetime]
+    ) -> None:
+        """Write one batch of times with a single UPDATE ... FROM (VALUES ...)."""
+        rows = values(
+            column("id", Integer), column("at", DateTime), name="activity"
+        ).data(sorted(times.items()))
+        target = getattr(User, kind)
+        await session.execute(
+            update(User)
+            .where(User.id == rows.c.id)
+            .values(
+                {
+                    # GREATEST ignores NULL, so a first time is simply set
+                    kind: func.greatest(target, rows.c.at),
+                    # Activity is not an edit of the user
+                    "updated_at": User.updated_at,
+                }
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def flush(self) -> int:
+        """Write all buffered times, returning how many were written.
+
+        Times from a failed flush are put back to be retried next time.
+        """
+        async with self._flush_lock:
+            batches = {kind: times for kind, times in self._pending.items() if times}
+            if not batches:
+                return 0
+            self._pending = {kind: {} for kind in ACTIVITY_COLUMNS}
+            self._flush_requested.clear()
+
+            try:
+                async with self.session_factory() as session:
+                    for kind, times in batches.items():
+                        items = iter(times.items())
+                        while chunk := dict(islice(items, self.batch_size)):
+                            await self._write(session, kind, chunk)
+                    await session.commit()
+            except Exception:
+                for kind, times in batches.items():
+                    for user_id, at in times.items():
+                        self._merge(kind, user_id, at)
+                raise
+
+            return sum(len(times) for times in batches.values())
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush user activity")
+
+    def start(self) -> None:
+        """Start flushing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write what is still buffered."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to flush user activity on shutdown")
+
+
+# Global activity recorder
+activity_recorder: ActivityRecorder | None = None
+
+
+def init_activity_recorder(start: bool = True) -> None:
+    """Initialize activity recorder, flushing in the background if started."""
+    global activity_recorder  # noqa: PLW0603 - process-wide singleton
+    activity_recorder = ActivityRecorder(
+        AsyncSessionLocal,
+        flush_interval=settings.activity_flush_interval,
+        max_pending=settings.activity_max_pending,
+        batch_size=settings.activity_batch_size,
+    )
+    if start:
+        activity_recorder.start()
+
+
+async def close_activity_recorder() -> None:
+    """Flush buffered activity and stop the recorder."""
+    global activity_recorder  # noqa: PLW0603 - process-wide singleton
+    if activity_recorder:
+        await activity_recorder.stop()
+        activity_recorder = None
+
+
+def get_activity_recorder() -> ActivityRecorder:
+    """Get activity recorder.
+
+    Outside the application lifespan the recorder only buffers; nothing is
+    flushed until it is started or flushed explicitly.
+    """
+    if not activity_recorder:
+        init_activity_recorder(start=False)
+    return activity_recorder
@@ -0,0 +1,125 @@
+"""
+Set-based edits of many-to-many association tables.
+"""
+
+from collections.abc import Collection
+
+from sqlalchemy import Table, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import (
+    Permission,
+    Role,
+    User,
+    role_permission_table,
+    user_role_table,
+)
+
+
+class LinkTable:
+    """Add, remove and replace links between two models in bulk.
+
+    Every operation is a single INSERT ... SELECT ... ON CONFLICT DO NOTHING
+    or DELETE ... WHERE IN statement, however many pairs it touches, and
+    returns how many links actually changed. Callers commit.
+    """
+
+    def __init__(
+        self, table: Table, left_key: str, right_key: str, left_model, right_model
+    ):
+        self.table = table
+        self.left_column = table.c[left_key]
+        self.right_column = table.c[right_key]
+        self.left_model = left_model
+        self.right_model = right_model
+
+    async def _count_existing(self, db: AsyncSession, model, ids: set[int]) -> int:
+        return await db.scalar(
+            select(func.count()).select_from(model).where(model.id.in_(ids))
+        )
+
+    async def all_exist(
+        self,
+        db: AsyncSession,
+        left_ids: Collection[int],
+        right_ids: Collection[int],
+    ) -> bool:
+        """Check that every id refers to an existing row."""
+        for model, ids in (
+            (self.left_model, set(left_ids)),
+            (self.right_model, set(right_ids)),
+        ):
+            if ids and await self._count_existing(db, model, ids) != len(ids):
+                return False
+        return True
+
+    async def add(
+        self,
+        db: AsyncSession,
+        left_ids: Collection[int],
+        right_ids: Collection[int],
+    ) -> int:
+        """Link every left row to every right row, returning links added."""
+        if not left_ids or not right_ids:
+            return 0
+
+        result = await db.execute(
+            pg_insert(self.table)
+            .from_select(
+                [self.left_column.name, self.right_column.name],
+                select(self.left_model.id, self.right_model.id).where(
+                    self.left_model.id.in_(set(left_ids)),
+                    self.right_model.id.in_(set(right_ids)),
+                ),
+            )
+            .on_conflict_do_nothing()
+        )
+        return result.rowcount
+
+    async def remove(
+        self,
+        db: AsyncSession,
+        left_ids: Collection[int],
+        right_ids: Collection[int],
+    ) -> int:
+        """Unlink every left row from every right row, returning links removed."""
+        if not left_ids or not right_ids:
+            return 0
+
+        result = await db.execute(
+            delete(self.table).where(
+                self.left_column.in_(set(left_ids)),
+                self.right_column.in_(set(right_ids)),
+            )
+        )
+        return result.rowcount
+
+    async def replace(
+        self, db: AsyncSession, left_id: int, right_ids: Collection[int]
+    ) -> tuple[int, int]:
+        """Make right_ids the exact links of one left row.
+
+        The left row is locked first so concurrent replacements of the same
+        row apply one after the other. Returns (added, removed).
+        """
+        await db.execute(
+            select(self.left_model.id)
+            .where(self.left_model.id == left_id)
+            .with_for_update()
+        )
+
+        conditions = [self.left_column == left_id]
+        if right_ids:
+            conditions.append(self.right_column.not_in(set(right_ids)))
+        result = await db.execute(delete(self.table).where(*conditions))
+        removed = result.rowcount
+
+        added = await self.add(db, [left_id], right_ids)
+        return added, removed
+
+
+USER_ROLES = LinkTable(user_role_table, "user_id", "role_id", User, Role)
+ROLE_PERMISSIONS = LinkTable(
+    role_permission_table, "role_id", "permission_id", Role, Permission
+)
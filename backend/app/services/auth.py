@@ -2,24 +2,36 @@
 Authentication service for business logic.
 """
 
+import uuid
 from datetime import timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.hashing import check_password
+from app.core.permissions import AuthPrincipal
+from app.core.redis import get_cache_manager
+from app.core.revocation import verify_active_token
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     generate_password_reset_token,
-    verify_password,
+    now_ms,
     verify_password_reset_token,
-    verify_token,
 )
 from app.models.user import User
 from app.schemas.auth import LoginResponse
+from app.services.activity import get_activity_recorder
+from app.services.permission_claims import get_permission_claims
+from app.services.principal import PrincipalService
+from app.services.sessions import get_session_registry
 from app.services.user import UserService
 
 
+def _authz_claim(claim: dict | None) -> dict | None:
+    return {"authz": claim} if claim else None
+
+
 class AuthService:
     """Authentication service for business logic."""
 
@@ -34,7 +46,7 @@ class AuthService:
         if not user:
             return None
 
-        if not verify_password(password, user.hashed_password):
+        if not await check_password(password, user.hashed_password):
             return None
 
         if not user.is_active:
@@ -43,16 +55,26 @@ class AuthService:
         return user
 
     async def login(
-        self, username: str, password: str, remember_me: bool = False
+        self,
+        username: str,
+        password: str,
+        remember_me: bool = False,
+        device: str | None = None,
     ) -> LoginResponse | None:
-        """Login user and return tokens."""
+        """Login user, starting a session, and return tokens.
+
+        Raises SessionStoreUnavailableError if the session cannot be stored.
+        """
+        # Before the user is read, so permission claims are never fresher
+        # than the access they encode
+        loaded_at = now_ms()
         user = await self.authenticate_user(username, password)
 
         if not user:
             return None
 
-        # Update last login
-        await self.user_service.update_last_login(user.id)
+        # Written behind by the activity recorder, off the login path
+        get_activity_recorder().record_login(user.id)
 
         # Create tokens
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
@@ -60,15 +82,33 @@ class AuthService:
 
         # Extend token expiry if remember me is checked
         if remember_me:
-            access_token_expires = timedelta(hours=24)  # 24 hours
-            refresh_token_expires = timedelta(days=30)  # 30 days
+            access_token_expires = timedelta(
+                hours=settings.remember_me_access_token_expire_hours
+            )
+            refresh_token_expires = timedelta(
+                days=settings.remember_me_refresh_token_expire_days
+            )
+
+        refresh_jti = uuid.uuid4().hex
+        session_id = await get_session_registry().create(
+            user.id,
+            refresh_jti,
+            int(refresh_token_expires.total_seconds()),
+            device,
+        )
 
         access_token = create_access_token(
-            subject=user.id, expires_delta=access_token_expires
+            subject=user.id,
+            expires_delta=access_token_expires,
+            session_id=session_id,
+            claims=self._permission_claims(user, loaded_at),
         )
 
         refresh_token = create_refresh_token(
-            subject=user.id, expires_delta=refresh_token_expires
+            subject=user.id,
+            expires_delta=refresh_token_expires,
+            session_id=session_id,
+            token_id=refresh_jti,
         )
 
         # Prepare user data for response
@@ -94,30 +134,75 @@ class AuthService:
             user=user_data,
         )
 
+    @staticmethod
+    def _permission_claims(user: User, loaded_at: int) -> dict | None:
+        """Get the permission claim for a login's access token, if enabled."""
+        claims = get_permission_claims()
+        if claims is None:
+            return None
+        return _authz_claim(claims.encode(AuthPrincipal.from_user(user), loaded_at))
+
+    async def _refreshed_permission_claims(self, user_id: int) -> dict | None:
+        """Get the permission claim for a refreshed access token, if enabled.
+
+        The principal is loaded through its cache, so refreshing still does
+        not read the user table when the cache is warm.
+        """
+        claims = get_permission_claims()
+        if claims is None:
+            return None
+        principal_service = PrincipalService(self.db, await get_cache_manager())
+        loaded_at = now_ms()
+        principal = await principal_service.get(user_id)
+        return _authz_claim(claims.encode(principal, loaded_at)) if principal else None
+
     async def refresh_token(self, refresh_token: str) -> dict | None:
-        """Refresh access token using refresh token."""
-        user_id = verify_token(refresh_token, "refresh")
+        """Rotate a refresh token, returning new access and refresh tokens.
+
+        The refresh token is left out when a concurrent refresh of the same
+        token, within the reuse grace period, has already rotated it.
 
-        if not user_id:
+        The session registry, not the user table, decides whether the token
+        is still good: deactivating a user ends their sessions.
+        """
+        payload = await verify_active_token(refresh_token, "refresh")
+
+        if not payload or not payload.get("sid"):
             return None
 
-        user = await self.user_service.get_by_id(int(user_id))
+        refresh_jti = uuid.uuid4().hex
+        rotation = await get_session_registry().rotate(
+            payload["sid"], payload["sub"], payload["jti"], refresh_jti
+        )
 
-        if not user or not user.is_active:
+        if not rotation:
             return None
 
         # Create new access token
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
         access_token = create_access_token(
-            subject=user.id, expires_delta=access_token_expires
+            subject=payload["sub"],
+            expires_delta=access_token_expires,
+            session_id=payload["sid"],
+            claims=await self._refreshed_permission_claims(int(payload["sub"])),
         )
-
-        return {
+        token_data = {
             "access_token": access_token,
             "token_type": "bearer",
             "expires_in": int(access_token_expires.total_seconds()),
         }
 
+        # A concurrent refresh already rotated this token; its caller holds
+        # the session's refresh token, so no other is issued
+        if rotation.rotated:
+            token_data["refresh_token"] = create_refresh_token(
+                subject=payload["sub"],
+                expires_delta=timedelta(seconds=rotation.lifetime),
+                session_id=payload["sid"],
+                token_id=refresh_jti,
+            )
+        return token_data
+
     async def register(self, user_data: dict) -> User | None:
         """Register new user."""
         # Check if username or email already exists
@@ -166,12 +251,12 @@ class AuthService:
 
     async def verify_token_and_get_user(self, token: str) -> User | None:
         """Verify token and return user."""
-        user_id = verify_token(token, "access")
+        payload = await verify_active_token(token, "access")
 
-        if not user_id:
+        if not payload:
             return None
 
-        user = await self.user_service.get_by_id(int(user_id))
+        user = await self.user_service.get_by_id(int(payload["sub"]))
 
         if not user or not user.is_active:
             return None
@@ -0,0 +1,141 @@
+"""
+Row counting strategies for paginated listings.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_cache_manager
+
+COUNT_CACHE_KEY = "count:{table}:{digest}"
+
+
+class CountStrategy(StrEnum):
+    """How to compute the total for a paginated listing."""
+
+    EXACT = "exact"  # SELECT count(*) with the listing's filters
+    ESTIMATED = "estimated"  # planner statistics, exact below a threshold
+    CACHED = "cached"  # exact count cached per normalized filter set
+
+
+@dataclass(frozen=True)
+class CountResult:
+    """Row count and whether it is known to be exact."""
+
+    total: int
+    exact: bool = True
+
+
+def cursor_page_strategy(strategy: CountStrategy, cursor: str | None) -> CountStrategy:
+    """Strategy for the total sent alongside a keyset page.
+
+    The first page counts as asked. Later pages only carry the total along,
+    so an exact count is estimated there rather than rerun on every page.
+    """
+    if cursor and strategy == CountStrategy.EXACT:
+        return CountStrategy.ESTIMATED
+    return strategy
+
+
+async def count_rows(
+    db: AsyncSession,
+    model: Any,
+    conditions: list,
+    strategy: CountStrategy = CountStrategy.EXACT,
+    filters: dict[str, Any] | None = None,
+) -> CountResult:
+    """Count rows of model matching conditions using the given strategy.
+
+    ``filters`` are the raw listing filters; they key the cached strategy.
+    """
+    if strategy == CountStrategy.ESTIMATED:
+        estimate = await _estimate_count(db, model, conditions)
+        if estimate is not None and estimate >= settings.count_estimate_threshold:
+            return CountResult(total=estimate, exact=False)
+        return CountResult(total=await _exact_count(db, model, conditions))
+
+    if strategy == CountStrategy.CACHED:
+        return await _cached_count(db, model, conditions, filters or {})
+
+    return CountResult(total=await _exact_count(db, model, conditions))
+
+
+async def _exact_count(db: AsyncSession, model: Any, conditions: list) -> int:
+    """Run SELECT count() with the given conditions."""
+    count_query = select(func.count(model.id))
+    if conditions:
+        count_query = count_query.where(and_(*conditions))
+
+    total_result = await db.execute(count_query)
+    return total_result.scalar()
+
+
+async def _estimate_count(db: AsyncSession, model: Any, conditions: list) -> int | None:
+    """Estimate row count from planner statistics."""
+    table = model.__table__.name
+
+    if not conditions:
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+            {"t": f'"{table}"'},
+        )
+        reltuples = result.scalar()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        if reltuples is None or reltuples < 0:
+            return None
+        return int(reltuples)
+
+    # EXPLAIN cannot take bind parameters for the inner statement, so the
+    # filter values are rendered as literals escaped by the session's dialect
+    # and the statement is sent as-is, bypassing text() bind parsing.
+    connection = await db.connection()
+    query = select(model.id).where(and_(*conditions))
+    compiled = query.compile(
+        dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _cached_count(
+    db: AsyncSession, model: Any, conditions: list, filters: dict[str, Any]
+) -> CountResult:
+    """Serve count from cache, computing and storing it on a miss."""
+    cache = await get_cache_manager()
+    key = COUNT_CACHE_KEY.format(
+        table=model.__table__.name, digest=normalize_filters(filters)
+    )
+
+    cached = await cache.get(key)
+    if cached is not None:
+        return CountResult(total=cached, exact=False)
+
+    total = await _exact_count(db, model, conditions)
+    await cache.set(key, total, expire=settings.count_cache_ttl)
+    return CountResult(total=total)
+
+
+def normalize_filters(filters: dict[str, Any]) -> str:
+    """Digest filters so equivalent listings share a cache entry."""
+    normalized = {}
+    for name, value in filters.items():
+        if value is None or value == "":
+            continue
+        if isinstance(value, str):
+            text_value = value.strip()
+            normalized[name] = text_value.lower() if name == "search" else text_value
+        else:
+            normalized[name] = value
+
+    payload = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
@@ -0,0 +1,186 @@
+"""
+File service for business logic.
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.file import File, FileBlob
+from app.services.counting import CountResult, CountStrategy, count_rows
+from app.services.storage import BlobStore, StoredFile
+from app.services.thumbnails import get_thumbnail_generator
+from app.utils.pagination import KeysetPage, KeysetPaginator
+
+logger = logging.getLogger(__name__)
+
+# Files are listed newest first; (created_at, id) is unique and indexed
+FILE_PAGINATOR = KeysetPaginator(
+    [File.created_at, File.id],
+    descending=True,
+    parsers=[datetime.fromisoformat, int],
+)
+
+
+def _blob_lock(sha256: str):
+    """Transaction-scoped advisory lock serializing storage of one blob."""
+    key = int.from_bytes(bytes.fromhex(sha256)[:8], "big", signed=True)
+    return select(func.pg_advisory_xact_lock(key))
+
+
+class FileService:
+    """File service for business logic.
+
+    File contents live in a BlobStore keyed by SHA256, shared by every file
+    with the same content. Blob rows carry a reference count, and a blob is
+    only unlinked when the last file using it is deleted.
+    """
+
+    def __init__(self, db: AsyncSession, blobs: BlobStore):
+        self.db = db
+        self.blobs = blobs
+
+    async def get_by_name(self, name: str) -> File | None:
+        """Get file by its public name."""
+        result = await self.db.execute(select(File).where(File.name == name))
+        return result.scalar_one_or_none()
+
+    def _build_filters(self, owner_id: int | None = None) -> list:
+        """Build filter conditions for file listings."""
+        conditions = []
+
+        if owner_id is not None:
+            conditions.append(File.owner_id == owner_id)
+
+        return conditions
+
+    async def count_files(
+        self,
+        owner_id: int | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> CountResult:
+        """Count files matching filters."""
+        conditions = self._build_filters(owner_id)
+
+        return await count_rows(
+            self.db,
+            File,
+            conditions,
+            count_strategy,
+            filters={"owner_id": owner_id},
+        )
+
+    async def get_all_by_cursor(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        owner_id: int | None = None,
+    ) -> KeysetPage[File]:
+        """Get files after a cursor, newest first.
+
+        Raises ValueError if the cursor is malformed.
+        """
+        query = select(File).where(*self._build_filters(owner_id))
+
+        query = FILE_PAGINATOR.apply(query, cursor, limit)
+        result = await self.db.execute(query)
+        files = result.scalars().all()
+
+        return FILE_PAGINATOR.paginate(files, cursor, limit)
+
+    async def create(
+        self,
+        staged: StoredFile,
+        name: str,
+        original_filename: str,
+        content_type: str | None = None,
+        owner_id: int | None = None,
+    ) -> File:
+        """Create file from a staged upload, deduplicating its content."""
+        try:
+            # Held until commit, so a blob being unlinked after its last
+            # file was deleted is either gone before we store it afresh or
+            # sees our row and is kept.
+            await self.db.execute(_blob_lock(staged.sha256))
+            result = await self.db.execute(
+                pg_insert(FileBlob)
+                .values(sha256=staged.sha256, size=staged.size, ref_count=1)
+                .on_conflict_do_update(
+                    index_elements=[FileBlob.sha256],
+                    set_={
+                        "ref_count": FileBlob.ref_count + 1,
+                        "updated_at": func.now(),
+                    },
+                )
+                .returning(FileBlob.id)
+            )
+            blob_id = result.scalar_one()
+
+            await self.blobs.commit(staged)
+
+            file = File(
+                name=name,
+                original_filename=original_filename,
+                content_type=content_type,
+                size=staged.size,
+                sha256=staged.sha256,
+                owner_id=owner_id,
+                blob_id=blob_id,
+            )
+            self.db.add(file)
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            await self.blobs.discard(staged)
+            raise
+
+        await self.db.refresh(file)
+        return file
+
+    async def delete(self, name: str) -> bool:
+        """Delete file, unlinking its blob if no other file uses it."""
+        file = await self.get_by_name(name)
+        if not file:
+            return False
+
+        result = await self.db.execute(
+            update(FileBlob)
+            .where(FileBlob.id == file.blob_id)
+            .values(ref_count=FileBlob.ref_count - 1)
+            .returning(FileBlob.ref_count, FileBlob.sha256)
+        )
+        ref_count, sha256 = result.one()
+
+        await self.db.delete(file)
+        if ref_count <= 0:
+            await self.db.flush()
+            await self.db.execute(delete(FileBlob).where(FileBlob.id == file.blob_id))
+        await self.db.commit()
+
+        # Content is only unlinked once the rows are durably gone
+        if ref_count <= 0:
+            await self._remove_unused_blob(sha256)
+        return True
+
+    async def _remove_unused_blob(self, sha256: str) -> None:
+        """Unlink a blob and its variants unless a file uses it again.
+
+        A failure only leaves unreferenced content behind, so it is logged
+        rather than raised.
+        """
+        try:
+            await self.db.execute(_blob_lock(sha256))
+            in_use = await self.db.scalar(
+                select(FileBlob.id).where(FileBlob.sha256 == sha256)
+            )
+            if in_use is None:
+                await self.blobs.remove(sha256)
+                await get_thumbnail_generator().remove(sha256)
+        except Exception:
+            logger.exception("Failed to remove unused blob %s", sha256)
+        finally:
+            # Releases the lock
+            await self.db.rollback()
@@ -2,10 +2,32 @@
 Permission service for business logic.
 """
 
-from sqlalchemy import and_, func, or_, select
+from collections.abc import AsyncIterator
+
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.user import Permission
+from app.services.counting import CountResult, CountStrategy, count_rows
+from app.services.principal import invalidate_all_principals
+from app.services.updates import update_returning
+from app.utils.pagination import KeysetPage, KeysetPaginator
+from app.utils.search import TextSearch
+
+# (resource, action) is unique and backed by _resource_action_uc
+PERMISSION_PAGINATOR = KeysetPaginator(
+    [Permission.resource, Permission.action], parsers=[str, str]
+)
+
+# Backed by the ix_permission_search_trgm trigram index
+PERMISSION_SEARCH = TextSearch(
+    Permission.name,
+    Permission.display_name,
+    Permission.description,
+    Permission.resource,
+    Permission.action,
+)
 
 
 class PermissionService:
@@ -28,32 +50,18 @@ class PermissionService:
         )
         return result.scalar_one_or_none()
 
-    async def get_all(
+    def _build_filters(
         self,
-        skip: int = 0,
-        limit: int = 100,
         search: str | None = None,
         resource: str | None = None,
         action: str | None = None,
         is_active: bool | None = None,
-    ) -> tuple[list[Permission], int]:
-        """Get all permissions with pagination and filters."""
-        query = select(Permission)
-
-        # Apply filters
+    ) -> list:
+        """Build filter conditions for permission listings."""
         conditions = []
 
         if search:
-            search_term = f"%{search}%"
-            conditions.append(
-                or_(
-                    Permission.name.ilike(search_term),
-                    Permission.display_name.ilike(search_term),
-                    Permission.description.ilike(search_term),
-                    Permission.resource.ilike(search_term),
-                    Permission.action.ilike(search_term),
-                )
-            )
+            conditions.append(PERMISSION_SEARCH.condition(search))
 
         if resource:
             conditions.append(Permission.resource == resource)
@@ -64,18 +72,68 @@ class PermissionService:
         if is_active is not None:
             conditions.append(Permission.is_active == is_active)
 
+        return conditions
+
+    async def stream_permissions(
+        self,
+        search: str | None = None,
+        resource: str | None = None,
+        action: str | None = None,
+        is_active: bool | None = None,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[Permission]:
+        """Stream permissions matching filters in id order.
+
+        Rows are fetched through a server-side cursor in batches of
+        batch_size, so memory use does not grow with the table.
+        """
+        query = (
+            select(Permission)
+            .where(*self._build_filters(search, resource, action, is_active))
+            .order_by(Permission.id)
+            .execution_options(yield_per=batch_size or settings.export_batch_size)
+        )
+
+        result = await self.db.stream_scalars(query)
+        async for permission in result:
+            yield permission
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        *,
+        search: str | None = None,
+        resource: str | None = None,
+        action: str | None = None,
+        is_active: bool | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> tuple[list[Permission], CountResult]:
+        """Get all permissions with pagination and filters."""
+        query = select(Permission)
+
+        # Apply filters
+        conditions = self._build_filters(search, resource, action, is_active)
         if conditions:
             query = query.where(and_(*conditions))
 
         # Get total count
-        count_query = select(func.count(Permission.id))
-        if conditions:
-            count_query = count_query.where(and_(*conditions))
-
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+        total = await count_rows(
+            self.db,
+            Permission,
+            conditions,
+            count_strategy,
+            filters={
+                "search": search,
+                "resource": resource,
+                "action": action,
+                "is_active": is_active,
+            },
+        )
 
-        # Get paginated results
+        # Get paginated results, best matches first when searching
+        if search:
+            query = query.order_by(PERMISSION_SEARCH.rank(search).desc())
         query = (
             query.offset(skip)
             .limit(limit)
@@ -86,6 +144,32 @@ class PermissionService:
 
         return list(permissions), total
 
+    async def get_all_by_cursor(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        *,
+        search: str | None = None,
+        resource: str | None = None,
+        action: str | None = None,
+        is_active: bool | None = None,
+    ) -> KeysetPage[Permission]:
+        """Get permissions after a cursor, ordered by resource and action.
+
+        Raises ValueError if the cursor is malformed.
+        """
+        query = select(Permission)
+
+        conditions = self._build_filters(search, resource, action, is_active)
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        query = PERMISSION_PAGINATOR.apply(query, cursor, limit)
+        result = await self.db.execute(query)
+        permissions = result.scalars().all()
+
+        return PERMISSION_PAGINATOR.paginate(permissions, cursor, limit)
+
     async def create(self, permission_data: dict) -> Permission:
         """Create new permission."""
         permission = Permission(**permission_data)
@@ -98,17 +182,17 @@ class PermissionService:
         self, permission_id: int, permission_data: dict
     ) -> Permission | None:
         """Update permission."""
-        permission = await self.get_by_id(permission_id)
+        values = {
+            field: value
+            for field, value in permission_data.items()
+            if hasattr(Permission, field)
+        }
+        permission = await update_returning(self.db, Permission, permission_id, values)
         if not permission:
             return None
 
-        # Update fields
-        for field, value in permission_data.items():
-            if hasattr(permission, field):
-                setattr(permission, field, value)
-
         await self.db.commit()
-        await self.db.refresh(permission)
+        await invalidate_all_principals()
         return permission
 
     async def delete(self, permission_id: int) -> bool:
@@ -119,6 +203,7 @@ class PermissionService:
 
         await self.db.delete(permission)
         await self.db.commit()
+        await invalidate_all_principals()
         return True
 
     async def name_exists(
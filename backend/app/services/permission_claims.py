@@ -0,0 +1,238 @@
+"""
+Permission claims: authorization without a database or Redis lookup.
+
+With PERMISSION_CLAIMS_ENABLED, access tokens carry the user's roles and
+permissions as bitsets over a permission catalog (see PermissionCatalog),
+and requests are authorized from the token alone. A claim is only trusted
+while it can still be current:
+
+- it was written with the catalog this worker has loaded, and
+- the principal it encodes was loaded after the last role or permission
+  change affecting its user, recorded as a stale-before cutoff time.
+
+Claims record when their principal was loaded (taken before reading it)
+rather than relying on the token's iat, as logging in or refreshing reads
+the principal well before the token is issued. Other tokens fall back to
+loading the principal as before. Cutoffs are stored in Redis and mirrored
+by every worker over pub/sub, the same way the token denylist is; a worker
+that has not heard of a change yet keeps trusting older claims for as long
+as the message takes to arrive. A worker that fails to store a cutoff
+trusts no claim until it has.
+"""
+
+import logging
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.mirror import RedisMirror
+from app.core.permissions import AuthPrincipal, PermissionCatalog
+from app.core.redis import get_redis
+from app.core.security import now_ms
+from app.models.user import Permission, Role
+
+logger = logging.getLogger(__name__)
+
+STALE_ALL_KEY = "auth:claims:stale"
+STALE_USER_KEY = "auth:claims:stale:{user_id}"
+PERMISSION_CLAIMS_CHANNEL = "auth:claims"
+
+# Cutoffs must outlast every access token carrying a claim
+STALE_CUTOFF_TTL = settings.max_access_token_lifetime
+
+
+class PermissionClaims(RedisMirror):
+    """Issue permission claims and trust them while they are current.
+
+    Reloading also reloads the catalog.
+    """
+
+    channel = PERMISSION_CLAIMS_CHANNEL
+    name = "permission claims"
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        reload_interval: float = 300.0,
+    ):
+        super().__init__(reload_interval=reload_interval)
+        self.session_factory = session_factory
+        self.catalog: PermissionCatalog | None = None
+        # Cutoff times in milliseconds, for everyone and by user id
+        self.stale_before = 0
+        self.user_stale_before: dict[int, int] = {}
+        # Users whose cutoff failed to store, None standing for everyone
+        self._unstored: set[int | None] = set()
+
+    def _mirror(self, event: dict[str, Any]) -> None:
+        """Mirror one stale cutoff locally."""
+        before = int(event["before"])
+        if event.get("user_id") is None:
+            self.stale_before = max(self.stale_before, before)
+        else:
+            user_id = int(event["user_id"])
+            self.user_stale_before[user_id] = max(
+                self.user_stale_before.get(user_id, 0), before
+            )
+
+    def encode(self, principal: AuthPrincipal, loaded_at: int) -> dict[str, Any] | None:
+        """Encode a principal as a claim, if a catalog is loaded.
+
+        loaded_at is when the principal was loaded, in milliseconds, taken
+        before reading it.
+        """
+        if self.catalog is None or not principal.is_active:
+            return None
+        claim = self.catalog.encode(principal)
+        return {**claim, "t": loaded_at} if claim else None
+
+    def principal(self, payload: dict[str, Any]) -> AuthPrincipal | None:
+        """Get the principal of a verified access token from its claim.
+
+        Returns None when the claim cannot be trusted and the principal
+        must be loaded instead.
+        """
+        claim = payload.get("authz")
+        if claim is None or self.catalog is None:
+            return None
+
+        try:
+            user_id = int(payload["sub"])
+            loaded_at = int(claim["t"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        cutoff = max(self.stale_before, self.user_stale_before.get(user_id, 0))
+        # Ties go to the change
+        if loaded_at <= cutoff:
+            return None
+
+        return self.catalog.decode(user_id, claim)
+
+    async def mark_stale(self, user_id: int | None = None) -> None:
+        """Stop trusting claims loaded so far, for one user or for everyone.
+
+        Changes affecting everyone may also have changed the catalog, so
+        every worker reloads it. If the cutoff cannot be stored, other
+        workers never hear of it, and this one would forget it on reload:
+        no claim is issued or trusted here until a reload stores it.
+        """
+        try:
+            await self._store_stale(user_id)
+        except Exception:
+            logger.warning("Failed to store stale permission claims cutoff")
+            self._unstored.add(user_id)
+            self.catalog = None
+            return
+
+        if user_id is None:
+            try:
+                await self.load_catalog()
+            except Exception:
+                # Claims written with the old catalog are still read back
+                # correctly, and it cannot express any new name
+                logger.exception("Failed to reload permission catalog")
+
+    async def _store_stale(self, user_id: int | None) -> None:
+        """Record a cutoff now, locally and in Redis for other workers."""
+        event = {"user_id": user_id, "before": now_ms()}
+        self._apply(event)
+        client = await get_redis()
+        key = (
+            STALE_ALL_KEY if user_id is None else STALE_USER_KEY.format(user_id=user_id)
+        )
+        await client.set(key, event["before"], ex=STALE_CUTOFF_TTL)
+        await self._publish(event)
+
+    async def load_catalog(self) -> None:
+        """Load the catalog from the database, numbering names by id.
+
+        Claims stay off while a cutoff is unstored.
+        """
+        async with self.session_factory() as session:
+            roles = await session.scalars(select(Role.name).order_by(Role.id))
+            permissions = await session.scalars(
+                select(Permission.name).order_by(Permission.id)
+            )
+            catalog = PermissionCatalog(tuple(roles), tuple(permissions))
+        if not self._unstored:
+            self.catalog = catalog
+
+    async def _scan(self) -> tuple[int, dict[int, int]]:
+        """Read every stale cutoff from Redis."""
+        client = await get_redis()
+        user_keys = [
+            key
+            async for key in client.scan_iter(
+                match=STALE_USER_KEY.format(user_id="*"), count=1000
+            )
+        ]
+        values = await client.mget([STALE_ALL_KEY, *user_keys])
+        return int(values[0] or 0), {
+            int(key.rsplit(":", 1)[1]): int(value)
+            for key, value in zip(user_keys, values[1:], strict=True)
+            if value is not None
+        }
+
+    def _replace(self, state: tuple[int, dict[int, int]]) -> None:
+        """Replace the cutoffs with those from a scan."""
+        self.stale_before, self.user_stale_before = state
+
+    async def reload(self) -> None:
+        """Rebuild the cutoff mirror from Redis and reload the catalog.
+
+        Cutoffs that failed to store are stored first, as of now: a later
+        cutoff than the one lost stales no fewer claims.
+        """
+        for user_id in list(self._unstored):
+            await self._store_stale(user_id)
+            self._unstored.discard(user_id)
+        await super().reload()
+        await self.load_catalog()
+
+    async def _on_message(self, event: dict[str, Any]) -> None:
+        """Mirror a cutoff, reloading the catalog on changes to everyone."""
+        self._apply(event)
+        if event.get("user_id") is None:
+            await self.load_catalog()
+
+    def _on_listen_error(self) -> None:
+        """Trust no claim until the mirror is current again."""
+        self.catalog = None
+
+
+# Global permission claims
+permission_claims: PermissionClaims | None = None
+
+
+def init_permission_claims(start: bool = True) -> None:
+    """Initialize permission claims, mirroring Redis in the background if started.
+
+    Until the mirror has loaded a catalog, no claims are issued or trusted.
+    """
+    global permission_claims  # noqa: PLW0603 - process-wide singleton
+    permission_claims = PermissionClaims(
+        AsyncSessionLocal,
+        reload_interval=settings.permission_claims_reload_interval,
+    )
+    if start:
+        permission_claims.start()
+
+
+async def close_permission_claims() -> None:
+    """Stop mirroring permission claims."""
+    global permission_claims  # noqa: PLW0603 - process-wide singleton
+    if permission_claims:
+        await permission_claims.stop()
+        permission_claims = None
+
+
+def get_permission_claims() -> PermissionClaims | None:
+    """Get permission claims, or None if they are disabled."""
+    if not settings.permission_claims_enabled:
+        return None
+    if not permission_claims:
+        init_permission_claims(start=False)
+    return permission_claims
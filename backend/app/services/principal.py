@@ -0,0 +1,84 @@
+"""
+Authorization principal service with Redis caching.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.core.permissions import AuthPrincipal
+from app.core.redis import CacheManager, get_cache_manager
+from app.models.user import Role, User
+from app.services.permission_claims import get_permission_claims
+
+PRINCIPAL_KEY = "auth:principal:{user_id}"
+USER_VERSION_KEY = "auth:principal:version:{user_id}"
+GLOBAL_VERSION_KEY = "auth:principal:version"
+
+
+class PrincipalService:
+    """Load authorization principals, preferring the Redis cache."""
+
+    def __init__(self, db: AsyncSession, cache: CacheManager):
+        self.db = db
+        self.cache = cache
+
+    async def get(self, user_id: int) -> AuthPrincipal | None:
+        """Get principal for user, loading from the database on cache miss."""
+        if not settings.auth_cache_enabled:
+            return await self._load(user_id)
+
+        # The cached entry is only valid for the version stamps it was built
+        # under: the global stamp moves on role/permission changes, the
+        # per-user stamp on membership or status changes for that user.
+        cached, global_version, user_version = await self.cache.get_many(
+            [
+                PRINCIPAL_KEY.format(user_id=user_id),
+                GLOBAL_VERSION_KEY,
+                USER_VERSION_KEY.format(user_id=user_id),
+            ]
+        )
+        version = [global_version or 0, user_version or 0]
+
+        if cached and cached.get("version") == version:
+            return AuthPrincipal.from_dict(cached)
+
+        principal = await self._load(user_id)
+        if principal:
+            await self.cache.set(
+                PRINCIPAL_KEY.format(user_id=user_id),
+                {**principal.to_dict(), "version": version},
+                expire=settings.auth_cache_ttl,
+            )
+
+        return principal
+
+    async def _load(self, user_id: int) -> AuthPrincipal | None:
+        """Load principal from the database."""
+        result = await self.db.execute(
+            select(User)
+            .options(selectinload(User.roles).selectinload(Role.permissions))
+            .where(User.id == user_id)
+        )
+        user = result.scalar_one_or_none()
+        if not user:
+            return None
+
+        return AuthPrincipal.from_user(user)
+
+
+async def invalidate_principal(user_id: int) -> None:
+    """Invalidate cached principal for a single user."""
+    cache = await get_cache_manager()
+    await cache.incr(USER_VERSION_KEY.format(user_id=user_id))
+    if claims := get_permission_claims():
+        await claims.mark_stale(user_id)
+
+
+async def invalidate_all_principals() -> None:
+    """Invalidate every cached principal after role or permission changes."""
+    cache = await get_cache_manager()
+    await cache.incr(GLOBAL_VERSION_KEY)
+    if claims := get_permission_claims():
+        await claims.mark_stale()
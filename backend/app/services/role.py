@@ -2,11 +2,32 @@
 Role service for business logic.
 """
 
-from sqlalchemy import and_, func, or_, select
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
 from app.models.user import Permission, Role
+from app.schemas.common import AssignmentResult
+from app.services.assignment import ROLE_PERMISSIONS
+from app.services.counting import CountResult, CountStrategy, count_rows
+from app.services.principal import invalidate_all_principals
+from app.services.updates import update_returning
+from app.utils.pagination import KeysetPage, KeysetPaginator
+from app.utils.search import TextSearch
+
+# Roles are listed newest first; (created_at, id) is unique and indexed
+ROLE_PAGINATOR = KeysetPaginator(
+    [Role.created_at, Role.id],
+    descending=True,
+    parsers=[datetime.fromisoformat, int],
+)
+
+# Backed by the ix_role_search_trgm trigram index
+ROLE_SEARCH = TextSearch(Role.name, Role.display_name, Role.description)
 
 
 class RoleService:
@@ -33,50 +54,100 @@ class RoleService:
         )
         return result.scalar_one_or_none()
 
+    def _build_filters(
+        self, search: str | None = None, is_active: bool | None = None
+    ) -> list:
+        """Build filter conditions for role listings."""
+        conditions = []
+
+        if search:
+            conditions.append(ROLE_SEARCH.condition(search))
+
+        if is_active is not None:
+            conditions.append(Role.is_active == is_active)
+
+        return conditions
+
+    async def stream_roles(
+        self,
+        search: str | None = None,
+        is_active: bool | None = None,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[Role]:
+        """Stream roles matching filters in id order.
+
+        Rows are fetched through a server-side cursor in batches of
+        batch_size, so memory use does not grow with the table.
+        """
+        query = (
+            select(Role)
+            .options(selectinload(Role.permissions))
+            .where(*self._build_filters(search, is_active))
+            .order_by(Role.id)
+            .execution_options(yield_per=batch_size or settings.export_batch_size)
+        )
+
+        result = await self.db.stream_scalars(query)
+        async for role in result:
+            yield role
+
     async def get_all(
         self,
         skip: int = 0,
         limit: int = 100,
         search: str | None = None,
         is_active: bool | None = None,
-    ) -> tuple[list[Role], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> tuple[list[Role], CountResult]:
         """Get all roles with pagination and filters."""
         query = select(Role).options(selectinload(Role.permissions))
 
         # Apply filters
-        conditions = []
-
-        if search:
-            search_term = f"%{search}%"
-            conditions.append(
-                or_(
-                    Role.name.ilike(search_term),
-                    Role.display_name.ilike(search_term),
-                    Role.description.ilike(search_term),
-                )
-            )
-
-        if is_active is not None:
-            conditions.append(Role.is_active == is_active)
-
+        conditions = self._build_filters(search, is_active)
         if conditions:
             query = query.where(and_(*conditions))
 
         # Get total count
-        count_query = select(func.count(Role.id))
-        if conditions:
-            count_query = count_query.where(and_(*conditions))
-
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+        total = await count_rows(
+            self.db,
+            Role,
+            conditions,
+            count_strategy,
+            filters={"search": search, "is_active": is_active},
+        )
 
-        # Get paginated results
+        # Get paginated results, best matches first when searching
+        if search:
+            query = query.order_by(ROLE_SEARCH.rank(search).desc())
         query = query.offset(skip).limit(limit).order_by(Role.created_at.desc())
         result = await self.db.execute(query)
         roles = result.scalars().all()
 
         return list(roles), total
 
+    async def get_all_by_cursor(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        search: str | None = None,
+        is_active: bool | None = None,
+    ) -> KeysetPage[Role]:
+        """Get roles after a cursor, newest first.
+
+        Raises ValueError if the cursor is malformed.
+        """
+        query = select(Role).options(selectinload(Role.permissions))
+
+        conditions = self._build_filters(search, is_active)
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        query = ROLE_PAGINATOR.apply(query, cursor, limit)
+        result = await self.db.execute(query)
+        roles = result.scalars().all()
+
+        return ROLE_PAGINATOR.paginate(roles, cursor, limit)
+
     async def create(self, role_data: dict) -> Role:
         """Create new role."""
         role = Role(**role_data)
@@ -87,17 +158,15 @@ class RoleService:
 
     async def update(self, role_id: int, role_data: dict) -> Role | None:
         """Update role."""
-        role = await self.get_by_id(role_id)
+        values = {
+            field: value for field, value in role_data.items() if hasattr(Role, field)
+        }
+        role = await update_returning(self.db, Role, role_id, values)
         if not role:
             return None
 
-        # Update fields
-        for field, value in role_data.items():
-            if hasattr(role, field):
-                setattr(role, field, value)
-
         await self.db.commit()
-        await self.db.refresh(role)
+        await invalidate_all_principals()
         return role
 
     async def delete(self, role_id: int) -> bool:
@@ -112,6 +181,7 @@ class RoleService:
 
         await self.db.delete(role)
         await self.db.commit()
+        await invalidate_all_principals()
         return True
 
     async def assign_permission(self, role_id: int, permission_id: int) -> bool:
@@ -132,6 +202,7 @@ class RoleService:
         if permission not in role.permissions:
             role.permissions.append(permission)
             await self.db.commit()
+            await invalidate_all_principals()
 
         return True
 
@@ -153,9 +224,57 @@ class RoleService:
         if permission in role.permissions:
             role.permissions.remove(permission)
             await self.db.commit()
+            await invalidate_all_principals()
 
         return True
 
+    async def assign_permissions(
+        self, role_ids: list[int], permission_ids: list[int]
+    ) -> AssignmentResult | None:
+        """Assign every permission to every role in one statement.
+
+        Returns None if any role or permission does not exist.
+        """
+        if not await ROLE_PERMISSIONS.all_exist(self.db, role_ids, permission_ids):
+            return None
+
+        added = await ROLE_PERMISSIONS.add(self.db, role_ids, permission_ids)
+        await self.db.commit()
+        if added:
+            await invalidate_all_principals()
+
+        return AssignmentResult(added=added)
+
+    async def remove_permissions(
+        self, role_ids: list[int], permission_ids: list[int]
+    ) -> AssignmentResult:
+        """Remove every permission from every role in one statement."""
+        removed = await ROLE_PERMISSIONS.remove(self.db, role_ids, permission_ids)
+        await self.db.commit()
+        if removed:
+            await invalidate_all_principals()
+
+        return AssignmentResult(removed=removed)
+
+    async def set_permissions(
+        self, role_id: int, permission_ids: list[int]
+    ) -> AssignmentResult | None:
+        """Replace a role's permissions with exactly permission_ids.
+
+        Returns None if the role or any permission does not exist.
+        """
+        if not await ROLE_PERMISSIONS.all_exist(self.db, [role_id], permission_ids):
+            return None
+
+        added, removed = await ROLE_PERMISSIONS.replace(
+            self.db, role_id, permission_ids
+        )
+        await self.db.commit()
+        if added or removed:
+            await invalidate_all_principals()
+
+        return AssignmentResult(added=added, removed=removed)
+
     async def name_exists(self, name: str, exclude_role_id: int | None = None) -> bool:
         """Check if role name exists."""
         query = select(Role.id).where(Role.name == name)
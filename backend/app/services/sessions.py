@@ -0,0 +1,257 @@
+"""
+Login session registry in Redis.
+
+Every login starts a session holding the id of its one current refresh
+token. Refreshing rotates that id; presenting a refresh token that has
+already been rotated away means it was copied, so the whole session (the
+token family) is ended, unless it was rotated moments ago by a concurrent
+refresh of the same token, say from another browser tab. Sessions are indexed per user, so listing them or
+logging out everywhere touches only that user's sessions.
+"""
+
+import logging
+import time
+import uuid
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.revocation import get_token_denylist
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEY = "{namespace}:session:{session_id}"
+USER_SESSIONS_KEY = "{namespace}:sessions:{user_id}"
+
+# Revoking a session must outlast every access token it issued
+SESSION_REVOCATION_TTL = settings.max_access_token_lifetime
+
+# KEYS: session, user index. ARGV: user id, presented jti, new jti, now,
+# grace seconds. Returns the session lifetime once rotated, 0 if there is no
+# such session for the user, -2 if the presented refresh token was rotated
+# away by a concurrent refresh within the grace period, or -1 if it was
+# rotated away before that.
+ROTATE_SCRIPT = """
+local fields = redis.call(
+    'HMGET', KEYS[1], 'user_id', 'refresh_jti', 'lifetime', 'previous_jti', 'rotated_at'
+)
+if not fields[1] or fields[1] ~= ARGV[1] then
+    return 0
+end
+if fields[2] ~= ARGV[2] then
+    if fields[4] == ARGV[2]
+        and tonumber(ARGV[4]) - tonumber(fields[5]) < tonumber(ARGV[5]) then
+        return -2
+    end
+    return -1
+end
+redis.call(
+    'HSET', KEYS[1], 'refresh_jti', ARGV[3], 'previous_jti', ARGV[2],
+    'rotated_at', ARGV[4], 'last_refresh', ARGV[4]
+)
+redis.call('EXPIRE', KEYS[1], fields[3])
+redis.call('EXPIRE', KEYS[2], fields[3], 'GT')
+return tonumber(fields[3])
+"""
+ROTATED_CONCURRENTLY = -2
+REUSED = -1
+
+
+class SessionStoreUnavailableError(Exception):
+    """Raised when a session cannot be started or refreshed for lack of Redis."""
+
+
+class Rotation(NamedTuple):
+    """Outcome of presenting a session's refresh token."""
+
+    # Seconds the session, and so its refresh token, lives on
+    lifetime: int
+    # False if a concurrent refresh rotated the token moments ago; the
+    # caller already holds the new refresh token and gets no other
+    rotated: bool = True
+
+
+class SessionRegistry:
+    """Create, rotate, list and end login sessions."""
+
+    def __init__(self, namespace: str = "auth"):
+        self.namespace = namespace
+
+    def _session_key(self, session_id: str) -> str:
+        return SESSION_KEY.format(namespace=self.namespace, session_id=session_id)
+
+    def _user_key(self, user_id: int | str) -> str:
+        return USER_SESSIONS_KEY.format(namespace=self.namespace, user_id=user_id)
+
+    async def create(
+        self, user_id: int, refresh_jti: str, lifetime: int, device: str | None
+    ) -> str:
+        """Start a session for a new refresh token, returning its id."""
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        try:
+            client = await get_redis()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.hset(
+                    self._session_key(session_id),
+                    mapping={
+                        "user_id": user_id,
+                        "device": device or "",
+                        "created_at": now,
+                        "last_refresh": now,
+                        "refresh_jti": refresh_jti,
+                        "lifetime": lifetime,
+                    },
+                )
+                pipe.expire(self._session_key(session_id), lifetime)
+                pipe.sadd(self._user_key(user_id), session_id)
+                # The index lives as long as its longest session
+                pipe.expire(self._user_key(user_id), lifetime, nx=True)
+                pipe.expire(self._user_key(user_id), lifetime, gt=True)
+                await pipe.execute()
+        except RedisError as e:
+            raise SessionStoreUnavailableError("Session store unavailable") from e
+        return session_id
+
+    async def rotate(
+        self, session_id: str, user_id: str, refresh_jti: str, new_refresh_jti: str
+    ) -> Rotation | None:
+        """Swap a session's refresh token for a new one.
+
+        Returns None if the session is gone or the presented token was
+        already rotated away. Reuse ends the session, revoking every token
+        issued under it, unless the token was rotated by a concurrent
+        refresh (say, from another tab) within REFRESH_REUSE_GRACE_SECONDS.
+        That refresh gets the rest of the session's lifetime but no new
+        refresh token: the concurrent one already holds it.
+        """
+        try:
+            client = await get_redis()
+            script = client.register_script(ROTATE_SCRIPT)
+            result = int(
+                await script(
+                    keys=[self._session_key(session_id), self._user_key(user_id)],
+                    args=[
+                        user_id,
+                        refresh_jti,
+                        new_refresh_jti,
+                        time.time(),
+                        settings.refresh_reuse_grace_seconds,
+                    ],
+                )
+            )
+            if result == ROTATED_CONCURRENTLY:
+                ttl = await client.ttl(self._session_key(session_id))
+                return Rotation(lifetime=ttl, rotated=False) if ttl > 0 else None
+        except RedisError as e:
+            raise SessionStoreUnavailableError("Session store unavailable") from e
+
+        if result == REUSED:
+            logger.warning(
+                "Refresh token reuse in session %s of user %s", session_id, user_id
+            )
+            await self.end(session_id, user_id)
+            return None
+        return Rotation(lifetime=result) if result else None
+
+    async def get(self, session_id: str) -> dict[str, Any] | None:
+        """Get a session."""
+        client = await get_redis()
+        session = await client.hgetall(self._session_key(session_id))
+        return _session_info(session_id, session) if session else None
+
+    async def list_for_user(self, user_id: int) -> list[dict[str, Any]]:
+        """List a user's live sessions, most recently refreshed first."""
+        client = await get_redis()
+        session_ids = sorted(await client.smembers(self._user_key(user_id)))
+        if not session_ids:
+            return []
+
+        async with client.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(self._session_key(session_id))
+            sessions = await pipe.execute()
+
+        # Expired sessions leave their ids behind in the index
+        expired = [
+            session_id
+            for session_id, session in zip(session_ids, sessions, strict=True)
+            if not session
+        ]
+        if expired:
+            await client.srem(self._user_key(user_id), *expired)
+
+        return sorted(
+            (
+                _session_info(session_id, session)
+                for session_id, session in zip(session_ids, sessions, strict=True)
+                if session
+            ),
+            key=lambda session: session["last_refresh"],
+            reverse=True,
+        )
+
+    async def end(self, session_id: str, user_id: int | str) -> bool:
+        """End one of a user's sessions, revoking its tokens."""
+        client = await get_redis()
+        owner = await client.hget(self._session_key(session_id), "user_id")
+        if owner != str(user_id):
+            return False
+
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._session_key(session_id))
+            pipe.srem(self._user_key(user_id), session_id)
+            await pipe.execute()
+        await get_token_denylist().revoke_session(session_id, SESSION_REVOCATION_TTL)
+        return True
+
+    async def end_all(self, user_id: int) -> int:
+        """End every session of a user and revoke all their tokens.
+
+        Returns how many sessions were ended.
+        """
+        client = await get_redis()
+        session_ids = await client.smembers(self._user_key(user_id))
+        async with client.pipeline(transaction=True) as pipe:
+            for session_id in session_ids:
+                pipe.delete(self._session_key(session_id))
+            pipe.delete(self._user_key(user_id))
+            results = await pipe.execute()
+
+        # One cutoff covers every token, including those of no session
+        await get_token_denylist().revoke_user(user_id)
+        return sum(results[:-1])
+
+
+def _session_info(session_id: str, session: dict[str, str]) -> dict[str, Any]:
+    return {
+        "session_id": session_id,
+        "user_id": int(session["user_id"]),
+        "device": session.get("device") or None,
+        "created_at": datetime.fromtimestamp(float(session["created_at"]), UTC),
+        "last_refresh": datetime.fromtimestamp(float(session["last_refresh"]), UTC),
+    }
+
+
+# Global session registry
+session_registry: SessionRegistry | None = None
+
+
+def get_session_registry() -> SessionRegistry:
+    """Get session registry."""
+    global session_registry  # noqa: PLW0603 - process-wide singleton
+    if not session_registry:
+        session_registry = SessionRegistry()
+    return session_registry
+
+
+async def end_user_sessions(user_id: int) -> None:
+    """End every session of a user, logging rather than raising on failure."""
+    try:
+        await get_session_registry().end_all(user_id)
+    except Exception:
+        logger.warning("Failed to end sessions of user %s", user_id)
+        await get_token_denylist().revoke_user(user_id)
@@ -0,0 +1,469 @@
+"""
+Streaming file storage for uploads.
+
+Uploads are copied to disk in fixed-size chunks: the size limit is enforced
+as bytes arrive, the SHA256 digest is computed on the fly, and all disk I/O
+runs in a worker thread so memory use stays flat and the event loop stays
+free no matter how large the file is or how many uploads run at once.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.utils.helpers import generate_uuid_string
+
+# Missing parts named in an error, at most
+MISSING_PARTS_SHOWN = 10
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File too large. Maximum size: {max_size} bytes")
+        self.max_size = max_size
+
+
+class UploadSessionError(Exception):
+    """Raised when an upload session part or completion is invalid."""
+
+
+@dataclass
+class StoredFile:
+    """A file written to storage."""
+
+    path: Path
+    size: int
+    sha256: str
+
+
+async def iter_upload_file(
+    file: UploadFile, chunk_size: int | None = None
+) -> AsyncIterator[bytes]:
+    """Yield an uploaded file's content in chunks."""
+    chunk_size = chunk_size or settings.upload_chunk_size
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+def _copy_parts(parts: list[Path], destination: Path, chunk_size: int) -> str:
+    """Concatenate part files into destination, returning the SHA256 digest."""
+    digest = hashlib.sha256()
+    with destination.open("wb") as target:
+        for part in parts:
+            with part.open("rb") as source:
+                while chunk := source.read(chunk_size):
+                    target.write(chunk)
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_chunk(buffer: BinaryIO, digest, chunk: bytes) -> None:
+    """Write a chunk and feed it to the digest (hashlib releases the GIL)."""
+    buffer.write(chunk)
+    digest.update(chunk)
+
+
+class FileStorage:
+    """Store streamed uploads under a root directory."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path_for(self, filename: str) -> Path:
+        """Get the storage path of a stored file."""
+        return self.root / filename
+
+    async def save(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        max_size: int | None = None,
+    ) -> StoredFile:
+        """Stream chunks into filename.
+
+        The file is written under a temporary name and moved into place only
+        once complete, so readers never see partial uploads.
+
+        Raises UploadTooLargeError as soon as more than max_size bytes have
+        been received; nothing is left on disk in that case.
+        """
+        max_size = settings.max_file_size if max_size is None else max_size
+        path = self.path_for(filename)
+        temp_path = path.with_name(f".{path.name}.{generate_uuid_string()}.part")
+        digest = hashlib.sha256()
+        size = 0
+
+        buffer = await asyncio.to_thread(temp_path.open, "wb")
+        try:
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_size:
+                        raise UploadTooLargeError(max_size)
+                    await asyncio.to_thread(_write_chunk, buffer, digest, chunk)
+            finally:
+                await asyncio.to_thread(buffer.close)
+
+            await asyncio.to_thread(os.replace, temp_path, path)
+        except BaseException:
+            await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+            raise
+
+        return StoredFile(path=path, size=size, sha256=digest.hexdigest())
+
+
+@dataclass
+class UploadSession:
+    """A resumable upload in progress."""
+
+    upload_id: str
+    owner_id: int
+    filename: str
+    size: int
+    part_size: int
+    content_type: str | None = None
+    created_at: float = 0.0
+
+    @property
+    def part_count(self) -> int:
+        """Number of parts the upload is split into."""
+        return (self.size + self.part_size - 1) // self.part_size
+
+    def part_range(self, part_number: int) -> tuple[int, int]:
+        """Byte range [start, end) covered by a part."""
+        start = (part_number - 1) * self.part_size
+        return start, min(start + self.part_size, self.size)
+
+
+class UploadSessionStore:
+    """Keep resumable upload sessions and their parts on disk.
+
+    Each session is a directory holding a JSON metadata file and one file per
+    received part, so parts may arrive in any order, in parallel, and be
+    retried individually.
+    """
+
+    META_FILE = "session.json"
+    PART_PREFIX = "part-"
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _session_dir(self, upload_id: str) -> Path | None:
+        """Get a session's directory, rejecting ids that are not UUIDs."""
+        try:
+            return self.root / uuid.UUID(upload_id).hex
+        except ValueError:
+            return None
+
+    def _part_name(self, part_number: int) -> str:
+        return f"{self.PART_PREFIX}{part_number:05d}"
+
+    async def create(
+        self,
+        owner_id: int,
+        filename: str,
+        size: int,
+        part_size: int,
+        content_type: str | None = None,
+    ) -> UploadSession:
+        """Create a new upload session."""
+        session = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            owner_id=owner_id,
+            filename=filename,
+            size=size,
+            part_size=part_size,
+            content_type=content_type,
+            created_at=time.time(),
+        )
+        session_dir = self.root / session.upload_id
+
+        def write_meta() -> None:
+            session_dir.mkdir(parents=True)
+            (session_dir / self.META_FILE).write_text(json.dumps(asdict(session)))
+
+        await asyncio.to_thread(write_meta)
+        return session
+
+    async def get(self, upload_id: str) -> UploadSession | None:
+        """Get an upload session by id."""
+        session_dir = self._session_dir(upload_id)
+        if session_dir is None:
+            return None
+
+        try:
+            meta = await asyncio.to_thread((session_dir / self.META_FILE).read_text)
+        except FileNotFoundError:
+            return None
+
+        return UploadSession(**json.loads(meta))
+
+    async def save_part(
+        self, session: UploadSession, part_number: int, chunks: AsyncIterator[bytes]
+    ) -> StoredFile:
+        """Stream one part into the session.
+
+        Raises UploadSessionError if the part number is out of range or the
+        body is not exactly the part's length.
+        """
+        if not 1 <= part_number <= session.part_count:
+            raise UploadSessionError(
+                f"Part number must be between 1 and {session.part_count}"
+            )
+
+        start, end = session.part_range(part_number)
+        part_storage = FileStorage(self.root / session.upload_id)
+        stored = await part_storage.save(
+            chunks, self._part_name(part_number), max_size=end - start
+        )
+        if stored.size != end - start:
+            await asyncio.to_thread(stored.path.unlink, missing_ok=True)
+            raise UploadSessionError(
+                f"Part {part_number} must be exactly {end - start} bytes"
+            )
+
+        return stored
+
+    async def received_parts(self, session: UploadSession) -> list[int]:
+        """Get the numbers of parts received so far, in order."""
+        session_dir = self.root / session.upload_id
+
+        def list_parts() -> list[int]:
+            return sorted(
+                int(path.name.removeprefix(self.PART_PREFIX))
+                for path in session_dir.glob(f"{self.PART_PREFIX}*")
+            )
+
+        return await asyncio.to_thread(list_parts)
+
+    async def complete(self, session: UploadSession, destination: Path) -> StoredFile:
+        """Assemble all parts into destination and remove the session.
+
+        Parts are copied chunk by chunk in a worker thread, never loaded
+        whole. Raises UploadSessionError if any part is missing.
+        """
+        received = set(await self.received_parts(session))
+        missing = [
+            number
+            for number in range(1, session.part_count + 1)
+            if number not in received
+        ]
+        if missing:
+            shown = ", ".join(str(number) for number in missing[:MISSING_PARTS_SHOWN])
+            more = ", ..." if len(missing) > MISSING_PARTS_SHOWN else ""
+            raise UploadSessionError(f"Missing {len(missing)} parts: {shown}{more}")
+
+        session_dir = self.root / session.upload_id
+        parts = [
+            session_dir / self._part_name(number)
+            for number in range(1, session.part_count + 1)
+        ]
+        temp_path = destination.with_name(f".{destination.name}.part")
+        try:
+            sha256 = await asyncio.to_thread(
+                _copy_parts, parts, temp_path, settings.upload_chunk_size
+            )
+            await asyncio.to_thread(os.replace, temp_path, destination)
+        except BaseException:
+            await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+            raise
+
+        await self.abort(session)
+        return StoredFile(path=destination, size=session.size, sha256=sha256)
+
+    async def abort(self, session: UploadSession) -> None:
+        """Delete a session and its parts."""
+        await asyncio.to_thread(
+            shutil.rmtree, self.root / session.upload_id, ignore_errors=True
+        )
+
+    async def purge_expired(self, max_age: int) -> int:
+        """Delete sessions older than max_age seconds, returning the count."""
+        cutoff = time.time() - max_age
+
+        def purge() -> int:
+            if not self.root.exists():
+                return 0
+
+            purged = 0
+            for session_dir in self.root.iterdir():
+                meta_path = session_dir / self.META_FILE
+                try:
+                    created_at = json.loads(meta_path.read_text())["created_at"]
+                except (OSError, ValueError, KeyError):
+                    # Half-created session; fall back to the directory age
+                    created_at = session_dir.stat().st_mtime
+                if created_at < cutoff:
+                    shutil.rmtree(session_dir, ignore_errors=True)
+                    purged += 1
+            return purged
+
+        return await asyncio.to_thread(purge)
+
+
+class ShardedDirectory:
+    """Files spread over two levels of hash-prefix subdirectories.
+
+    A name is stored at ``root/ab/cd/name``, where ``abcd`` are the first hex
+    digits of its shard key, so no directory holds more than 256 entries per
+    level however many files are stored. Entries written before sharding sit
+    directly under root; lookups fall back to them until they are moved.
+    """
+
+    def __init__(self, root: Path, prehashed: bool = False):
+        self.root = root
+        # Prehashed names (SHA256 digests) are their own shard key
+        self.prehashed = prehashed
+
+    def shard_key(self, name: str) -> str:
+        """Get the hex digest a name is sharded by."""
+        if self.prehashed:
+            return name
+        return hashlib.sha256(name.encode()).hexdigest()
+
+    def path_for(self, name: str) -> Path:
+        """Get the sharded path of an entry."""
+        key = self.shard_key(name)
+        return self.root / key[:2] / key[2:4] / name
+
+    def flat_path_for(self, name: str) -> Path:
+        """Get the path of an entry in the old flat layout."""
+        return self.root / name
+
+    async def locate(self, name: str) -> Path | None:
+        """Find a stored file in either layout."""
+
+        def find() -> Path | None:
+            sharded = self.path_for(name)
+            # The sharded path is checked again in case the file was moved
+            # by a concurrent migration after the first check.
+            for path in (sharded, self.flat_path_for(name), sharded):
+                if path.is_file():
+                    return path
+            return None
+
+        return await asyncio.to_thread(find)
+
+    def flat_entries(self, include_dirs: bool = False) -> list[str]:
+        """List entries still in the flat layout.
+
+        Hidden entries (staging and temporary files) and shard directories
+        are skipped, as are other directories unless include_dirs is set.
+        """
+        if not self.root.exists():
+            return []
+
+        return sorted(
+            path.name
+            for path in self.root.iterdir()
+            if not path.name.startswith(".")
+            and (path.is_file() or (include_dirs and path.is_dir()))
+            and not (path.is_dir() and len(path.name) == 2)
+        )
+
+    async def migrate(self, name: str) -> bool:
+        """Move a flat entry to its sharded path.
+
+        Moves are atomic renames, so readers see the entry at one path or
+        the other and never a partial copy. If the sharded entry already
+        exists the flat one is a leftover copy and is deleted. Returns False
+        if the entry no longer exists.
+        """
+        source = self.flat_path_for(name)
+        target = self.path_for(name)
+
+        def move() -> bool:
+            if not source.exists():
+                return False
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if not target.exists():
+                source.replace(target)
+            elif source.is_dir():
+                shutil.rmtree(source, ignore_errors=True)
+            else:
+                source.unlink(missing_ok=True)
+            return True
+
+        return await asyncio.to_thread(move)
+
+
+class BlobStore:
+    """Content-addressed blob files named by their SHA256 digest.
+
+    Uploads are staged under a hidden temporary name while their digest is
+    computed, then either moved into place or dropped if an identical blob
+    is already stored.
+    """
+
+    STAGING_PREFIX = ".staged-"
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.layout = ShardedDirectory(root, prehashed=True)
+
+    def path_for(self, sha256: str) -> Path:
+        """Get the path a blob is stored at."""
+        return self.layout.path_for(sha256)
+
+    async def locate(self, sha256: str) -> Path | None:
+        """Find a blob in either the sharded or the old flat layout."""
+        return await self.layout.locate(sha256)
+
+    def staging_path(self) -> Path:
+        """Get a fresh path to stage an upload at."""
+        return self.root / f"{self.STAGING_PREFIX}{generate_uuid_string()}"
+
+    async def stage(
+        self, chunks: AsyncIterator[bytes], max_size: int | None = None
+    ) -> StoredFile:
+        """Stream chunks to a staging file, hashing them on the way."""
+        staging_path = self.staging_path()
+        return await FileStorage(self.root).save(
+            chunks, staging_path.name, max_size=max_size
+        )
+
+    async def commit(self, staged: StoredFile) -> Path:
+        """Move a staged file into place unless its blob already exists."""
+        path = self.path_for(staged.sha256)
+        flat_path = self.layout.flat_path_for(staged.sha256)
+
+        def place() -> Path:
+            if flat_path.exists() and not path.exists():
+                staged.path.unlink(missing_ok=True)
+                return flat_path
+            if path.exists():
+                staged.path.unlink(missing_ok=True)
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                staged.path.replace(path)
+            return path
+
+        return await asyncio.to_thread(place)
+
+    async def discard(self, staged: StoredFile) -> None:
+        """Delete a staged file."""
+        await asyncio.to_thread(staged.path.unlink, missing_ok=True)
+
+    async def remove(self, sha256: str) -> None:
+        """Delete a blob from either layout."""
+
+        def unlink() -> None:
+            self.path_for(sha256).unlink(missing_ok=True)
+            self.layout.flat_path_for(sha256).unlink(missing_ok=True)
+
+        await asyncio.to_thread(unlink)
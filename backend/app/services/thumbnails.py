@@ -0,0 +1,270 @@
+"""
+Background generation of resized image variants.
+
+Image uploads are stored at full resolution; serving them as-is makes every
+avatar in a list cost a multi-megabyte download. After an upload commits,
+the generator below renders a fixed set of narrower variants on a process
+pool, off the request path, so downloads can ask for the size they display.
+
+Variants are keyed by the blob's SHA256, so files sharing content share
+their variants too. Pillow is an optional dependency; without it no
+variants are produced and the original is always served.
+"""
+
+import asyncio
+import json
+import logging
+import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.storage import ShardedDirectory
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - exercised only without Pillow
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+# Source extension -> (Pillow format, variant extension). GIFs are rendered
+# as a static PNG of their first frame.
+VARIANT_FORMATS = {
+    "jpg": ("JPEG", "jpg"),
+    "jpeg": ("JPEG", "jpg"),
+    "png": ("PNG", "png"),
+    "gif": ("PNG", "png"),
+}
+
+MANIFEST_FILE = "manifest.json"
+
+
+def pillow_available() -> bool:
+    """Check whether Pillow is installed."""
+    return Image is not None
+
+
+def render_variants(  # noqa: PLR0917 - run_in_executor passes arguments positionally
+    source: str,
+    target_dir: str,
+    widths: list[int],
+    image_format: str,
+    extension: str,
+    quality: int,
+) -> list[int]:
+    """Render resized copies of an image, returning the widths written.
+
+    Runs in a worker process. Only widths narrower than the image are
+    rendered; the original is already the best match for larger ones. A
+    manifest is written last so a finished set can be told from one that is
+    still being rendered.
+    """
+    target = Path(target_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    rendered = []
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        for width in sorted(widths):
+            if width >= image.width:
+                break
+
+            height = max(1, round(image.height * width / image.width))
+            variant = image.resize((width, height), Image.Resampling.LANCZOS)
+
+            path = target / f"{width}.{extension}"
+            temp_path = target / f".{width}.{extension}.part"
+            options = {"optimize": True}
+            if image_format == "JPEG":
+                options.update(quality=quality, progressive=True)
+            variant.save(temp_path, image_format, **options)
+            temp_path.replace(path)
+            rendered.append(width)
+
+    (target / MANIFEST_FILE).write_text(json.dumps({"widths": rendered}))
+    return rendered
+
+
+class ThumbnailGenerator:
+    """Render and look up image variants stored under a root directory."""
+
+    def __init__(
+        self,
+        root: Path,
+        widths: list[int],
+        executor_type: str = "process",
+        max_workers: int = 2,
+        quality: int = 85,
+    ):
+        self.root = root
+        self.layout = ShardedDirectory(root, prehashed=True)
+        self.widths = sorted(widths)
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.quality = quality
+        self._executor: Executor | None = None
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def _get_executor(self) -> Executor:
+        """Create the executor on first use."""
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="thumbnail"
+                )
+        return self._executor
+
+    @staticmethod
+    def _variant_format(filename: str) -> tuple[str, str] | None:
+        """Get the Pillow format and extension to render a file's variants in."""
+        extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+        return VARIANT_FORMATS.get(extension)
+
+    def supports(self, filename: str) -> bool:
+        """Check whether variants can be rendered for a file."""
+        return (
+            pillow_available()
+            and bool(self.widths)
+            and self._variant_format(filename) is not None
+        )
+
+    def variant_dir(self, sha256: str) -> Path:
+        """Get the directory holding a blob's variants."""
+        return self.layout.path_for(sha256)
+
+    def pick_width(self, requested: int) -> int | None:
+        """Get the narrowest variant width covering requested, if any."""
+        return next((width for width in self.widths if width >= requested), None)
+
+    def is_pending(self, sha256: str) -> bool:
+        """Check whether a blob's variants are being rendered."""
+        return sha256 in self._pending
+
+    async def find(
+        self, sha256: str, filename: str, requested: int
+    ) -> tuple[Path, int] | None:
+        """Get the variant closest to requested, as (path, width).
+
+        Returns None when the original should be served instead: the request
+        is wider than every variant, the image is narrower than the chosen
+        width, or the variants have not been rendered yet.
+        """
+        variant_format = self._variant_format(filename)
+        width = self.pick_width(requested)
+        if variant_format is None or width is None:
+            return None
+
+        path = self.variant_dir(sha256) / f"{width}.{variant_format[1]}"
+        if await asyncio.to_thread(path.is_file):
+            return path, width
+        return None
+
+    async def is_rendered(self, sha256: str) -> bool:
+        """Check whether a blob's variants have been rendered."""
+        return await asyncio.to_thread(
+            (self.variant_dir(sha256) / MANIFEST_FILE).is_file
+        )
+
+    def schedule(self, sha256: str, source: Path, filename: str) -> bool:
+        """Start rendering a blob's variants in the background.
+
+        Returns False if the file is not a supported image or its variants
+        are already being rendered.
+        """
+        if not self.supports(filename) or self.is_pending(sha256):
+            return False
+
+        task = asyncio.create_task(self._render(sha256, source, filename))
+        self._pending[sha256] = task
+        task.add_done_callback(lambda _: self._pending.pop(sha256, None))
+        return True
+
+    async def _render(self, sha256: str, source: Path, filename: str) -> None:
+        """Render variants unless they already exist."""
+        if await self.is_rendered(sha256):
+            return
+
+        image_format, extension = self._variant_format(filename)
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                self._get_executor(),
+                render_variants,
+                str(source),
+                str(self.variant_dir(sha256)),
+                self.widths,
+                image_format,
+                extension,
+                self.quality,
+            )
+        except Exception:
+            logger.warning("Failed to render variants of %s", sha256, exc_info=True)
+            # Record the failure so broken images are not retried on every
+            # download; the original keeps being served.
+            await asyncio.to_thread(self._write_manifest, sha256, [])
+
+    def _write_manifest(self, sha256: str, widths: list[int]) -> None:
+        variant_dir = self.variant_dir(sha256)
+        variant_dir.mkdir(parents=True, exist_ok=True)
+        (variant_dir / MANIFEST_FILE).write_text(json.dumps({"widths": widths}))
+
+    async def remove(self, sha256: str) -> None:
+        """Delete a blob's variants from either layout."""
+
+        def rmtree() -> None:
+            shutil.rmtree(self.variant_dir(sha256), ignore_errors=True)
+            shutil.rmtree(self.layout.flat_path_for(sha256), ignore_errors=True)
+
+        await asyncio.to_thread(rmtree)
+
+    async def wait(self) -> None:
+        """Wait for all pending renders to finish."""
+        if self._pending:
+            await asyncio.gather(*self._pending.values(), return_exceptions=True)
+
+    def shutdown(self) -> None:
+        """Cancel pending renders and shut down the executor."""
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# Global thumbnail generator
+thumbnail_generator: ThumbnailGenerator | None = None
+
+
+def init_thumbnail_generator() -> None:
+    """Initialize thumbnail generator."""
+    global thumbnail_generator  # noqa: PLW0603 - process-wide singleton
+    thumbnail_generator = ThumbnailGenerator(
+        root=Path(settings.upload_dir) / "variants",
+        widths=settings.thumbnail_widths,
+        executor_type=settings.thumbnail_executor,
+        max_workers=settings.thumbnail_workers,
+        quality=settings.thumbnail_quality,
+    )
+
+
+def close_thumbnail_generator() -> None:
+    """Shut down thumbnail generator."""
+    global thumbnail_generator  # noqa: PLW0603 - process-wide singleton
+    if thumbnail_generator:
+        thumbnail_generator.shutdown()
+        thumbnail_generator = None
+
+
+def get_thumbnail_generator() -> ThumbnailGenerator:
+    """Get thumbnail generator."""
+    if not thumbnail_generator:
+        init_thumbnail_generator()
+    return thumbnail_generator
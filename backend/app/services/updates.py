@@ -0,0 +1,50 @@
+"""
+Single-statement updates of one row.
+"""
+
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
+
+
+async def update_returning(
+    db: AsyncSession,
+    model,
+    row_id: int,
+    values: dict[str, Any],
+    *options: ORMOption,
+):
+    """Update columns of one row with a single UPDATE ... RETURNING.
+
+    Returns the updated instance, or None when no row has the id. Only
+    relationships named in options (or loaded eagerly by the mapping) are
+    fetched, and an instance already in the session is overwritten with the
+    returned row. Callers commit.
+    """
+    if not values:
+        return await db.get(model, row_id, options=options)
+
+    result = await db.execute(
+        update(model)
+        .where(model.id == row_id)
+        .values(values)
+        .returning(model)
+        .options(*options)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def update_columns(
+    db: AsyncSession, model, row_id: int, values: dict[str, Any]
+) -> bool:
+    """Update columns of one row without loading it.
+
+    Returns whether the row exists. Callers commit.
+    """
+    result = await db.execute(
+        update(model).where(model.id == row_id).values(values).returning(model.id)
+    )
+    return result.scalar_one_or_none() is not None
@@ -2,15 +2,40 @@
 User service for business logic.
 """
 
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.security import get_password_hash, verify_password
+from app.core.config import settings
+from app.core.hashing import check_password, hash_password
 from app.models.user import Role, User
+from app.schemas.common import AssignmentResult
 from app.schemas.user import UserCreate, UserProfile, UserSettings, UserUpdate
+from app.services.assignment import USER_ROLES
+from app.services.counting import CountResult, CountStrategy, count_rows
+from app.services.principal import invalidate_all_principals, invalidate_principal
+from app.services.sessions import end_user_sessions
+from app.services.updates import update_columns, update_returning
+from app.utils.pagination import KeysetPage, KeysetPaginator
+from app.utils.search import LIKE_ESCAPE, TextSearch, escape_like
+
+# Users are listed newest first; (created_at, id) is unique and indexed
+USER_PAGINATOR = KeysetPaginator(
+    [User.created_at, User.id],
+    descending=True,
+    parsers=[datetime.fromisoformat, int],
+)
+
+# User responses show each role's own fields but never its permissions
+USER_RESPONSE_LOAD = selectinload(User.roles).lazyload(Role.permissions)
+
+# Backed by the ix_user_search_trgm trigram index
+USER_SEARCH = TextSearch(
+    User.username, User.email, User.full_name, User.first_name, User.last_name
+)
 
 
 class UserService:
@@ -54,7 +79,7 @@ class UserService:
     async def create(self, user_data: UserCreate) -> User:
         """Create new user."""
         # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
 
         # Create user instance
         user = User(
@@ -77,19 +102,23 @@ class UserService:
 
         return user
 
+    async def _update_fields(self, user_id: int, values: dict) -> User | None:
+        """Write fields and return the user with the roles a response shows."""
+        user = await update_returning(
+            self.db, User, user_id, values, USER_RESPONSE_LOAD
+        )
+        await self.db.commit()
+        return user
+
     async def update(self, user_id: int, user_data: UserUpdate) -> User | None:
         """Update user."""
-        user = await self.get_by_id(user_id)
-        if not user:
-            return None
-
-        # Update fields
         update_data = user_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(user, field, value)
+        user = await self._update_fields(user_id, update_data)
 
-        await self.db.commit()
-        await self.db.refresh(user)
+        if user and "is_active" in update_data:
+            await invalidate_principal(user_id)
+            if not user.is_active:
+                await end_user_sessions(user_id)
 
         return user
 
@@ -97,37 +126,17 @@ class UserService:
         self, user_id: int, profile_data: UserProfile
     ) -> User | None:
         """Update user profile."""
-        user = await self.get_by_id(user_id)
-        if not user:
-            return None
-
-        # Update profile fields
-        update_data = profile_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(user, field, value)
-
-        await self.db.commit()
-        await self.db.refresh(user)
-
-        return user
+        return await self._update_fields(
+            user_id, profile_data.model_dump(exclude_unset=True)
+        )
 
     async def update_settings(
         self, user_id: int, settings_data: UserSettings
     ) -> User | None:
         """Update user settings."""
-        user = await self.get_by_id(user_id)
-        if not user:
-            return None
-
-        # Update settings fields
-        update_data = settings_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(user, field, value)
-
-        await self.db.commit()
-        await self.db.refresh(user)
-
-        return user
+        return await self._update_fields(
+            user_id, settings_data.model_dump(exclude_unset=True)
+        )
 
     async def change_password(
         self, user_id: int, current_password: str, new_password: str
@@ -138,11 +147,11 @@ class UserService:
             return False
 
         # Verify current password
-        if not verify_password(current_password, user.hashed_password):
+        if not await check_password(current_password, user.hashed_password):
             return False
 
         # Update password
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await hash_password(new_password)
         user.password_changed_at = datetime.now(UTC).replace(tzinfo=None)
 
         await self.db.commit()
@@ -155,7 +164,7 @@ class UserService:
             return False
 
         # Update password
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await hash_password(new_password)
         user.password_changed_at = datetime.now(UTC).replace(tzinfo=None)
 
         await self.db.commit()
@@ -169,60 +178,40 @@ class UserService:
 
         await self.db.delete(user)
         await self.db.commit()
+        await invalidate_principal(user_id)
+        await end_user_sessions(user_id)
         return True
 
     async def deactivate(self, user_id: int) -> bool:
         """Deactivate user."""
-        user = await self.get_by_id(user_id)
-        if not user:
+        if not await update_columns(self.db, User, user_id, {"is_active": False}):
             return False
 
-        user.is_active = False
         await self.db.commit()
+        await invalidate_principal(user_id)
+        await end_user_sessions(user_id)
         return True
 
     async def activate(self, user_id: int) -> bool:
         """Activate user."""
-        user = await self.get_by_id(user_id)
-        if not user:
+        if not await update_columns(self.db, User, user_id, {"is_active": True}):
             return False
 
-        user.is_active = True
         await self.db.commit()
+        await invalidate_principal(user_id)
         return True
 
-    async def update_last_login(self, user_id: int) -> None:
-        """Update user's last login time."""
-        user = await self.get_by_id(user_id)
-        if user:
-            user.last_login = datetime.now(UTC).replace(tzinfo=None)
-            await self.db.commit()
-
-    async def get_users(
+    def _build_filters(
         self,
-        skip: int = 0,
-        limit: int = 100,
         search: str | None = None,
         department: str | None = None,
         is_active: bool | None = None,
-    ) -> tuple[list[User], int]:
-        """Get users with pagination and filters."""
-        query = select(User).options(selectinload(User.roles))
-
-        # Apply filters
+    ) -> list:
+        """Build filter conditions for user listings."""
         conditions = []
 
         if search:
-            search_term = f"%{search}%"
-            conditions.append(
-                or_(
-                    User.username.ilike(search_term),
-                    User.email.ilike(search_term),
-                    User.full_name.ilike(search_term),
-                    User.first_name.ilike(search_term),
-                    User.last_name.ilike(search_term),
-                )
-            )
+            conditions.append(USER_SEARCH.condition(search))
 
         if department:
             conditions.append(User.department == department)
@@ -230,24 +219,137 @@ class UserService:
         if is_active is not None:
             conditions.append(User.is_active == is_active)
 
+        return conditions
+
+    async def stream_users(
+        self,
+        search: str | None = None,
+        department: str | None = None,
+        is_active: bool | None = None,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[User]:
+        """Stream users matching filters in id order.
+
+        Rows are fetched through a server-side cursor in batches of
+        batch_size, so memory use does not grow with the table.
+        """
+        query = (
+            select(User)
+            .options(selectinload(User.roles))
+            .where(*self._build_filters(search, department, is_active))
+            .order_by(User.id)
+            .execution_options(yield_per=batch_size or settings.export_batch_size)
+        )
+
+        result = await self.db.stream_scalars(query)
+        async for user in result:
+            yield user
+
+    async def count_users(
+        self,
+        search: str | None = None,
+        department: str | None = None,
+        is_active: bool | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> CountResult:
+        """Count users matching filters."""
+        conditions = self._build_filters(search, department, is_active)
+
+        return await count_rows(
+            self.db,
+            User,
+            conditions,
+            count_strategy,
+            filters={
+                "search": search,
+                "department": department,
+                "is_active": is_active,
+            },
+        )
+
+    async def get_users(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        *,
+        search: str | None = None,
+        department: str | None = None,
+        is_active: bool | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> tuple[list[User], CountResult]:
+        """Get users with pagination and filters."""
+        query = select(User).options(selectinload(User.roles))
+
+        # Apply filters
+        conditions = self._build_filters(search, department, is_active)
         if conditions:
             query = query.where(and_(*conditions))
 
         # Get total count
-        count_query = select(func.count(User.id))
-        if conditions:
-            count_query = count_query.where(and_(*conditions))
+        total = await self.count_users(search, department, is_active, count_strategy)
 
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
-        # Get paginated results
+        # Get paginated results, best matches first when searching
+        if search:
+            query = query.order_by(USER_SEARCH.rank(search).desc())
         query = query.offset(skip).limit(limit).order_by(User.created_at.desc())
         result = await self.db.execute(query)
         users = result.scalars().all()
 
         return list(users), total
 
+    async def get_users_by_cursor(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        search: str | None = None,
+        department: str | None = None,
+        is_active: bool | None = None,
+    ) -> KeysetPage[User]:
+        """Get users after a cursor, newest first.
+
+        Raises ValueError if the cursor is malformed.
+        """
+        query = select(User).options(selectinload(User.roles))
+
+        conditions = self._build_filters(search, department, is_active)
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        query = USER_PAGINATOR.apply(query, cursor, limit)
+        result = await self.db.execute(query)
+        users = result.scalars().all()
+
+        return USER_PAGINATOR.paginate(users, cursor, limit)
+
+    async def suggest_users(self, prefix: str, limit: int = 10) -> list:
+        """Get active users whose username or full name starts with prefix.
+
+        Returns lightweight rows (id and name columns) ordered by username,
+        served by the lower() text_pattern_ops indexes without counting.
+        """
+        pattern = f"{escape_like(prefix.lower())}%"
+        query = (
+            select(
+                User.id,
+                User.username,
+                User.full_name,
+                User.first_name,
+                User.last_name,
+            )
+            .where(
+                or_(
+                    func.lower(User.username).like(pattern, escape=LIKE_ESCAPE),
+                    func.lower(User.full_name).like(pattern, escape=LIKE_ESCAPE),
+                ),
+                User.is_active.is_(True),
+            )
+            .order_by(func.lower(User.username))
+            .limit(limit)
+        )
+
+        result = await self.db.execute(query)
+        return list(result.all())
+
     async def assign_role(self, user_id: int, role_id: int) -> bool:
         """Assign role to user."""
         user = await self.get_by_id(user_id)
@@ -264,6 +366,7 @@ class UserService:
         if role not in user.roles:
             user.roles.append(role)
             await self.db.commit()
+            await invalidate_principal(user_id)
 
         return True
 
@@ -283,9 +386,55 @@ class UserService:
         if role in user.roles:
             user.roles.remove(role)
             await self.db.commit()
+            await invalidate_principal(user_id)
 
         return True
 
+    async def assign_roles(
+        self, user_ids: list[int], role_ids: list[int]
+    ) -> AssignmentResult | None:
+        """Assign every role to every user in one statement.
+
+        Returns None if any user or role does not exist.
+        """
+        if not await USER_ROLES.all_exist(self.db, user_ids, role_ids):
+            return None
+
+        added = await USER_ROLES.add(self.db, user_ids, role_ids)
+        await self.db.commit()
+        if added:
+            await invalidate_all_principals()
+
+        return AssignmentResult(added=added)
+
+    async def remove_roles(
+        self, user_ids: list[int], role_ids: list[int]
+    ) -> AssignmentResult:
+        """Remove every role from every user in one statement."""
+        removed = await USER_ROLES.remove(self.db, user_ids, role_ids)
+        await self.db.commit()
+        if removed:
+            await invalidate_all_principals()
+
+        return AssignmentResult(removed=removed)
+
+    async def set_roles(
+        self, user_id: int, role_ids: list[int]
+    ) -> AssignmentResult | None:
+        """Replace a user's roles with exactly role_ids.
+
+        Returns None if the user or any role does not exist.
+        """
+        if not await USER_ROLES.all_exist(self.db, [user_id], role_ids):
+            return None
+
+        added, removed = await USER_ROLES.replace(self.db, user_id, role_ids)
+        await self.db.commit()
+        if added or removed:
+            await invalidate_principal(user_id)
+
+        return AssignmentResult(added=added, removed=removed)
+
     async def username_exists(
         self, username: str, exclude_user_id: int | None = None
     ) -> bool:
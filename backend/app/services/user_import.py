@@ -0,0 +1,201 @@
+"""
+Bulk user import service.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.hashing import hash_password
+from app.models.user import User
+from app.schemas.user import UserCreate, UserImportError, UserImportResult
+from app.utils.records import Record
+
+# Unique user columns and how conflicts on them are reported
+UNIQUE_FIELDS = {
+    "username": "Username",
+    "email": "Email",
+    "employee_id": "Employee ID",
+}
+
+
+class UserImportService:
+    """Create users in bulk from a stream of records.
+
+    Rows are validated with the UserCreate rules and imported in batches:
+    one query checks a whole batch for existing users, passwords are hashed
+    concurrently on the password hashing pool, and the batch is written with
+    a single multi-row INSERT in its own transaction. A failing row never
+    stops the import; it is reported by row number instead.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def import_users(
+        self,
+        records: AsyncIterator[Record],
+        batch_size: int | None = None,
+        max_errors: int | None = None,
+    ) -> UserImportResult:
+        """Import users from records, returning a per-row report."""
+        batch_size = batch_size or settings.user_import_batch_size
+        max_errors = (
+            settings.user_import_max_errors if max_errors is None else max_errors
+        )
+        report = _ImportReport(max_errors)
+        seen = {field: set() for field in UNIQUE_FIELDS}
+        batch = []
+
+        async for record in records:
+            report.result.total += 1
+            if record.error:
+                report.fail(record.row, record.error)
+                continue
+
+            try:
+                user_data = UserCreate.model_validate(record.data)
+            except ValidationError as e:
+                report.fail_validation(record.row, e)
+                continue
+
+            duplicate = next(
+                (
+                    field
+                    for field in UNIQUE_FIELDS
+                    if getattr(user_data, field) is not None
+                    and getattr(user_data, field) in seen[field]
+                ),
+                None,
+            )
+            if duplicate:
+                report.fail(
+                    record.row, f"Duplicate {duplicate} in import", field=duplicate
+                )
+                continue
+
+            for field in UNIQUE_FIELDS:
+                if getattr(user_data, field) is not None:
+                    seen[field].add(getattr(user_data, field))
+
+            batch.append((record.row, user_data))
+            if len(batch) >= batch_size:
+                await self._import_batch(batch, report)
+                batch = []
+
+        if batch:
+            await self._import_batch(batch, report)
+
+        return report.result
+
+    async def _find_existing(self, users: list[UserCreate]) -> dict[str, set]:
+        """Get the unique values of a batch that are already taken."""
+        conditions = []
+        for field in UNIQUE_FIELDS:
+            values = {getattr(user, field) for user in users} - {None}
+            if values:
+                conditions.append(getattr(User, field).in_(values))
+
+        result = await self.db.execute(
+            select(User.username, User.email, User.employee_id).where(or_(*conditions))
+        )
+
+        existing = {field: set() for field in UNIQUE_FIELDS}
+        for row in result:
+            for field in UNIQUE_FIELDS:
+                existing[field].add(getattr(row, field))
+        for values in existing.values():
+            values.discard(None)
+        return existing
+
+    async def _import_batch(
+        self, batch: list[tuple[int, UserCreate]], report: "_ImportReport"
+    ) -> None:
+        """Insert one batch of validated users in a single transaction."""
+        existing = await self._find_existing([user for _, user in batch])
+
+        pending = []
+        for row, user_data in batch:
+            conflict = next(
+                (
+                    field
+                    for field in UNIQUE_FIELDS
+                    if getattr(user_data, field) in existing[field]
+                ),
+                None,
+            )
+            if conflict:
+                report.fail(
+                    row, f"{UNIQUE_FIELDS[conflict]} already exists", field=conflict
+                )
+            else:
+                pending.append((row, user_data))
+
+        if not pending:
+            return
+
+        hashed_passwords = await asyncio.gather(
+            *(hash_password(user_data.password) for _, user_data in pending)
+        )
+        values = [
+            {
+                **user_data.model_dump(exclude={"password"}),
+                "hashed_password": hashed_password,
+            }
+            for (_, user_data), hashed_password in zip(
+                pending, hashed_passwords, strict=True
+            )
+        ]
+
+        try:
+            # Users created since the existence check are skipped, not fatal
+            result = await self.db.execute(
+                pg_insert(User.__table__)
+                .on_conflict_do_nothing()
+                .returning(User.__table__.c.username),
+                values,
+            )
+            inserted = set(result.scalars())
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            raise
+
+        for row, user_data in pending:
+            if user_data.username in inserted:
+                report.result.imported += 1
+            else:
+                report.fail(row, "User already exists")
+
+
+class _ImportReport:
+    """Collect row failures, listing at most max_errors of them."""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.result = UserImportResult()
+
+    def _add_error(self, row: int, message: str, field: str | None = None) -> None:
+        if len(self.result.errors) < self.max_errors:
+            self.result.errors.append(
+                UserImportError(row=row, field=field, message=message)
+            )
+        else:
+            self.result.errors_truncated = True
+
+    def fail(self, row: int, message: str, field: str | None = None) -> None:
+        """Record a failed row."""
+        self.result.failed += 1
+        self._add_error(row, message, field)
+
+    def fail_validation(self, row: int, error: ValidationError) -> None:
+        """Record a row that failed validation, with one error per field."""
+        self.result.failed += 1
+        for detail in error.errors():
+            field = ".".join(str(part) for part in detail["loc"]) or None
+            self._add_error(row, detail["msg"], field)
@@ -0,0 +1,54 @@
+"""
+HTTP caching helpers.
+"""
+
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+
+def format_http_date(value: datetime) -> str:
+    """Format a datetime as an HTTP date; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weakly compare an If-None-Match header against an entity tag."""
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def is_not_modified(
+    headers: Mapping[str, str], etag: str, last_modified: datetime | None = None
+) -> bool:
+    """Check whether a conditional GET can be answered with 304.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=UTC)
+
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
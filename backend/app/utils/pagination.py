@@ -0,0 +1,135 @@
+"""
+Keyset (cursor) pagination helpers.
+"""
+
+import base64
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Select, tuple_
+
+NEXT = "next"
+PREV = "prev"
+
+
+def encode_cursor(values: list[Any], direction: str = NEXT) -> str:
+    """Encode sort key values into an opaque cursor."""
+    payload = json.dumps({"k": values, "d": direction}, default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[list[Any], str]:
+    """Decode an opaque cursor into sort key values and direction."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction = payload["k"], payload["d"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(values, list) or direction not in (NEXT, PREV):
+        raise ValueError("Invalid cursor")
+
+    return values, direction
+
+
+@dataclass
+class KeysetPage[T]:
+    """A page of keyset-paginated results."""
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+class KeysetPaginator:
+    """Paginate a query by a unique, indexed sort key.
+
+    The key columns must be unique together (e.g. ``(created_at, id)``) and
+    are all sorted in the same direction so the comparison can be written as
+    a single row-value predicate that an index on the same columns serves.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[Any],
+        descending: bool = False,
+        parsers: Sequence[Callable[[Any], Any]] | None = None,
+    ):
+        self.columns = list(columns)
+        self.descending = descending
+        self.parsers = list(parsers) if parsers else [lambda v: v] * len(columns)
+
+    def apply(self, query: Select, cursor: str | None, limit: int) -> Select:
+        """Restrict query to the page after (or before) the cursor."""
+        direction = NEXT
+        if cursor:
+            raw_values, direction = decode_cursor(cursor)
+            if len(raw_values) != len(self.columns):
+                raise ValueError("Invalid cursor")
+            try:
+                values = [
+                    parse(value)
+                    for parse, value in zip(self.parsers, raw_values, strict=True)
+                ]
+            except (TypeError, ValueError) as e:
+                # e.g. a number where a timestamp belongs
+                raise ValueError("Invalid cursor") from e
+
+            key = tuple_(*self.columns)
+            # Walking forward in a descending order means smaller keys
+            forward = (direction == NEXT) != self.descending
+            query = query.where(
+                key > tuple_(*values) if forward else key < tuple_(*values)
+            )
+
+        # Fetch backwards pages in reverse order, then flip them in paginate()
+        descending = self.descending != (direction == PREV)
+        order = [
+            column.desc() if descending else column.asc() for column in self.columns
+        ]
+
+        return query.order_by(*order).limit(limit + 1)
+
+    def paginate[T](
+        self, rows: Sequence[T], cursor: str | None, limit: int
+    ) -> KeysetPage[T]:
+        """Build a page and its cursors from rows fetched with apply()."""
+        direction = decode_cursor(cursor)[1] if cursor else NEXT
+        has_more = len(rows) > limit
+        items = list(rows[:limit])
+
+        if direction == PREV:
+            items.reverse()
+            has_prev, has_next = has_more, True
+        else:
+            has_prev, has_next = cursor is not None, has_more
+
+        if not items:
+            return KeysetPage(items=items)
+
+        return KeysetPage(
+            items=items,
+            next_cursor=encode_cursor(self._key(items[-1]), NEXT) if has_next else None,
+            prev_cursor=encode_cursor(self._key(items[0]), PREV) if has_prev else None,
+        )
+
+    def _key(self, row: Any) -> list[Any]:
+        """Extract sort key values from a row."""
+        return [getattr(row, column.key) for column in self.columns]
+
+
+def set_cursor_headers(response: Any, page: KeysetPage) -> None:
+    """Expose page cursors on responses whose body is a plain list."""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.prev_cursor:
+        response.headers["X-Prev-Cursor"] = page.prev_cursor
+
+
+def set_total_count_headers(response: Any, total: int, exact: bool = True) -> None:
+    """Expose the listing total on responses whose body is a plain list."""
+    response.headers["X-Total-Count"] = str(total)
+    response.headers["X-Total-Count-Exact"] = "true" if exact else "false"
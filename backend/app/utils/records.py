@@ -0,0 +1,292 @@
+"""
+Streaming CSV and NDJSON record readers and writers.
+
+Request bodies are decoded and split into records as chunks arrive, so an
+import of any size is parsed with memory bounded by the longest record,
+itself capped at MAX_RECORD_LENGTH.
+Exports are encoded the same way in reverse: records are written out in
+small buffers as they are produced.
+"""
+
+import codecs
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+
+# Longest line or record read, in characters; longer ones end the read
+MAX_RECORD_LENGTH = 1024 * 1024
+
+# Encoded output is flushed to the client in buffers of about this size
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Spreadsheets read CSV fields starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class RecordFormat(StrEnum):
+    """Supported record formats."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class RecordFormatError(ValueError):
+    """Raised when a body cannot be read as records at all."""
+
+
+@dataclass
+class Record:
+    """A parsed record, or the reason it could not be parsed."""
+
+    row: int
+    data: dict[str, Any] | None = None
+    error: str | None = None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode UTF-8 chunks and yield complete lines without line endings.
+
+    A leading byte order mark is dropped, as spreadsheet exports add one.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.removesuffix("\r")
+            if len(pending) > MAX_RECORD_LENGTH:
+                raise RecordFormatError(
+                    f"Line longer than {MAX_RECORD_LENGTH} characters"
+                )
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise RecordFormatError("Body is not valid UTF-8") from e
+
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+def _in_quoted_field(line: str, quoted: bool) -> bool:
+    """Tell whether a quoted field is still open after a CSV line.
+
+    As in csv.reader's default dialect, a quote only opens a field it
+    starts; inside one, doubled quotes are literal and a single one closes
+    it. quoted says whether a field was already open before the line.
+    """
+    if '"' not in line:
+        return quoted
+
+    field_start = not quoted
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if quoted:
+            if char == '"':
+                if line.startswith('"', index + 1):
+                    index += 1
+                else:
+                    quoted = False
+        elif char == '"' and field_start:
+            quoted = True
+        field_start = not quoted and char == ","
+        index += 1
+    return quoted
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """Yield CSV records as dicts keyed by the header row.
+
+    Quoted fields may span lines. Empty fields are left out so that optional
+    columns fall back to their defaults.
+    """
+    header = None
+    row = 0
+    physical = []
+    length = 0
+    quoted = False
+
+    async for line in iter_lines(chunks):
+        physical.append(line)
+        length += len(line) + 1
+        quoted = _in_quoted_field(line, quoted)
+        if quoted:
+            if length > MAX_RECORD_LENGTH:
+                raise RecordFormatError(
+                    f"Record longer than {MAX_RECORD_LENGTH} characters"
+                )
+            continue
+
+        text = "\n".join(physical)
+        physical = []
+        length = 0
+        if not text.strip():
+            continue
+
+        try:
+            fields = next(csv.reader([text], strict=True))
+        except csv.Error as e:
+            if header is None:
+                raise RecordFormatError(f"Invalid CSV header: {e}") from e
+            row += 1
+            yield Record(row=row, error=f"Invalid CSV: {e}")
+            continue
+
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+
+        row += 1
+        if len(fields) > len(header):
+            yield Record(
+                row=row,
+                error=f"Expected at most {len(header)} fields, got {len(fields)}",
+            )
+            continue
+
+        yield Record(
+            row=row,
+            data={
+                name: value
+                for name, value in zip(header, fields, strict=False)
+                if value != ""
+            },
+        )
+
+    if physical:
+        row += 1
+        yield Record(row=row, error="Unterminated quoted field")
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """Yield one JSON object per non-blank line."""
+    row = 0
+
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+
+        row += 1
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield Record(row=row, error=f"Invalid JSON: {e}")
+            continue
+
+        if not isinstance(data, dict):
+            yield Record(row=row, error="Expected a JSON object")
+            continue
+
+        yield Record(row=row, data=data)
+
+
+def iter_records(
+    chunks: AsyncIterator[bytes], record_format: RecordFormat
+) -> AsyncIterator[Record]:
+    """Read records of the given format from a stream of chunks."""
+    if record_format == RecordFormat.CSV:
+        return iter_csv_records(chunks)
+    return iter_ndjson_records(chunks)
+
+
+def _csv_value(value: Any) -> Any:
+    """Format a value for a CSV field.
+
+    Text that a spreadsheet would run as a formula is prefixed with a quote.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list | tuple):
+        value = ";".join(str(item) for item in value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def encode_records(
+    records: AsyncIterator[dict[str, Any]],
+    fieldnames: Sequence[str],
+    record_format: RecordFormat,
+) -> AsyncIterator[bytes]:
+    """Encode records as CSV (with a header row) or NDJSON."""
+    buffer = io.StringIO()
+    writer = None
+    if record_format == RecordFormat.CSV:
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(fieldnames)
+
+    async for record in records:
+        if writer:
+            writer.writerow([_csv_value(record.get(name)) for name in fieldnames])
+        else:
+            buffer.write(json.dumps(record, default=_json_default))
+            buffer.write("\n")
+
+        if buffer.tell() >= WRITE_BUFFER_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a stream of chunks into a gzip stream."""
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip container
+    async for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(
+    records: AsyncIterator[dict[str, Any]],
+    fieldnames: Sequence[str],
+    record_format: RecordFormat,
+    filename: str,
+    gzip: bool = False,
+) -> StreamingResponse:
+    """Stream records as a downloadable CSV or NDJSON file.
+
+    With gzip the file is compressed as it is written and served as a
+    .gz download.
+    """
+    chunks = encode_records(records, fieldnames, record_format)
+    filename = f"{filename}.{record_format.value}"
+    media_type = MEDIA_TYPES[record_format.value]
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
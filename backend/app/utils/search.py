@@ -0,0 +1,57 @@
+"""
+Trigram-indexed text search helpers.
+"""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, String, func, literal_column, or_
+
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term matches literally."""
+    return (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def search_document(*columns: Any) -> ColumnElement:
+    """Concatenate columns into a single searchable text expression.
+
+    Literals are inlined rather than bound so that the expression matches
+    the trigram index built over it.
+    """
+    empty = literal_column("''", String)
+    separator = literal_column("' '", String)
+
+    document = func.coalesce(columns[0], empty)
+    for column in columns[1:]:
+        document = document + separator + func.coalesce(column, empty)
+    return document
+
+
+class TextSearch:
+    """Substring and fuzzy search over several columns.
+
+    Both predicates are served by a GIN ``gin_trgm_ops`` index on
+    ``search_document(*columns)``, so a search costs an index scan instead of
+    one sequential ILIKE pass per column.
+    """
+
+    def __init__(self, *columns: Any):
+        self.document = search_document(*columns)
+
+    def condition(self, term: str) -> ColumnElement:
+        """Match rows containing term, or a word similar to it."""
+        return or_(
+            self.document.ilike(f"%{escape_like(term)}%", escape=LIKE_ESCAPE),
+            # document %> term: term is word-similar to part of the document
+            self.document.self_group().op("%>")(term),
+        )
+
+    def rank(self, term: str) -> ColumnElement:
+        """Relevance of a row for term, between 0 and 1."""
+        return func.word_similarity(term, self.document)
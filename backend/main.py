@@ -14,12 +14,34 @@ from sqlalchemy import text
 
 from app.api.auth import router as auth_router
 from app.api.files import router as files_router
+from app.api.jwks import router as jwks_router
 from app.api.permissions import router as permissions_router
 from app.api.roles import router as roles_router
 from app.api.users import router as users_router
 from app.core.config import settings
-from app.core.redis import close_redis, init_redis
+from app.core.hashing import (
+    close_password_hasher,
+    get_password_hasher,
+    init_password_hasher,
+)
+from app.core.redis import (
+    close_redis,
+    get_local_cache,
+    init_redis,
+    start_cache_invalidation_listener,
+)
+from app.core.revocation import close_token_denylist, init_token_denylist
+from app.core.signing import init_key_ring
 from app.schemas.common import HealthCheck
+from app.services.activity import close_activity_recorder, init_activity_recorder
+from app.services.permission_claims import (
+    close_permission_claims,
+    init_permission_claims,
+)
+from app.services.thumbnails import (
+    close_thumbnail_generator,
+    init_thumbnail_generator,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -36,14 +58,38 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up...")
     await init_redis()
+    await start_cache_invalidation_listener()
     logger.info("Redis initialized")
+    init_key_ring()
+    logger.info("Signing keys loaded")
+    init_token_denylist()
+    logger.info("Token denylist initialized")
+    if settings.permission_claims_enabled:
+        init_permission_claims()
+        logger.info("Permission claims initialized")
+    init_password_hasher()
+    logger.info("Password hasher initialized")
+    init_thumbnail_generator()
+    logger.info("Thumbnail generator initialized")
+    init_activity_recorder()
+    logger.info("Activity recorder initialized")
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    await close_activity_recorder()
+    logger.info("Activity recorder closed")
+    await close_permission_claims()
+    logger.info("Permission claims closed")
+    await close_token_denylist()
+    logger.info("Token denylist closed")
     await close_redis()
     logger.info("Redis closed")
+    close_password_hasher()
+    logger.info("Password hasher closed")
+    close_thumbnail_generator()
+    logger.info("Thumbnail generator closed")
 
 
 # Create FastAPI application
@@ -63,6 +109,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Next-Cursor",
+        "X-Prev-Cursor",
+        "X-Total-Count",
+        "X-Total-Count-Exact",
+    ],
 )
 
 # Add trusted host middleware
@@ -118,12 +170,17 @@ async def health_check():
 
     overall_status = "healthy" if db_status == "connected" and redis_status == "connected" else "unhealthy"
 
+    # Worker-local counters: hashing queue depth and L1 cache hit rates
+    local_cache = get_local_cache()
+
     return HealthCheck(
         status=overall_status,
         timestamp=datetime.now(UTC).isoformat(),
         version=settings.app_version,
         database=db_status,
         redis=redis_status,
+        password_hasher=get_password_hasher().get_stats(),
+        local_cache=local_cache.get_stats() if local_cache else None,
     )
 
 
@@ -146,6 +203,7 @@ app.include_router(users_router, prefix="/api/users", tags=["Users"])
 app.include_router(roles_router, prefix="/api/roles", tags=["Roles"])
 app.include_router(permissions_router, prefix="/api/permissions", tags=["Permissions"])
 app.include_router(files_router, prefix="/api/files", tags=["Files"])
+app.include_router(jwks_router, tags=["Authentication"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""
+Generate a JWT signing key for the key directory.
+
+Writes <kid>.pem with a new ES256 (P-256) private key into
+JWT_SIGNING_KEYS_DIR. The key is published in the JWKS right away; set
+JWT_ACTIVE_KID to its kid once other services have picked it up.
+"""
+
+import argparse
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from app.core.config import settings
+
+
+def generate_signing_key(directory: Path, kid: str) -> Path:
+    """Write a new private key as <kid>.pem, returning its path."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{kid}.pem"
+    pem = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    # Exclusive create, so an existing key is never overwritten
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--kid",
+        default=datetime.now(UTC).strftime("%Y-%m-%d"),
+        help="key id (default: today's date)",
+    )
+    parser.add_argument(
+        "--dir",
+        default=settings.jwt_signing_keys_dir,
+        help="key directory (default: JWT_SIGNING_KEYS_DIR)",
+    )
+    args = parser.parse_args()
+    if not args.dir:
+        parser.error("no key directory: pass --dir or set JWT_SIGNING_KEYS_DIR")
+
+    try:
+        path = generate_signing_key(Path(args.dir), args.kid)
+        print(f"✅ Wrote signing key {path}")  # noqa: T201
+    except FileExistsError:
+        print(f"❌ A key with kid {args.kid!r} already exists")  # noqa: T201
+        raise
@@ -0,0 +1,66 @@
+"""
+Move uploads from the flat directory layout to the sharded one.
+
+Safe to run while the application is serving requests: every entry is moved
+with a single atomic rename, and downloads and deletes look in both layouts
+until the move is done. Re-running it only moves what is still left.
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.storage import ShardedDirectory
+
+
+async def migrate_directory(
+    directory: ShardedDirectory, include_dirs: bool = False, dry_run: bool = False
+) -> int:
+    """Move a directory's flat entries into shards, returning how many moved."""
+    names = await asyncio.to_thread(directory.flat_entries, include_dirs)
+    if dry_run:
+        return len(names)
+
+    moved = 0
+    for name in names:
+        if await directory.migrate(name):
+            moved += 1
+    return moved
+
+
+async def migrate_upload_layout(dry_run: bool = False):
+    """Shard legacy uploads, blobs and image variants."""
+    upload_dir = Path(settings.upload_dir)
+    print(f"🚀 Migrating uploads in {upload_dir}...")  # noqa: T201
+
+    directories = [
+        ("legacy files", ShardedDirectory(upload_dir), False),
+        ("blobs", ShardedDirectory(upload_dir / "blobs", prehashed=True), False),
+        (
+            "variant sets",
+            ShardedDirectory(upload_dir / "variants", prehashed=True),
+            True,
+        ),
+    ]
+
+    try:
+        for label, directory, include_dirs in directories:
+            moved = await migrate_directory(directory, include_dirs, dry_run)
+            verb = "Would move" if dry_run else "Moved"
+            print(f"✅ {verb} {moved} {label}")  # noqa: T201
+
+        print("🎉 Upload layout migration completed successfully!")  # noqa: T201
+
+    except Exception as e:
+        print(f"❌ Upload layout migration failed: {e}")  # noqa: T201
+        raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only count what would be moved"
+    )
+    args = parser.parse_args()
+    asyncio.run(migrate_upload_layout(dry_run=args.dry_run))
@@ -4,20 +4,28 @@ Pytest configuration and fixtures.
 
 import os
 import sys
+import uuid
+from datetime import UTC, datetime
 
 import httpx
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.core import mirror, revocation
+from app.core.config import settings
 from app.core.database import Base
-from app.core.deps import get_db
+from app.core.deps import get_db, get_session_factory
+from app.core.revocation import TokenDenylist
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.services import permission_claims, sessions
+from app.services.sessions import SessionRegistry
 from main import app
 
 # Test database URL
@@ -44,6 +52,7 @@ async def db_session():
     """Create a test database session."""
     # Create tables
     async with test_engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
 
@@ -61,12 +70,21 @@ async def db_session():
 
 
 @pytest_asyncio.fixture(scope="function")
-async def client(db_session: AsyncSession):
+async def client(db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch):
     """Create a test client."""
     def override_get_db():
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestSessionLocal
+
+    # Tables are recreated per test, so user ids repeat; never serve a
+    # principal cached by an earlier test, nor revoke by an earlier cutoff.
+    monkeypatch.setattr(settings, "auth_cache_enabled", False)
+    monkeypatch.setattr(revocation, "token_denylist", TokenDenylist())
+    monkeypatch.setattr(
+        sessions, "session_registry", SessionRegistry(namespace=f"test:{uuid.uuid4().hex}")
+    )
 
     async with AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
@@ -74,6 +92,49 @@ async def client(db_session: AsyncSession):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to the test database."""
+    return TestSessionLocal
+
+
+def naive_utc(*args: int) -> datetime:
+    """A naive datetime meaning UTC, as timestamps are stored in the database."""
+    return datetime(*args, tzinfo=UTC).replace(tzinfo=None)
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis commands Redis mirrors use."""
+
+    def __init__(self):
+        self.values = {}
+        self.published = []
+        self.exists_calls = 0
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = str(value)
+
+    async def exists(self, key):
+        self.exists_calls += 1
+        return int(key in self.values)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.fixture
+def redis_client(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    """Serve the token denylist's and permission claims' Redis calls from memory."""
+    client = FakeRedis()
+
+    async def get_redis():
+        return client
+
+    for module in (mirror, revocation, permission_claims):
+        monkeypatch.setattr(module, "get_redis", get_redis)
+    return client
+
+
 @pytest_asyncio.fixture
 async def test_user(db_session: AsyncSession) -> User:
     """Create a test user."""
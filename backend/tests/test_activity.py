@@ -0,0 +1,81 @@
+"""
+Write-behind activity recording tests.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.user import User
+from app.services.activity import ActivityRecorder
+from app.services.user import UserService
+from tests.conftest import naive_utc
+
+
+def _at(hour: int) -> datetime:
+    """A naive UTC time on a fixed day, as stored in the database."""
+    return naive_utc(2024, 5, 1, hour)
+
+
+class TestActivityBuffer:
+    """Activity buffering test cases."""
+
+    def test_latest_time_kept(self):
+        """Test each user keeps only its latest time per kind."""
+        recorder = ActivityRecorder(async_sessionmaker())
+
+        recorder.record_seen(1, _at(12))
+        recorder.record_seen(1, _at(11))
+        recorder.record_login(2, _at(9))
+
+        assert recorder.pending == 3
+        assert recorder._pending["last_seen"] == {
+            1: _at(12),
+            2: _at(9),
+        }
+
+    def test_early_flush_requested(self):
+        """Test a full buffer wakes the flusher before the interval ends."""
+        recorder = ActivityRecorder(async_sessionmaker(), max_pending=2)
+
+        recorder.record_seen(1)
+        assert not recorder._flush_requested.is_set()
+
+        recorder.record_seen(2)
+        assert recorder._flush_requested.is_set()
+
+
+class TestActivityFlush:
+    """Activity flush test cases."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_batches(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+        admin_user: User,
+    ):
+        """Test buffered times reach the database and never move backwards."""
+        recorder = ActivityRecorder(session_factory, batch_size=1)
+        updated_at = test_user.updated_at
+
+        recorder.record_login(test_user.id, _at(12))
+        recorder.record_seen(admin_user.id, _at(8))
+        assert await recorder.flush() == 3
+        assert recorder.pending == 0
+
+        recorder.record_seen(test_user.id, _at(10))
+        await recorder.flush()
+
+        db_session.expire_all()
+        user = await UserService(db_session).get_by_id(test_user.id)
+        assert user.last_login == _at(12)
+        assert user.last_seen == _at(12)
+        assert user.updated_at == updated_at
+
+    @pytest.mark.asyncio
+    async def test_flush_empty(self):
+        """Test flushing an empty buffer does nothing."""
+        assert await ActivityRecorder(async_sessionmaker()).flush() == 0
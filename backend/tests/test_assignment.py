@@ -0,0 +1,112 @@
+"""
+Bulk role and permission assignment tests.
+"""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.services.permission import PermissionService
+from app.services.role import RoleService
+from app.services.user import UserService
+
+
+class TestUserRoleAssignment:
+    """Bulk user role assignment test cases."""
+
+    @pytest.mark.asyncio
+    async def test_assign_and_remove_roles(
+        self, db_session: AsyncSession, test_user: User, admin_user: User
+    ):
+        """Test every pair is linked once and diff counts are returned."""
+        role_service = RoleService(db_session)
+        roles = [await role_service.get_by_name(name) for name in ("admin", "user")]
+        role_ids = [role.id for role in roles]
+        user_service = UserService(db_session)
+
+        result = await user_service.assign_roles(
+            [test_user.id, admin_user.id], role_ids
+        )
+        assert (result.added, result.removed) == (4, 0)
+
+        result = await user_service.assign_roles([test_user.id], role_ids)
+        assert result.added == 0
+
+        result = await user_service.remove_roles(
+            [test_user.id, admin_user.id], [role_ids[0]]
+        )
+        assert result.removed == 2
+
+        db_session.expire_all()
+        user = await user_service.get_by_id(test_user.id)
+        assert [role.name for role in user.roles] == ["user"]
+
+    @pytest.mark.asyncio
+    async def test_assign_unknown_role(self, db_session: AsyncSession, test_user: User):
+        """Test nothing is assigned when an id does not exist."""
+        result = await UserService(db_session).assign_roles([test_user.id], [999])
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_set_roles(self, db_session: AsyncSession, admin_user: User):
+        """Test replacing roles adds and removes only the difference."""
+        role_service = RoleService(db_session)
+        admin_role = await role_service.get_by_name("admin")
+        user_role = await role_service.get_by_name("user")
+        user_service = UserService(db_session)
+
+        result = await user_service.set_roles(
+            admin_user.id, [admin_role.id, user_role.id]
+        )
+        assert (result.added, result.removed) == (2, 1)
+
+        result = await user_service.set_roles(admin_user.id, [])
+        assert (result.added, result.removed) == (0, 2)
+
+
+class TestRolePermissionAssignment:
+    """Bulk role permission assignment test cases."""
+
+    @pytest.mark.asyncio
+    async def test_set_permissions(self, db_session: AsyncSession, admin_user: User):
+        """Test replacing a role's permissions."""
+        role_service = RoleService(db_session)
+        user_role = await role_service.get_by_name("user")
+        permission_service = PermissionService(db_session)
+        role_read = await permission_service.get_by_name("role:read")
+        user_read = await permission_service.get_by_name("user:read")
+
+        result = await role_service.set_permissions(
+            user_role.id, [user_read.id, role_read.id]
+        )
+
+        assert (result.added, result.removed) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_bulk_assign_api(
+        self, client: AsyncClient, admin_headers: dict, db_session: AsyncSession
+    ):
+        """Test the bulk assignment endpoint reports added links."""
+        role_service = RoleService(db_session)
+        role_ids = [
+            (await role_service.get_by_name(name)).id for name in ("admin", "user")
+        ]
+        permission = await PermissionService(db_session).get_by_name("system:admin")
+
+        response = await client.post(
+            "/api/roles/permissions/bulk-assign",
+            json={"role_ids": role_ids, "permission_ids": [permission.id]},
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"added": 2, "removed": 0}
+
+        response = await client.post(
+            "/api/roles/permissions/bulk-assign",
+            json={"role_ids": [999], "permission_ids": [permission.id]},
+            headers=admin_headers,
+        )
+        assert response.status_code == 404
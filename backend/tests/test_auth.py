@@ -114,6 +114,16 @@ class TestAuthAPI:
         assert response.status_code == 200
         assert "Logged out successfully" in response.json()["message"]
 
+    @pytest.mark.asyncio
+    async def test_logout_revokes_token(self, client: AsyncClient, auth_headers: dict):
+        """Test the access token is rejected after logout."""
+        response = await client.post("/api/auth/logout", headers=auth_headers)
+        assert response.status_code == 200
+
+        response = await client.get("/api/auth/me", headers=auth_headers)
+
+        assert response.status_code == 401
+
     @pytest.mark.asyncio
     async def test_register_success(self, client: AsyncClient, db_session: AsyncSession):
         """Test successful user registration."""
@@ -0,0 +1,119 @@
+"""
+Local cache tests.
+"""
+
+import json
+import time
+
+import pytest
+
+from app.core.redis import LocalCache, TieredCacheManager
+
+
+class TestLocalCache:
+    """In-process L1 cache test cases."""
+
+    def test_hit_and_miss_counters(self):
+        """Test hits and misses are counted."""
+        cache = LocalCache(max_size=10, ttl=30)
+
+        assert cache.get("missing") == (False, None)
+        cache.set("key", {"value": 1})
+        assert cache.get("key") == (True, {"value": 1})
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first."""
+        cache = LocalCache(max_size=2, ttl=30)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == (True, 1)
+        assert cache.get("b") == (False, None)
+        assert cache.get("c") == (True, 3)
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiration(self, monkeypatch):
+        """Test entries expire after their TTL."""
+        cache = LocalCache(max_size=10, ttl=30)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        cache.set("short", "value", ttl=5)
+        cache.set("long", "value")
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+
+        assert cache.get("short") == (False, None)
+        assert cache.get("long") == (True, "value")
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_delete_and_clear(self):
+        """Test explicit invalidation."""
+        cache = LocalCache(max_size=10, ttl=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.delete("a")
+        assert cache.get("a") == (False, None)
+
+        cache.clear()
+        assert cache.get_stats()["size"] == 0
+
+
+class RacingRedis:
+    """Redis stand-in whose reads are overtaken by an invalidation."""
+
+    def __init__(self, local: LocalCache):
+        self.local = local
+        self.values = {"key": json.dumps("old")}
+
+    async def get(self, key):
+        value = self.values.get(key)
+        # Another worker updates the key while the old value is in flight
+        self.values[key] = json.dumps("new")
+        self.local.delete(key)
+        return value
+
+    async def mget(self, keys):
+        return [await self.get(key) for key in keys]
+
+
+class TestTieredCacheManager:
+    """L1-over-Redis cache manager test cases."""
+
+    @pytest.mark.asyncio
+    async def test_read_racing_invalidation_is_not_cached(self):
+        """Test a value read before an invalidation is not kept locally."""
+        local = LocalCache(max_size=10, ttl=30)
+        cache = TieredCacheManager(RacingRedis(local), local)
+
+        assert await cache.get("key") == "old"
+        assert local.get("key") == (False, None)
+
+    @pytest.mark.asyncio
+    async def test_batch_read_racing_invalidation_is_not_cached(self):
+        """Test batch reads skip the local store after an invalidation too."""
+        local = LocalCache(max_size=10, ttl=30)
+        cache = TieredCacheManager(RacingRedis(local), local)
+
+        assert await cache.get_many(["key"]) == ["old"]
+        assert local.get("key") == (False, None)
+
+    def test_stale_generation_is_not_stored(self):
+        """Test a set tagged with an older generation is dropped."""
+        cache = LocalCache(max_size=10, ttl=30)
+        generation = cache.generation
+        cache.delete("other")
+
+        cache.set("key", 1, generation=generation)
+        assert cache.get("key") == (False, None)
+
+        cache.set("key", 1, generation=cache.generation)
+        assert cache.get("key") == (True, 1)
@@ -0,0 +1,142 @@
+"""
+Listing count strategy tests.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user import User
+from app.services import counting
+from app.services.counting import (
+    COUNT_CACHE_KEY,
+    CountResult,
+    CountStrategy,
+    count_rows,
+    cursor_page_strategy,
+    normalize_filters,
+)
+from app.services.user import UserService
+
+
+class InMemoryCache:
+    """Minimal stand-in for CacheManager backed by a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, expire=None):
+        self.data[key] = value
+        return True
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> InMemoryCache:
+    """Route cached counts to an in-memory cache."""
+    cache = InMemoryCache()
+
+    async def get_cache_manager():
+        return cache
+
+    monkeypatch.setattr(counting, "get_cache_manager", get_cache_manager)
+    return cache
+
+
+class TestNormalizeFilters:
+    """Filter normalization test cases."""
+
+    def test_equivalent_filters_match(self):
+        """Test case, whitespace and unset filters do not change the key."""
+        assert normalize_filters(
+            {"search": " Admin ", "department": None, "is_active": True}
+        ) == normalize_filters({"is_active": True, "search": "admin"})
+
+    def test_different_filters_differ(self):
+        """Test distinct filter values get distinct keys."""
+        assert normalize_filters({"is_active": True}) != normalize_filters(
+            {"is_active": False}
+        )
+
+    @pytest.mark.parametrize(
+        ("strategy", "cursor", "expected"),
+        [
+            (CountStrategy.EXACT, None, CountStrategy.EXACT),
+            (CountStrategy.EXACT, "cursor", CountStrategy.ESTIMATED),
+            (CountStrategy.CACHED, "cursor", CountStrategy.CACHED),
+        ],
+    )
+    def test_cursor_page_strategy(
+        self, strategy: CountStrategy, cursor: str | None, expected: CountStrategy
+    ):
+        """Test exact counts are only run on the first keyset page."""
+        assert cursor_page_strategy(strategy, cursor) == expected
+
+    @pytest.mark.asyncio
+    async def test_cached_count_hit(self, cache: InMemoryCache):
+        """Test cached totals are served without querying and marked inexact."""
+        key = COUNT_CACHE_KEY.format(table="user", digest=normalize_filters({}))
+        cache.data[key] = 42
+
+        result = await count_rows(None, User, [], CountStrategy.CACHED)
+
+        assert result == CountResult(total=42, exact=False)
+
+
+class TestCountStrategies:
+    """Count strategy test cases."""
+
+    @pytest.mark.asyncio
+    async def test_exact_count(self, db_session: AsyncSession, test_user: User):
+        """Test exact strategy counts matching rows."""
+        result = await UserService(db_session).count_users(search="testuser")
+
+        assert result == CountResult(total=1, exact=True)
+
+    @pytest.mark.asyncio
+    async def test_cached_count_miss(
+        self, db_session: AsyncSession, test_user: User, cache: InMemoryCache
+    ):
+        """Test a cache miss counts exactly and stores the total."""
+        service = UserService(db_session)
+
+        first = await service.count_users(
+            search="TestUser", count_strategy=CountStrategy.CACHED
+        )
+        second = await service.count_users(
+            search="testuser", count_strategy=CountStrategy.CACHED
+        )
+
+        assert first == CountResult(total=1, exact=True)
+        assert second == CountResult(total=1, exact=False)
+        assert len(cache.data) == 1
+
+    @pytest.mark.asyncio
+    async def test_small_estimate_is_counted_exactly(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        """Test estimates below the threshold fall back to an exact count."""
+        result = await UserService(db_session).count_users(
+            is_active=True, count_strategy=CountStrategy.ESTIMATED
+        )
+
+        assert result == CountResult(total=1, exact=True)
+
+    @pytest.mark.asyncio
+    async def test_filtered_estimate(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test filtered estimates come from the query plan."""
+        monkeypatch.setattr(settings, "count_estimate_threshold", 0)
+
+        result = await UserService(db_session).count_users(
+            search="o'brien", is_active=True, count_strategy=CountStrategy.ESTIMATED
+        )
+
+        assert result.exact is False
+        assert result.total >= 0
@@ -0,0 +1,114 @@
+"""
+Effective permission set tests.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.permissions import EffectivePermissions
+from app.models.user import Permission, Role, User
+
+
+def make_permission(permission_id: int, name: str) -> Permission:
+    """Build a permission without touching the database."""
+    resource, action = name.split(":")
+    return Permission(
+        id=permission_id, name=name, display_name=name, resource=resource, action=action
+    )
+
+
+@pytest.fixture
+def loaded_user() -> tuple[Session, User, Role]:
+    """A user holding one role, as if both were loaded in a session."""
+    role = Role(id=1, name="editor", display_name="Editor")
+    role.permissions = [make_permission(1, "user:read")]
+    user = User(id=1, username="u", email="u@example.com", hashed_password="x")
+    user.roles = [role]
+
+    objects = (*role.permissions, role, user)
+    for obj in objects:
+        make_transient_to_detached(obj)
+    session = Session()
+    session.add_all(objects)
+    # Users loaded with their roles do not populate the role's side
+    role.__dict__.pop("users", None)
+    return session, user, role
+
+
+class TestEffectivePermissions:
+    """Effective permission set test cases."""
+
+    def test_from_roles_flattens_names(self):
+        """Test roles and their permissions are flattened into name sets."""
+        roles = [
+            SimpleNamespace(
+                name="editor",
+                permissions=[
+                    SimpleNamespace(name="user:read"),
+                    SimpleNamespace(name="user:write"),
+                ],
+            ),
+            SimpleNamespace(
+                name="viewer", permissions=[SimpleNamespace(name="user:read")]
+            ),
+        ]
+        effective = EffectivePermissions.from_roles(roles)
+
+        assert effective.roles == {"editor", "viewer"}
+        assert effective.permissions == {"user:read", "user:write"}
+        assert effective.has_permission("user:write")
+        assert not effective.has_permission("user:delete")
+        assert effective.has_role("viewer")
+        assert not effective.has_role("admin")
+
+    def test_empty(self):
+        """Test no roles grant nothing."""
+        effective = EffectivePermissions.from_roles([])
+        assert not effective.has_permission("user:read")
+        assert not effective.has_role("editor")
+
+
+class TestEffectivePermissionsCache:
+    """Cached effective permissions on loaded users."""
+
+    def test_built_once(self, loaded_user):
+        """Test the set is built once per loaded instance."""
+        _, user, _ = loaded_user
+        assert user.effective_permissions is user.effective_permissions
+
+    def test_reset_on_role_changes(self, loaded_user):
+        """Test adding or removing a role of the user drops the cached set."""
+        _, user, role = loaded_user
+        assert user.has_role("editor")
+
+        user.roles.remove(role)
+        assert not user.has_role("editor")
+
+        user.roles.append(role)
+        assert user.has_permission("user:read")
+
+    def test_reset_on_role_permission_changes(self, loaded_user):
+        """Test changing a held role's permissions drops the cached set."""
+        _, user, role = loaded_user
+        assert not user.has_permission("user:write")
+
+        role.permissions.append(make_permission(2, "user:write"))
+        assert user.has_permission("user:write")
+
+        role.permissions.remove(role.permissions[0])
+        assert not user.has_permission("user:read")
+
+        role.permissions = []
+        assert not user.has_permission("user:write")
+
+    def test_reset_through_loaded_role_users(self, loaded_user):
+        """Test users reached through the role's own collection are reset."""
+        session, user, role = loaded_user
+        session.expunge(user)
+        role.__dict__["users"] = [user]
+        assert not user.has_permission("user:write")
+
+        role.permissions.append(make_permission(2, "user:write"))
+        assert user.has_permission("user:write")
@@ -0,0 +1,172 @@
+"""
+Streaming export tests.
+"""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.utils.records import RecordFormat, encode_records, gzip_chunks
+from tests.conftest import naive_utc
+
+
+async def _records(*records: dict):
+    for record in records:
+        yield record
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+class TestEncodeRecords:
+    """Record encoder test cases."""
+
+    @pytest.mark.asyncio
+    async def test_csv(self):
+        """Test CSV output has a header row and formatted values."""
+        body = await _collect(
+            encode_records(
+                _records(
+                    {
+                        "name": "ann",
+                        "active": True,
+                        "roles": ["admin", "user"],
+                        "seen": naive_utc(2024, 5, 1, 12, 30),
+                        "note": None,
+                    }
+                ),
+                ["name", "active", "roles", "seen", "note"],
+                RecordFormat.CSV,
+            )
+        )
+
+        assert body.decode() == (
+            "name,active,roles,seen,note\nann,true,admin;user,2024-05-01T12:30:00,\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_csv_formulas_are_escaped(self):
+        """Test text a spreadsheet would evaluate is written as plain text."""
+        body = await _collect(
+            encode_records(
+                _records(
+                    {"name": "=1+1", "note": "@SUM(A1)", "roles": ["-x"], "id": -1},
+                    {"name": "\tann", "note": "a=b", "roles": [], "id": 2},
+                ),
+                ["name", "note", "roles", "id"],
+                RecordFormat.CSV,
+            )
+        )
+
+        assert list(csv.reader(io.StringIO(body.decode()))) == [
+            ["name", "note", "roles", "id"],
+            ["'=1+1", "'@SUM(A1)", "'-x", "-1"],
+            ["'\tann", "a=b", "", "2"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_ndjson(self):
+        """Test NDJSON output has one object per line."""
+        body = await _collect(
+            encode_records(
+                _records({"id": 1, "roles": ["admin"]}, {"id": 2, "roles": []}),
+                ["id", "roles"],
+                RecordFormat.NDJSON,
+            )
+        )
+
+        lines = body.decode().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"id": 1, "roles": ["admin"]},
+            {"id": 2, "roles": []},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_large_exports_are_chunked(self):
+        """Test output is flushed in several chunks rather than buffered."""
+        records = _records(*({"id": i, "name": "x" * 100} for i in range(2000)))
+
+        chunks = [
+            chunk
+            async for chunk in encode_records(records, ["id", "name"], RecordFormat.CSV)
+        ]
+
+        assert len(chunks) > 1
+        assert len(b"".join(chunks).splitlines()) == 2001
+
+    @pytest.mark.asyncio
+    async def test_gzip(self):
+        """Test compressed output decompresses to the original stream."""
+        compressed = await _collect(gzip_chunks(_records(b"hello ", b"world")))
+
+        assert gzip.decompress(compressed) == b"hello world"
+
+
+class TestExportAPI:
+    """Export endpoint test cases."""
+
+    @pytest.mark.asyncio
+    async def test_export_users_csv(self, client: AsyncClient, admin_headers: dict):
+        """Test users are exported as a CSV download."""
+        response = await client.get("/api/users/export", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="users.csv"' in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["username"] for row in rows] == ["testadmin"]
+        assert rows[0]["roles"] == "super_admin"
+
+    @pytest.mark.asyncio
+    async def test_export_roles_ndjson_gzip(
+        self, client: AsyncClient, admin_headers: dict
+    ):
+        """Test roles are exported as gzipped NDJSON."""
+        response = await client.get(
+            "/api/roles/export",
+            params={"format": "ndjson", "gzip": "true"},
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        assert 'filename="roles.ndjson.gz"' in response.headers["content-disposition"]
+        roles = [
+            json.loads(line)
+            for line in gzip.decompress(response.content).decode().splitlines()
+        ]
+        assert {role["name"] for role in roles} == {"super_admin", "admin", "user"}
+
+    @pytest.mark.asyncio
+    async def test_export_permissions_filtered(
+        self, client: AsyncClient, admin_headers: dict
+    ):
+        """Test export filters match the listing filters."""
+        response = await client.get(
+            "/api/permissions/export",
+            params={"resource": "role"},
+            headers=admin_headers,
+        )
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert {row["action"] for row in rows} == {
+            "create",
+            "read",
+            "update",
+            "delete",
+        }
+
+    @pytest.mark.asyncio
+    async def test_export_forbidden(
+        self, client: AsyncClient, user_without_permissions: dict
+    ):
+        """Test exports need read permission."""
+        response = await client.get(
+            "/api/users/export", headers=user_without_permissions
+        )
+
+        assert response.status_code == 403
@@ -0,0 +1,192 @@
+"""
+File service tests.
+"""
+
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.file import FileBlob
+from app.models.user import User
+from app.services.file import FileService
+from app.services.storage import BlobStore
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class TestFileService:
+    """File service test cases."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_uploads_share_blob(
+        self, db_session: AsyncSession, test_user: User, tmp_path: Path
+    ):
+        """Test identical uploads reference one blob with a reference count."""
+        blobs = BlobStore(tmp_path)
+        service = FileService(db_session, blobs)
+
+        first = await service.create(
+            await blobs.stage(_chunks(b"%PDF-1.7")),
+            name="a.pdf",
+            original_filename="report.pdf",
+            owner_id=test_user.id,
+        )
+        second = await service.create(
+            await blobs.stage(_chunks(b"%PDF-1.7")),
+            name="b.pdf",
+            original_filename="report-copy.pdf",
+        )
+
+        assert first.blob_id == second.blob_id
+        blob = (await db_session.execute(select(FileBlob))).scalar_one()
+        assert blob.ref_count == 2
+        assert [p for p in tmp_path.rglob("*") if p.is_file()] == [
+            blobs.path_for(blob.sha256)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_blob_unlinked_with_last_reference(
+        self, db_session: AsyncSession, tmp_path: Path
+    ):
+        """Test a blob is only unlinked when its last file is deleted."""
+        blobs = BlobStore(tmp_path)
+        service = FileService(db_session, blobs)
+        for name in ("a.pdf", "b.pdf"):
+            await service.create(
+                await blobs.stage(_chunks(b"%PDF-1.7")),
+                name=name,
+                original_filename="report.pdf",
+            )
+        blob = (await db_session.execute(select(FileBlob))).scalar_one()
+        blob_path = blobs.path_for(blob.sha256)
+
+        assert await service.delete("a.pdf") is True
+        assert blob_path.exists()
+        assert await service.get_by_name("a.pdf") is None
+
+        assert await service.delete("b.pdf") is True
+        assert not blob_path.exists()
+        assert (await db_session.execute(select(FileBlob))).first() is None
+
+    @pytest.mark.asyncio
+    async def test_blob_kept_when_delete_fails(
+        self,
+        db_session: AsyncSession,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test content is not unlinked before the delete has committed."""
+        blobs = BlobStore(tmp_path)
+        service = FileService(db_session, blobs)
+        await service.create(
+            await blobs.stage(_chunks(b"%PDF-1.7")),
+            name="a.pdf",
+            original_filename="report.pdf",
+        )
+        blob = (await db_session.execute(select(FileBlob))).scalar_one()
+        blob_path = blobs.path_for(blob.sha256)
+
+        async def fail_commit():
+            raise ConnectionError("connection lost")
+
+        monkeypatch.setattr(db_session, "commit", fail_commit)
+        with pytest.raises(ConnectionError):
+            await service.delete("a.pdf")
+        monkeypatch.undo()
+        await db_session.rollback()
+
+        assert blob_path.exists()
+        assert await service.get_by_name("a.pdf") is not None
+
+    @pytest.mark.asyncio
+    async def test_delete_missing_file(self, db_session: AsyncSession, tmp_path: Path):
+        """Test deleting an unknown file."""
+        service = FileService(db_session, BlobStore(tmp_path))
+
+        assert await service.delete("missing.pdf") is False
+
+    @pytest.mark.asyncio
+    async def test_list_files_by_cursor(
+        self, db_session: AsyncSession, test_user: User, tmp_path: Path
+    ):
+        """Test files are listed newest first, page by page, per owner."""
+        blobs = BlobStore(tmp_path)
+        service = FileService(db_session, blobs)
+        for index in range(3):
+            await service.create(
+                await blobs.stage(_chunks(f"file {index}".encode())),
+                name=f"{index}.pdf",
+                original_filename=f"{index}.pdf",
+                owner_id=test_user.id if index else None,
+            )
+
+        first_page = await service.get_all_by_cursor(limit=2)
+        second_page = await service.get_all_by_cursor(
+            limit=2, cursor=first_page.next_cursor
+        )
+        owned = await service.get_all_by_cursor(owner_id=test_user.id)
+
+        names = [file.name for file in first_page.items + second_page.items]
+        assert sorted(names) == ["0.pdf", "1.pdf", "2.pdf"]
+        assert second_page.next_cursor is None
+        assert {file.name for file in owned.items} == {"1.pdf", "2.pdf"}
+        assert (await service.count_files(owner_id=test_user.id)).total == 2
+
+
+class TestUploadSessionEndpoints:
+    """Resumable upload session endpoint test cases."""
+
+    @pytest.fixture
+    def small_part_limits(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Allow parts down to 1KB, at most 100 of them."""
+        monkeypatch.setattr(settings, "min_upload_part_size", 1024)
+        monkeypatch.setattr(settings, "max_upload_parts", 100)
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("small_part_limits")
+    @pytest.mark.parametrize(
+        ("size", "part_size", "detail"),
+        [
+            (1073741824, 1, "Part too small"),
+            (10, 5, "Part too small"),
+            (1024000, 1024, "Too many parts"),
+        ],
+    )
+    async def test_part_limits(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        size: int,
+        part_size: int,
+        detail: str,
+    ):
+        """Test sessions needing tiny or countless parts are rejected."""
+        response = await client.post(
+            "/api/files/uploads",
+            json={"filename": "a.pdf", "size": size, "part_size": part_size},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith(detail)
+
+    @pytest.mark.asyncio
+    async def test_small_file_in_one_part(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test files smaller than the minimum part size are sent whole."""
+        response = await client.post(
+            "/api/files/uploads",
+            json={"filename": "a.pdf", "size": 10, "part_size": 10},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["part_count"] == 1
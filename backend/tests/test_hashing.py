@@ -0,0 +1,44 @@
+"""
+Password hashing pool tests.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.hashing import PasswordHasher
+
+
+class TestPasswordHasher:
+    """Password hasher test cases."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        """Test hashing and verifying on the worker pool."""
+        hasher = PasswordHasher(max_workers=2, max_concurrency=2)
+        try:
+            hashed = await hasher.hash("TestPass123!")
+
+            assert hashed != "TestPass123!"
+            assert await hasher.verify("TestPass123!", hashed) is True
+            assert await hasher.verify("WrongPass123!", hashed) is False
+            assert hasher.get_stats()["completed"] == 3
+        finally:
+            hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test that excess hashing requests queue behind the limit."""
+        hasher = PasswordHasher(max_workers=2, max_concurrency=1)
+        try:
+            hashes = await asyncio.gather(
+                *(hasher.hash(f"TestPass{i}23!") for i in range(3))
+            )
+
+            stats = hasher.get_stats()
+            assert len(set(hashes)) == 3
+            assert stats["max_waiting"] >= 2
+            assert stats["in_flight"] == 0
+            assert stats["waiting"] == 0
+        finally:
+            hasher.shutdown()
@@ -0,0 +1,59 @@
+"""
+HTTP caching helper tests.
+"""
+
+import pytest
+
+from app.utils.http import format_http_date, is_not_modified
+from tests.conftest import naive_utc
+
+ETAG = '"abc123"'
+LAST_MODIFIED = naive_utc(2026, 1, 2, 3, 4, 5, 678000)
+
+
+class TestConditionalGet:
+    """Conditional GET test cases."""
+
+    def test_format_http_date(self):
+        """Test naive datetimes are formatted as GMT."""
+        assert format_http_date(LAST_MODIFIED) == "Fri, 02 Jan 2026 03:04:05 GMT"
+
+    @pytest.mark.parametrize(
+        ("if_none_match", "expected"),
+        [
+            ('"abc123"', True),
+            ('W/"abc123"', True),
+            ('"other", "abc123"', True),
+            ("*", True),
+            ('"other"', False),
+        ],
+    )
+    def test_if_none_match(self, if_none_match: str, expected: bool):
+        """Test entity tags are compared weakly."""
+        headers = {"if-none-match": if_none_match}
+
+        assert is_not_modified(headers, ETAG, LAST_MODIFIED) is expected
+
+    @pytest.mark.parametrize(
+        ("if_modified_since", "expected"),
+        [
+            ("Fri, 02 Jan 2026 03:04:05 GMT", True),
+            ("Sat, 03 Jan 2026 00:00:00 GMT", True),
+            ("Fri, 02 Jan 2026 03:04:04 GMT", False),
+            ("not a date", False),
+        ],
+    )
+    def test_if_modified_since(self, if_modified_since: str, expected: bool):
+        """Test modification dates are compared at one-second resolution."""
+        headers = {"if-modified-since": if_modified_since}
+
+        assert is_not_modified(headers, ETAG, LAST_MODIFIED) is expected
+
+    def test_if_none_match_takes_precedence(self):
+        """Test If-Modified-Since is ignored when If-None-Match is present."""
+        headers = {
+            "if-none-match": '"other"',
+            "if-modified-since": "Sat, 03 Jan 2026 00:00:00 GMT",
+        }
+
+        assert is_not_modified(headers, ETAG, LAST_MODIFIED) is False
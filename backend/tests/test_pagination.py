@@ -0,0 +1,83 @@
+"""
+Keyset pagination helper tests.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.models.user import User
+from app.utils.pagination import (
+    NEXT,
+    PREV,
+    KeysetPaginator,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class TestCursorEncoding:
+    """Cursor encoding test cases."""
+
+    def test_round_trip(self):
+        """Test cursors decode to the values they were built from."""
+        cursor = encode_cursor(["user", "read"], PREV)
+
+        assert decode_cursor(cursor) == (["user", "read"], PREV)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor([1], "up")])
+    def test_invalid_cursor(self, cursor: str):
+        """Test malformed cursors are rejected."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestKeysetPaginator:
+    """Keyset paginator test cases."""
+
+    paginator = KeysetPaginator([User.id], parsers=[int])
+
+    def rows(self, *ids: int) -> list[SimpleNamespace]:
+        return [SimpleNamespace(id=i) for i in ids]
+
+    def test_first_page(self):
+        """Test first page has only a next cursor."""
+        page = self.paginator.paginate(self.rows(1, 2, 3), None, 2)
+
+        assert [row.id for row in page.items] == [1, 2]
+        assert decode_cursor(page.next_cursor) == ([2], NEXT)
+        assert page.prev_cursor is None
+
+    def test_last_page(self):
+        """Test last page has only a previous cursor."""
+        cursor = encode_cursor([2], NEXT)
+        page = self.paginator.paginate(self.rows(3), cursor, 2)
+
+        assert [row.id for row in page.items] == [3]
+        assert page.next_cursor is None
+        assert decode_cursor(page.prev_cursor) == ([3], PREV)
+
+    def test_previous_page_is_reversed(self):
+        """Test backwards pages are returned in natural order."""
+        cursor = encode_cursor([5], PREV)
+        page = self.paginator.paginate(self.rows(4, 3, 2), cursor, 2)
+
+        assert [row.id for row in page.items] == [3, 4]
+        assert decode_cursor(page.next_cursor) == ([4], NEXT)
+        assert decode_cursor(page.prev_cursor) == ([3], PREV)
+
+    def test_apply_rejects_wrong_key_length(self):
+        """Test cursors from a different sort key are rejected."""
+        with pytest.raises(ValueError):
+            self.paginator.apply(select(User), encode_cursor([1, 2]), 10)
+
+    def test_apply_rejects_unparsable_values(self):
+        """Test cursor values the parsers cannot read are rejected."""
+        paginator = KeysetPaginator(
+            [User.created_at, User.id], parsers=[datetime.fromisoformat, int]
+        )
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            paginator.apply(select(User), encode_cursor([123, 1]), 10)
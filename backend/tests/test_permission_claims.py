@@ -0,0 +1,275 @@
+"""
+Permission claim tests.
+"""
+
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.permissions import AuthPrincipal, EffectivePermissions, PermissionCatalog
+from app.core.security import decode_token, now_ms
+from app.models.user import User
+from app.services import permission_claims
+from app.services.permission_claims import PermissionClaims
+from app.services.principal import PrincipalService
+from tests.conftest import FakeRedis
+
+CATALOG = PermissionCatalog(
+    roles=("admin", "viewer"),
+    permissions=("user:read", "user:write", "role:read"),
+)
+
+
+def make_principal(
+    roles=(), permissions=(), is_superuser: bool = False
+) -> AuthPrincipal:
+    """Build an active principal for user 7."""
+    return AuthPrincipal(
+        id=7,
+        is_active=True,
+        is_superuser=is_superuser,
+        access=EffectivePermissions(
+            roles=frozenset(roles), permissions=frozenset(permissions)
+        ),
+    )
+
+
+@pytest.fixture
+def claims(redis_client: FakeRedis) -> PermissionClaims:
+    """Permission claims with CATALOG loaded and Redis served from memory."""
+    claims = PermissionClaims(session_factory=None)
+    claims.catalog = CATALOG
+    return claims
+
+
+def token_payload(claims: PermissionClaims, principal: AuthPrincipal) -> dict:
+    """Payload of an access token just issued to principal."""
+    return {
+        "sub": str(principal.id),
+        "iat": int(time.time()),
+        "authz": claims.encode(principal, now_ms()),
+    }
+
+
+class TestPermissionCatalog:
+    """Permission catalog test cases."""
+
+    def test_round_trip(self):
+        """Test a claim decodes to the principal it was encoded from."""
+        principal = make_principal(["viewer"], ["user:read", "role:read"])
+        claim = CATALOG.encode(principal)
+
+        assert CATALOG.decode(7, claim) == principal
+        assert claim["p"] == "BQ"
+
+    def test_superuser_and_empty_access(self):
+        """Test superusers are flagged and empty sets encode compactly."""
+        principal = make_principal(is_superuser=True)
+        claim = CATALOG.encode(principal)
+
+        assert claim == {"v": CATALOG.version, "r": "", "p": "", "su": True}
+        assert CATALOG.decode(7, claim) == principal
+
+    def test_unknown_names_not_encoded(self):
+        """Test access the catalog cannot express yields no claim."""
+        assert CATALOG.encode(make_principal(permissions=["file:read"])) is None
+
+    def test_version_follows_numbering(self):
+        """Test reordering, adding or renaming names changes the version."""
+        versions = {
+            CATALOG.version,
+            PermissionCatalog(("viewer", "admin"), CATALOG.permissions).version,
+            PermissionCatalog(CATALOG.roles, (*CATALOG.permissions, "x")).version,
+            PermissionCatalog(CATALOG.roles, ("user:read", "user:write", "x")).version,
+        }
+        assert len(versions) == 4
+        assert PermissionCatalog(CATALOG.roles, CATALOG.permissions) == CATALOG
+
+    def test_other_versions_and_malformed_claims_rejected(self):
+        """Test only well-formed claims of the same catalog are decoded."""
+        claim = CATALOG.encode(make_principal(permissions=["user:read"]))
+        other = PermissionCatalog(CATALOG.roles, ("user:write", "user:read"))
+
+        assert other.decode(7, claim) is None
+        assert CATALOG.decode(7, {**claim, "p": "_w"}) is None
+        assert CATALOG.decode(7, {**claim, "p": "!"}) is None
+        assert CATALOG.decode(7, {"v": CATALOG.version}) is None
+        assert CATALOG.decode(7, "claim") is None
+
+
+class TestPermissionClaims:
+    """Permission claims test cases."""
+
+    def test_trusted_claim(self, claims: PermissionClaims):
+        """Test a current claim is read without loading the principal."""
+        principal = make_principal(["admin"], ["user:write"])
+        assert claims.principal(token_payload(claims, principal)) == principal
+
+    def test_untrusted_claims(self, claims: PermissionClaims):
+        """Test tokens without a claim or a loaded catalog fall back."""
+        principal = make_principal(permissions=["user:read"])
+        payload = token_payload(claims, principal)
+
+        assert claims.principal({"sub": "7", "iat": int(time.time())}) is None
+        assert claims.encode(make_principal(permissions=["file:read"]), 1) is None
+        without_time = {k: v for k, v in payload["authz"].items() if k != "t"}
+        assert claims.principal({**payload, "authz": without_time}) is None
+
+        claims.catalog = None
+        assert claims.encode(principal, now_ms()) is None
+        assert claims.principal(payload) is None
+
+    @pytest.mark.asyncio
+    async def test_user_changes_stale_their_claims(self, claims: PermissionClaims):
+        """Test a user's older claims fall back after their access changes."""
+        principal = make_principal(permissions=["user:read"])
+        payload = token_payload(claims, principal)
+        other = {**payload, "sub": "8"}
+
+        await claims.mark_stale(7)
+
+        assert claims.principal(payload) is None
+        assert claims.principal(other) is not None
+        # Loaded after the change
+        time.sleep(0.002)
+        assert claims.principal(token_payload(claims, principal)) == principal
+
+    @pytest.mark.asyncio
+    async def test_claims_dated_by_load_not_issue(self, claims: PermissionClaims):
+        """Test a principal loaded before a change is stale, however late issued."""
+        principal = make_principal(permissions=["user:read"])
+        loaded_at = now_ms()
+        await claims.mark_stale(7)
+        time.sleep(0.002)
+        payload = {
+            "sub": "7",
+            "iat": int(time.time()) + 1,
+            "iat_ms": now_ms(),
+            "authz": claims.encode(principal, loaded_at),
+        }
+
+        assert claims.principal(payload) is None
+
+    @pytest.mark.asyncio
+    async def test_global_changes_stale_every_claim(
+        self, claims: PermissionClaims, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test role or permission changes stale every claim and reload."""
+        payload = token_payload(claims, make_principal(permissions=["user:read"]))
+        reloaded = []
+
+        async def load_catalog():
+            reloaded.append(True)
+
+        monkeypatch.setattr(claims, "load_catalog", load_catalog)
+        await claims.mark_stale()
+
+        assert claims.principal(payload) is None
+        assert claims.principal({**payload, "sub": "8"}) is None
+        assert reloaded == [True]
+
+    @pytest.mark.asyncio
+    async def test_unstored_cutoff_stops_claims_until_stored(
+        self,
+        claims: PermissionClaims,
+        redis_client: FakeRedis,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test a cutoff Redis missed disables claims until a reload stores it."""
+        principal = make_principal(permissions=["user:read"])
+
+        async def fail_set(key, value, ex=None):
+            raise ConnectionError("Connection refused")
+
+        monkeypatch.setattr(redis_client, "set", fail_set)
+        await claims.mark_stale(7)
+        monkeypatch.delattr(redis_client, "set")
+
+        assert claims.catalog is None
+        assert claims.encode(principal, now_ms()) is None
+        assert redis_client.published == []
+
+        async def scan():
+            return 0, {7: int(redis_client.values["auth:claims:stale:7"])}
+
+        async def load_catalog():
+            claims.catalog = CATALOG
+
+        monkeypatch.setattr(claims, "_scan", scan)
+        monkeypatch.setattr(claims, "load_catalog", load_catalog)
+        await claims.reload()
+
+        assert claims.catalog == CATALOG
+        assert len(redis_client.published) == 1
+        assert claims.user_stale_before[7] > 0
+
+    def test_mirrored_cutoffs_never_move_back(self, claims: PermissionClaims):
+        """Test replayed or reordered cutoffs keep the latest time."""
+        claims._apply({"user_id": 7, "before": 200})
+        claims._apply({"user_id": 7, "before": 100})
+        claims._apply({"user_id": None, "before": 50})
+
+        assert claims.user_stale_before == {7: 200}
+        assert claims.stale_before == 50
+
+    def test_disabled_by_default(self, monkeypatch: pytest.MonkeyPatch):
+        """Test claims are opt-in."""
+        monkeypatch.setattr(settings, "permission_claims_enabled", False)
+        assert permission_claims.get_permission_claims() is None
+
+
+class TestPermissionClaimsEndpoints:
+    """Permission claims through login and authorization."""
+
+    @pytest.fixture
+    def enabled_claims(
+        self,
+        client: AsyncClient,
+        session_factory: async_sessionmaker[AsyncSession],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> PermissionClaims:
+        """Enable permission claims against the test database."""
+        claims = PermissionClaims(session_factory)
+        monkeypatch.setattr(settings, "permission_claims_enabled", True)
+        monkeypatch.setattr(permission_claims, "permission_claims", claims)
+        return claims
+
+    @pytest.mark.asyncio
+    async def test_authorized_from_claim(
+        self,
+        client: AsyncClient,
+        admin_user: User,
+        enabled_claims: PermissionClaims,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test a fresh claim authorizes without loading the principal."""
+        await enabled_claims.load_catalog()
+        response = await client.post(
+            "/api/auth/login",
+            json={"username": "testadmin", "password": "AdminPass123!"},
+        )
+        token = response.json()["access_token"]
+        assert decode_token(token)["authz"]["v"] == enabled_claims.catalog.version
+
+        loads = []
+        original_get = PrincipalService.get
+
+        async def counting_get(self, user_id):
+            loads.append(user_id)
+            return await original_get(self, user_id)
+
+        monkeypatch.setattr(PrincipalService, "get", counting_get)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = await client.get("/api/roles/", headers=headers)
+        assert response.status_code == 200
+        assert loads == []
+
+        # After a change to the user's roles the claim is no longer trusted
+        await enabled_claims.mark_stale(admin_user.id)
+        response = await client.get("/api/roles/", headers=headers)
+        assert response.status_code == 200
+        assert loads == [admin_user.id]
@@ -0,0 +1,90 @@
+"""
+Authorization principal cache tests.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.permissions import AuthPrincipal
+from app.models.user import User
+from app.services.principal import (
+    GLOBAL_VERSION_KEY,
+    PRINCIPAL_KEY,
+    USER_VERSION_KEY,
+    PrincipalService,
+)
+
+
+class InMemoryCache:
+    """Minimal stand-in for CacheManager backed by a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get_many(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, expire=None):
+        self.data[key] = value
+        return True
+
+    async def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+
+class TestPrincipalService:
+    """Principal service test cases."""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(settings, "auth_cache_enabled", True)
+
+    @pytest.mark.asyncio
+    async def test_principal_is_cached(
+        self, db_session: AsyncSession, admin_user: User
+    ):
+        """Test principal is stored in cache after first load."""
+        cache = InMemoryCache()
+        service = PrincipalService(db_session, cache)
+
+        principal = await service.get(admin_user.id)
+
+        assert principal.is_superuser is True
+        assert principal.has_role("super_admin")
+        assert principal.has_permission("user:read")
+        cached = cache.data[PRINCIPAL_KEY.format(user_id=admin_user.id)]
+        assert cached["version"] == [0, 0]
+        assert AuthPrincipal.from_dict(cached) == principal
+
+    @pytest.mark.asyncio
+    async def test_cached_principal_served_until_invalidated(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        """Test version stamps invalidate cached principals."""
+        cache = InMemoryCache()
+        service = PrincipalService(db_session, cache)
+        key = PRINCIPAL_KEY.format(user_id=test_user.id)
+
+        await service.get(test_user.id)
+        cache.data[key]["is_active"] = False
+
+        # Served from cache while the version stamps are unchanged
+        assert (await service.get(test_user.id)).is_active is False
+
+        await cache.incr(USER_VERSION_KEY.format(user_id=test_user.id))
+        assert (await service.get(test_user.id)).is_active is True
+
+        cache.data[key]["is_active"] = False
+        await cache.incr(GLOBAL_VERSION_KEY)
+        assert (await service.get(test_user.id)).is_active is True
+
+    @pytest.mark.asyncio
+    async def test_missing_user(self, db_session: AsyncSession):
+        """Test missing users are not cached."""
+        cache = InMemoryCache()
+        service = PrincipalService(db_session, cache)
+
+        assert await service.get(999999) is None
+        assert PRINCIPAL_KEY.format(user_id=999999) not in cache.data
@@ -0,0 +1,163 @@
+"""
+Token revocation tests.
+"""
+
+import time
+
+import pytest
+
+from app.core import revocation
+from app.core.revocation import TokenDenylist, verify_active_token
+from app.core.security import create_access_token, decode_token
+from app.utils.bloom import BloomFilter
+from tests.conftest import FakeRedis
+
+
+@pytest.fixture
+def denylist(monkeypatch: pytest.MonkeyPatch) -> TokenDenylist:
+    """Use an empty token denylist."""
+    denylist = TokenDenylist(capacity=1000)
+    monkeypatch.setattr(revocation, "token_denylist", denylist)
+    return denylist
+
+
+class TestBloomFilter:
+    """Bloom filter test cases."""
+
+    def test_no_false_negatives(self):
+        """Test every added item is reported present."""
+        bloom = BloomFilter(1000, 0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+        assert len(bloom) == 1000
+
+    def test_false_positive_rate(self):
+        """Test absent items are rarely reported present."""
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestTokenDenylist:
+    """Token denylist test cases."""
+
+    @pytest.mark.asyncio
+    async def test_unrevoked_tokens_skip_redis(
+        self, denylist: TokenDenylist, redis_client: FakeRedis
+    ):
+        """Test tokens missing from the Bloom filter are answered locally."""
+        payload = decode_token(create_access_token(subject=1))
+
+        assert await denylist.is_revoked(payload) is False
+        assert redis_client.exists_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_revoke_token(self, denylist: TokenDenylist, redis_client: FakeRedis):
+        """Test a revoked token is stored until expiry and then rejected."""
+        token = create_access_token(subject=1)
+        payload = decode_token(token)
+
+        assert await denylist.revoke(payload) is True
+
+        assert f"auth:revoked:jti:{payload['jti']}" in redis_client.values
+        assert len(redis_client.published) == 1
+        assert await verify_active_token(token) is None
+        assert decode_token(token) is None
+
+    @pytest.mark.asyncio
+    async def test_bloom_hits_confirmed_with_redis(
+        self, denylist: TokenDenylist, redis_client: FakeRedis
+    ):
+        """Test revocations learned from other workers are confirmed once."""
+        payload = decode_token(create_access_token(subject=1))
+        redis_client.values[f"auth:revoked:jti:{payload['jti']}"] = "1"
+        denylist._apply({"id": payload["jti"]})
+
+        assert await denylist.is_revoked(payload) is True
+        assert await denylist.is_revoked(payload) is True
+        assert redis_client.exists_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_revoke_user(self, denylist: TokenDenylist, redis_client: FakeRedis):
+        """Test revoking a user rejects tokens issued before the cutoff only."""
+        payload = decode_token(create_access_token(subject=5))
+        other = decode_token(create_access_token(subject=6))
+
+        await denylist.revoke_user(5)
+
+        assert denylist.is_known_revoked(payload) is True
+        assert denylist.is_known_revoked(other) is False
+
+    @pytest.mark.asyncio
+    async def test_token_issued_right_after_revoke_user_kept(
+        self, denylist: TokenDenylist, redis_client: FakeRedis
+    ):
+        """Test logging in again right after revoking all tokens works.
+
+        The new token is usually issued within the same second as the
+        revocation, so whole-second iat alone cannot tell them apart.
+        """
+        await denylist.revoke_user(5)
+        time.sleep(0.002)
+        token = create_access_token(subject=5)
+
+        assert denylist.is_known_revoked(decode_token(token)) is False
+        assert await verify_active_token(token) is not None
+
+    @pytest.mark.asyncio
+    async def test_revoke_user_without_iat_ms(
+        self, denylist: TokenDenylist, redis_client: FakeRedis
+    ):
+        """Test tokens with only iat count as issued at the start of its second."""
+        payload = dict(decode_token(create_access_token(subject=5)))
+        del payload["iat_ms"]
+        await denylist.revoke_user(5)
+        cutoff = denylist.user_cutoffs[5]
+
+        assert denylist.is_known_revoked(payload) is True
+        assert (
+            denylist.is_known_revoked({**payload, "iat": cutoff // 1000 + 1}) is False
+        )
+
+    @pytest.mark.asyncio
+    async def test_expired_token_not_revoked(self, denylist: TokenDenylist):
+        """Test expired tokens are not stored."""
+        assert await denylist.revoke({"jti": "x", "exp": time.time() - 1}) is False
+
+    @pytest.mark.asyncio
+    async def test_revoke_session(
+        self, denylist: TokenDenylist, redis_client: FakeRedis
+    ):
+        """Test revoking a session rejects every token carrying its sid."""
+        payload = {**decode_token(create_access_token(subject=1)), "sid": "s1"}
+
+        await denylist.revoke_session("s1", 60)
+
+        assert "auth:revoked:sid:s1" in redis_client.values
+        assert await denylist.is_revoked(payload) is True
+        assert await denylist.is_revoked({**payload, "sid": "s2"}) is False
+
+    @pytest.mark.asyncio
+    async def test_reload_replays_revocations_during_scan(
+        self, denylist: TokenDenylist, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test revocations arriving while Redis is scanned survive the reload."""
+        denylist._apply({"id": "expired"})
+
+        async def scan():
+            denylist._apply({"id": "during-scan"})
+            return ["stored"], {5: 1000}
+
+        monkeypatch.setattr(denylist, "_scan", scan)
+        await denylist.reload()
+
+        assert "stored" in denylist.bloom
+        assert "during-scan" in denylist.bloom
+        assert "expired" not in denylist.bloom
+        assert denylist.user_cutoffs == {5: 1000}
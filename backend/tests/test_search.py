@@ -0,0 +1,76 @@
+"""
+Trigram search tests.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.services.role import RoleService
+from app.services.user import UserService
+from app.utils.search import escape_like
+
+
+class TestEscapeLike:
+    """LIKE escaping test cases."""
+
+    @pytest.mark.parametrize(
+        ("term", "expected"),
+        [
+            ("admin", "admin"),
+            ("50%", "50\\%"),
+            ("first_name", "first\\_name"),
+            ("a\\b", "a\\\\b"),
+        ],
+    )
+    def test_escape_like(self, term: str, expected: str):
+        """Test wildcards and the escape character are escaped."""
+        assert escape_like(term) == expected
+
+
+class TestUserSearch:
+    """User search test cases."""
+
+    @pytest.mark.asyncio
+    async def test_substring_match(self, db_session: AsyncSession, test_user: User):
+        """Test substrings of any searched column match."""
+        users, total = await UserService(db_session).get_users(search="EXAMPLE.COM")
+
+        assert [user.username for user in users] == ["testuser"]
+        assert total.total == 1
+
+    @pytest.mark.asyncio
+    async def test_fuzzy_match(self, db_session: AsyncSession, test_user: User):
+        """Test misspelled terms still find similar words."""
+        users, _ = await UserService(db_session).get_users(search="tesuser")
+
+        assert [user.username for user in users] == ["testuser"]
+
+    @pytest.mark.asyncio
+    async def test_wildcards_are_literal(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        """Test LIKE wildcards in the term are not treated as patterns."""
+        users, _ = await UserService(db_session).get_users(search="%")
+
+        assert users == []
+
+    @pytest.mark.asyncio
+    async def test_results_ranked_by_relevance(
+        self, db_session: AsyncSession, test_user: User, admin_user: User
+    ):
+        """Test closer matches are listed first."""
+        users, _ = await UserService(db_session).get_users(search="testuser")
+
+        assert users[0].username == "testuser"
+
+
+class TestRoleSearch:
+    """Role search test cases."""
+
+    @pytest.mark.asyncio
+    async def test_role_search(self, db_session: AsyncSession, admin_user: User):
+        """Test roles are found by name."""
+        roles, _ = await RoleService(db_session).get_all(search="super_admin")
+
+        assert roles[0].name == "super_admin"
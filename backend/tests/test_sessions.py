@@ -0,0 +1,175 @@
+"""
+Login session and refresh token rotation tests.
+"""
+
+import pytest
+from httpx import AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.config import settings
+from app.models.user import User
+from app.services import sessions
+
+
+async def _login(client: AsyncClient, user_agent: str = "pytest") -> dict:
+    response = await client.post(
+        "/api/auth/login",
+        json={"username": "testuser", "password": "TestPass123!"},
+        headers={"User-Agent": user_agent},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _bearer(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+class TestRefreshRotation:
+    """Refresh token rotation test cases."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_rotates_token(self, client: AsyncClient, test_user: User):
+        """Test each refresh returns a new refresh token for the same session."""
+        tokens = await _login(client)
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+
+        assert response.status_code == 200
+        rotated = response.json()
+        assert rotated["refresh_token"] != tokens["refresh_token"]
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_reuse_revokes_family(
+        self, client: AsyncClient, test_user: User, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test replaying a rotated refresh token ends the whole session."""
+        monkeypatch.setattr(settings, "refresh_reuse_grace_seconds", 0)
+        tokens = await _login(client)
+        rotated = (
+            await client.post(
+                "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+            )
+        ).json()
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert response.status_code == 401
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+        )
+        assert response.status_code == 401
+
+        response = await client.get("/api/auth/me", headers=_bearer(rotated))
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refresh_within_grace(
+        self, client: AsyncClient, test_user: User
+    ):
+        """Test a token rotated moments ago still refreshes, without rotating."""
+        tokens = await _login(client)
+        rotated = (
+            await client.post(
+                "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+            )
+        ).json()
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert response.status_code == 200
+        assert "refresh_token" not in response.json()
+
+        response = await client.get("/api/auth/me", headers=_bearer(response.json()))
+        assert response.status_code == 200
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_login_without_session_store(
+        self, client: AsyncClient, test_user: User, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test login reports the session store as unavailable."""
+
+        async def get_redis():
+            raise RedisConnectionError("Connection refused")
+
+        monkeypatch.setattr(sessions, "get_redis", get_redis)
+        response = await client.post(
+            "/api/auth/login",
+            json={"username": "testuser", "password": "TestPass123!"},
+        )
+
+        assert response.status_code == 503
+        assert response.json()["detail"] == "Session store unavailable"
+
+
+class TestSessions:
+    """Session listing and logout test cases."""
+
+    @pytest.mark.asyncio
+    async def test_list_sessions(self, client: AsyncClient, test_user: User):
+        """Test every login is listed, with the caller's own marked current."""
+        await _login(client, "laptop")
+        tokens = await _login(client, "phone")
+
+        response = await client.get("/api/auth/sessions", headers=_bearer(tokens))
+
+        assert response.status_code == 200
+        sessions = response.json()
+        assert [session["device"] for session in sessions] == ["phone", "laptop"]
+        assert [session["current"] for session in sessions] == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_end_other_session(self, client: AsyncClient, test_user: User):
+        """Test ending a session stops its refresh token."""
+        other = await _login(client, "laptop")
+        tokens = await _login(client, "phone")
+        sessions = (
+            await client.get("/api/auth/sessions", headers=_bearer(tokens))
+        ).json()
+
+        response = await client.delete(
+            f"/api/auth/sessions/{sessions[1]['session_id']}", headers=_bearer(tokens)
+        )
+
+        assert response.status_code == 200
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": other["refresh_token"]}
+        )
+        assert response.status_code == 401
+
+        response = await client.delete(
+            "/api/auth/sessions/unknown", headers=_bearer(tokens)
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_logout_everywhere(self, client: AsyncClient, test_user: User):
+        """Test logging out everywhere revokes every session's tokens."""
+        other = await _login(client, "laptop")
+        tokens = await _login(client, "phone")
+
+        response = await client.post("/api/auth/logout-all", headers=_bearer(tokens))
+
+        assert response.status_code == 200
+        for session_tokens in (other, tokens):
+            response = await client.get("/api/auth/me", headers=_bearer(session_tokens))
+            assert response.status_code == 401
+            response = await client.post(
+                "/api/auth/refresh",
+                json={"refresh_token": session_tokens["refresh_token"]},
+            )
+            assert response.status_code == 401
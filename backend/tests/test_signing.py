@@ -0,0 +1,172 @@
+"""
+JWT signing key tests.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from httpx import AsyncClient
+from jose import JWTError, jwt
+
+from app.core import signing
+from app.core.security import create_access_token, decode_token, verify_token
+from app.core.signing import KeyRing, SigningKey
+
+LEGACY = SigningKey(kid=None, algorithm="HS256", verify_key="s3cret", sign_key="s3cret")
+
+
+def write_key(
+    directory: Path,
+    kid: str,
+    public_only: bool = False,
+    key: ec.EllipticCurvePrivateKey | None = None,
+) -> None:
+    """Write a P-256 key, new unless given, or only its public half."""
+    key = key or ec.generate_private_key(ec.SECP256R1())
+    if public_only:
+        pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        (directory / f"{kid}.pub.pem").write_bytes(pem)
+    else:
+        pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        (directory / f"{kid}.pem").write_bytes(pem)
+
+
+@pytest.fixture
+def key_dir(tmp_path: Path) -> Path:
+    """Key directory with two private keys and a retired public key."""
+    write_key(tmp_path, "old")
+    write_key(tmp_path, "new")
+    write_key(tmp_path, "retired", public_only=True)
+    return tmp_path
+
+
+class TestKeyRing:
+    """Key ring test cases."""
+
+    def test_tokens_name_the_active_key(self, key_dir: Path):
+        """Test tokens are signed with the active key and carry its kid."""
+        ring = KeyRing.from_directory(key_dir, "new")
+        token = ring.encode({"sub": "1"})
+
+        assert jwt.get_unverified_header(token) == {
+            "alg": "ES256",
+            "kid": "new",
+            "typ": "JWT",
+        }
+        assert ring.decode(token) == {"sub": "1"}
+
+    def test_rotated_keys_still_verify(self, key_dir: Path):
+        """Test tokens signed before a rotation verify after it."""
+        token = KeyRing.from_directory(key_dir, "old").encode({"sub": "1"})
+        assert KeyRing.from_directory(key_dir, "new").decode(token) == {"sub": "1"}
+
+    def test_unknown_kid_rejected(self, key_dir: Path, tmp_path_factory):
+        """Test tokens from a key the ring does not hold are rejected."""
+        other_dir = tmp_path_factory.mktemp("other")
+        write_key(other_dir, "stranger")
+        token = KeyRing.from_directory(other_dir, "stranger").encode({"sub": "1"})
+
+        with pytest.raises(JWTError):
+            KeyRing.from_directory(key_dir, "new").decode(token)
+
+    def test_forged_kid_rejected(self, key_dir: Path, tmp_path_factory):
+        """Test a token claiming a known kid must be signed by that key."""
+        other_dir = tmp_path_factory.mktemp("other")
+        write_key(other_dir, "new")
+        token = KeyRing.from_directory(other_dir, "new").encode({"sub": "1"})
+
+        with pytest.raises(JWTError):
+            KeyRing.from_directory(key_dir, "new").decode(token)
+
+    def test_public_only_key_cannot_be_active(self, key_dir: Path):
+        """Test the active key needs its private half."""
+        with pytest.raises(ValueError):
+            KeyRing.from_directory(key_dir, "retired")
+        with pytest.raises(ValueError):
+            KeyRing.from_directory(key_dir, "missing")
+
+    def test_public_half_next_to_private_key(self, tmp_path: Path):
+        """Test a kid's public file beside its private key is loaded once."""
+        key = ec.generate_private_key(ec.SECP256R1())
+        write_key(tmp_path, "k1", key=key)
+        write_key(tmp_path, "k1", public_only=True, key=key)
+        ring = KeyRing.from_directory(tmp_path, "k1")
+
+        assert [entry["kid"] for entry in json.loads(ring.jwks_body)["keys"]] == ["k1"]
+        assert ring.decode(ring.encode({"sub": "1"})) == {"sub": "1"}
+
+        write_key(tmp_path, "k1", public_only=True)
+        with pytest.raises(ValueError, match="does not match"):
+            KeyRing.from_directory(tmp_path, "k1")
+
+    def test_legacy_tokens(self, key_dir: Path):
+        """Test tokens without a kid verify only if the legacy key is kept."""
+        token = jwt.encode({"sub": "1"}, "s3cret", algorithm="HS256")
+
+        assert KeyRing.from_directory(key_dir, "new", LEGACY).decode(token) == {
+            "sub": "1"
+        }
+        with pytest.raises(JWTError):
+            KeyRing.from_directory(key_dir, "new").decode(token)
+
+    def test_algorithm_pinned_per_key(self, key_dir: Path):
+        """Test a kid-less token cannot switch the legacy key's algorithm."""
+        token = jwt.encode({"sub": "1"}, "s3cret", algorithm="HS512")
+        with pytest.raises(JWTError):
+            KeyRing.from_directory(key_dir, "new", LEGACY).decode(token)
+
+    def test_jwks_publishes_public_keys(self, key_dir: Path):
+        """Test the JWKS lists every key's public half and nothing secret."""
+        ring = KeyRing.from_directory(key_dir, "new", LEGACY)
+        keys = json.loads(ring.jwks_body)["keys"]
+        assert sorted(key["kid"] for key in keys) == ["new", "old", "retired"]
+        for key in keys:
+            assert key["kty"] == "EC"
+            assert key["use"] == "sig"
+            assert "d" not in key
+
+    def test_security_uses_key_ring(
+        self, key_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test issued tokens are signed by the configured key ring."""
+        monkeypatch.setattr(signing, "key_ring", KeyRing.from_directory(key_dir, "new"))
+        token = create_access_token(subject=5)
+
+        assert jwt.get_unverified_header(token)["kid"] == "new"
+        assert verify_token(token) == "5"
+        assert decode_token(token[:-4] + "AAAA") is None
+
+
+class TestJwksEndpoint:
+    """JWKS endpoint test cases."""
+
+    @pytest.mark.asyncio
+    async def test_jwks_is_cacheable(
+        self, client: AsyncClient, key_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test the key set is served with validators and revalidated."""
+        ring = KeyRing.from_directory(key_dir, "new")
+        monkeypatch.setattr(signing, "key_ring", ring)
+
+        response = await client.get("/.well-known/jwks.json")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/jwk-set+json"
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert response.headers["etag"] == ring.jwks_etag
+        assert len(response.json()["keys"]) == 3
+
+        response = await client.get(
+            "/.well-known/jwks.json", headers={"If-None-Match": ring.jwks_etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
@@ -17,6 +17,7 @@ class TestSimple:
         data = response.json()
         assert "status" in data
         assert "timestamp" in data
+        assert "in_flight" in data["password_hasher"]
 
     @pytest.mark.asyncio
     async def test_root_endpoint(self):
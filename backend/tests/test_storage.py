@@ -0,0 +1,244 @@
+"""
+Streaming file storage tests.
+"""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from app.services.storage import (
+    BlobStore,
+    FileStorage,
+    ShardedDirectory,
+    UploadSessionError,
+    UploadSessionStore,
+    UploadTooLargeError,
+)
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class TestFileStorage:
+    """File storage test cases."""
+
+    @pytest.mark.asyncio
+    async def test_save_streams_chunks(self, tmp_path: Path):
+        """Test chunks are written in order with size and digest."""
+        storage = FileStorage(tmp_path)
+
+        stored = await storage.save(_chunks(b"hello ", b"world"), "greeting.txt")
+
+        assert stored.path == tmp_path / "greeting.txt"
+        assert stored.path.read_bytes() == b"hello world"
+        assert stored.size == 11
+        assert stored.sha256 == hashlib.sha256(b"hello world").hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_save_aborts_when_too_large(self, tmp_path: Path):
+        """Test oversized uploads stop early and leave nothing behind."""
+        storage = FileStorage(tmp_path)
+        consumed = []
+
+        async def chunks():
+            for part in (b"12345", b"67890", b"never read"):
+                consumed.append(part)
+                yield part
+
+        with pytest.raises(UploadTooLargeError):
+            await storage.save(chunks(), "big.bin", max_size=8)
+
+        assert consumed == [b"12345", b"67890"]
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_save_cleans_up_on_error(self, tmp_path: Path):
+        """Test a failing source leaves no partial file."""
+        storage = FileStorage(tmp_path)
+
+        async def chunks():
+            yield b"partial"
+            raise ConnectionError("client went away")
+
+        with pytest.raises(ConnectionError):
+            await storage.save(chunks(), "broken.bin")
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestUploadSessionStore:
+    """Resumable upload session test cases."""
+
+    @pytest.mark.asyncio
+    async def test_parts_assemble_in_order(self, tmp_path: Path):
+        """Test parts received out of order assemble into the original file."""
+        store = UploadSessionStore(tmp_path / "sessions")
+        session = await store.create(1, "report.pdf", size=10, part_size=4)
+
+        await store.save_part(session, 3, _chunks(b"89"))
+        await store.save_part(session, 1, _chunks(b"01", b"23"))
+        assert await store.received_parts(session) == [1, 3]
+
+        await store.save_part(session, 2, _chunks(b"4567"))
+        stored = await store.complete(session, tmp_path / "report.pdf")
+
+        assert stored.path.read_bytes() == b"0123456789"
+        assert stored.sha256 == hashlib.sha256(b"0123456789").hexdigest()
+        assert await store.get(session.upload_id) is None
+
+    @pytest.mark.asyncio
+    async def test_complete_requires_all_parts(self, tmp_path: Path):
+        """Test completing with missing parts fails and keeps the session."""
+        store = UploadSessionStore(tmp_path / "sessions")
+        session = await store.create(1, "report.pdf", size=10, part_size=4)
+        await store.save_part(session, 1, _chunks(b"0123"))
+
+        with pytest.raises(UploadSessionError, match=r"Missing 2 parts: 2, 3$"):
+            await store.complete(session, tmp_path / "report.pdf")
+
+        assert await store.get(session.upload_id) == session
+
+    @pytest.mark.asyncio
+    async def test_missing_parts_error_is_bounded(self, tmp_path: Path):
+        """Test only the first missing parts are named."""
+        store = UploadSessionStore(tmp_path / "sessions")
+        session = await store.create(1, "report.pdf", size=1000, part_size=1)
+
+        with pytest.raises(UploadSessionError) as error:
+            await store.complete(session, tmp_path / "report.pdf")
+
+        assert (
+            str(error.value) == "Missing 1000 parts: 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, ..."
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("part_number", "body"), [(0, b"0123"), (4, b"0123"), (1, b"012")]
+    )
+    async def test_invalid_part_rejected(
+        self, tmp_path: Path, part_number: int, body: bytes
+    ):
+        """Test out-of-range part numbers and short parts are rejected."""
+        store = UploadSessionStore(tmp_path / "sessions")
+        session = await store.create(1, "report.pdf", size=10, part_size=4)
+
+        with pytest.raises(UploadSessionError):
+            await store.save_part(session, part_number, _chunks(body))
+
+        assert await store.received_parts(session) == []
+
+    @pytest.mark.asyncio
+    async def test_oversized_part_rejected(self, tmp_path: Path):
+        """Test parts longer than their range are rejected."""
+        store = UploadSessionStore(tmp_path / "sessions")
+        session = await store.create(1, "report.pdf", size=10, part_size=4)
+
+        with pytest.raises(UploadTooLargeError):
+            await store.save_part(session, 3, _chunks(b"0123"))
+
+    @pytest.mark.asyncio
+    async def test_get_rejects_non_uuid_ids(self, tmp_path: Path):
+        """Test session ids cannot escape the session directory."""
+        store = UploadSessionStore(tmp_path / "sessions")
+
+        assert await store.get("../../etc") is None
+
+    @pytest.mark.asyncio
+    async def test_purge_expired(self, tmp_path: Path):
+        """Test expired sessions are deleted."""
+        store = UploadSessionStore(tmp_path / "sessions")
+        session = await store.create(1, "report.pdf", size=10, part_size=4)
+
+        assert await store.purge_expired(max_age=3600) == 0
+        assert await store.purge_expired(max_age=-1) == 1
+        assert await store.get(session.upload_id) is None
+
+
+class TestBlobStore:
+    """Content-addressed blob store test cases."""
+
+    @pytest.mark.asyncio
+    async def test_identical_content_stored_once(self, tmp_path: Path):
+        """Test committing identical staged content keeps a single blob."""
+        blobs = BlobStore(tmp_path)
+
+        first = await blobs.stage(_chunks(b"same bytes"))
+        second = await blobs.stage(_chunks(b"same", b" bytes"))
+        assert first.sha256 == second.sha256
+
+        await blobs.commit(first)
+        path = await blobs.commit(second)
+
+        assert path == blobs.path_for(first.sha256)
+        assert path.parent.parent.parent == tmp_path
+        assert [p for p in tmp_path.rglob("*") if p.is_file()] == [path]
+        assert path.read_bytes() == b"same bytes"
+
+    @pytest.mark.asyncio
+    async def test_flat_blob_reused(self, tmp_path: Path):
+        """Test blobs not yet migrated to shards are found and deduplicated."""
+        blobs = BlobStore(tmp_path)
+        staged = await blobs.stage(_chunks(b"old bytes"))
+        flat_path = tmp_path / staged.sha256
+        flat_path.write_bytes(b"old bytes")
+
+        assert await blobs.commit(staged) == flat_path
+        assert await blobs.locate(staged.sha256) == flat_path
+        assert not staged.path.exists()
+
+        await blobs.remove(staged.sha256)
+        assert await blobs.locate(staged.sha256) is None
+
+
+class TestShardedDirectory:
+    """Sharded directory layout test cases."""
+
+    def test_path_for(self, tmp_path: Path):
+        """Test entries are placed under two levels of hash prefixes."""
+        sha256 = hashlib.sha256(b"report.pdf").hexdigest()
+
+        assert ShardedDirectory(tmp_path).path_for("report.pdf") == (
+            tmp_path / sha256[:2] / sha256[2:4] / "report.pdf"
+        )
+        assert ShardedDirectory(tmp_path, prehashed=True).path_for(sha256) == (
+            tmp_path / sha256[:2] / sha256[2:4] / sha256
+        )
+
+    @pytest.mark.asyncio
+    async def test_migrate_moves_flat_entries(self, tmp_path: Path):
+        """Test flat entries are moved and stay reachable throughout."""
+        directory = ShardedDirectory(tmp_path)
+        (tmp_path / "a.pdf").write_bytes(b"a")
+        (tmp_path / ".b.pdf.part").write_bytes(b"partial")
+        (tmp_path / "blobs").mkdir()
+
+        assert directory.flat_entries() == ["a.pdf"]
+        assert await directory.locate("a.pdf") == tmp_path / "a.pdf"
+
+        assert await directory.migrate("a.pdf") is True
+
+        assert directory.flat_entries() == []
+        assert await directory.locate("a.pdf") == directory.path_for("a.pdf")
+        assert directory.path_for("a.pdf").read_bytes() == b"a"
+        assert await directory.migrate("a.pdf") is False
+
+    @pytest.mark.asyncio
+    async def test_migrate_directories(self, tmp_path: Path):
+        """Test directory entries are moved and leftover copies dropped."""
+        directory = ShardedDirectory(tmp_path, prehashed=True)
+        first, second = "a" * 64, "b" * 64
+        for name in (first, second):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "64.png").write_bytes(b"png")
+        directory.path_for(second).mkdir(parents=True)
+
+        assert directory.flat_entries(include_dirs=True) == [first, second]
+        for name in (first, second):
+            assert await directory.migrate(name) is True
+
+        assert directory.flat_entries(include_dirs=True) == []
+        assert (directory.path_for(first) / "64.png").exists()
+        assert not (tmp_path / second).exists()
@@ -0,0 +1,124 @@
+"""
+Image variant generation tests.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.thumbnails import MANIFEST_FILE, ThumbnailGenerator, render_variants
+
+SHA256 = "a" * 64
+
+
+def _generator(tmp_path: Path) -> ThumbnailGenerator:
+    return ThumbnailGenerator(
+        tmp_path / "variants", widths=[256, 64], executor_type="thread", max_workers=1
+    )
+
+
+def _write_image(path: Path, size: tuple[int, int], image_format: str) -> Path:
+    image_module = pytest.importorskip("PIL.Image")
+    image_module.new("RGB", size, "red").save(path, image_format)
+    return path
+
+
+class TestThumbnailGenerator:
+    """Thumbnail generator test cases."""
+
+    @pytest.mark.parametrize(
+        ("requested", "expected"),
+        [(1, 64), (64, 64), (65, 256), (256, 256), (257, None)],
+    )
+    def test_pick_width(self, tmp_path: Path, requested: int, expected: int | None):
+        """Test the narrowest variant covering the request is chosen."""
+        assert _generator(tmp_path).pick_width(requested) == expected
+
+    @pytest.mark.asyncio
+    async def test_find_falls_back_while_pending(self, tmp_path: Path):
+        """Test no variant is found before it has been rendered."""
+        assert await _generator(tmp_path).find(SHA256, "avatar.png", 32) is None
+
+    @pytest.mark.asyncio
+    async def test_find_rendered_variant(self, tmp_path: Path):
+        """Test a rendered variant is found by requested width."""
+        generator = _generator(tmp_path)
+        variant_dir = generator.variant_dir(SHA256)
+        variant_dir.mkdir(parents=True)
+        (variant_dir / "64.jpg").write_bytes(b"jpeg")
+
+        assert await generator.find(SHA256, "avatar.JPEG", 32) == (
+            variant_dir / "64.jpg",
+            64,
+        )
+        assert await generator.find(SHA256, "avatar.jpg", 100) is None
+
+    def test_non_images_not_scheduled(self, tmp_path: Path):
+        """Test only supported image types are rendered."""
+        generator = _generator(tmp_path)
+
+        assert generator.schedule(SHA256, tmp_path / SHA256, "report.pdf") is False
+        assert not generator.is_pending(SHA256)
+
+    @pytest.mark.asyncio
+    async def test_schedule_renders_in_background(self, tmp_path: Path):
+        """Test scheduled variants are rendered once, off the caller's path."""
+        source = _write_image(tmp_path / "source", (400, 200), "PNG")
+        generator = _generator(tmp_path)
+
+        assert generator.schedule(SHA256, source, "photo.png") is True
+        assert generator.schedule(SHA256, source, "photo.png") is False
+        await generator.wait()
+
+        assert await generator.is_rendered(SHA256)
+        path, width = await generator.find(SHA256, "photo.png", 100)
+        assert width == 256
+        assert path.name == "256.png"
+        generator.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_broken_image_marked_rendered(self, tmp_path: Path):
+        """Test images that fail to render are not retried."""
+        pytest.importorskip("PIL")
+        source = tmp_path / "source"
+        source.write_bytes(b"not an image")
+        generator = _generator(tmp_path)
+
+        generator.schedule(SHA256, source, "photo.jpg")
+        await generator.wait()
+
+        assert await generator.is_rendered(SHA256)
+        assert await generator.find(SHA256, "photo.jpg", 64) is None
+        generator.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_remove(self, tmp_path: Path):
+        """Test removing a blob's variants."""
+        generator = _generator(tmp_path)
+        generator.variant_dir(SHA256).mkdir(parents=True)
+
+        await generator.remove(SHA256)
+
+        assert not generator.variant_dir(SHA256).exists()
+
+
+class TestRenderVariants:
+    """Variant rendering test cases."""
+
+    def test_renders_narrower_widths_only(self, tmp_path: Path):
+        """Test variants keep the aspect ratio and never upscale."""
+        image_module = pytest.importorskip("PIL.Image")
+        source = _write_image(tmp_path / "source", (300, 150), "JPEG")
+        target = tmp_path / "variants"
+
+        rendered = render_variants(
+            str(source), str(target), [64, 256, 1024], "JPEG", "jpg", 85
+        )
+
+        assert rendered == [64, 256]
+        with image_module.open(target / "64.jpg") as variant:
+            assert variant.size == (64, 32)
+        assert not (target / "1024.jpg").exists()
+        manifest = json.loads((target / MANIFEST_FILE).read_text())
+        assert manifest == {"widths": [64, 256]}
@@ -0,0 +1,94 @@
+"""
+Verified token cache tests.
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.core import security, signing
+from app.core.security import (
+    VerifiedTokenCache,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    verify_token,
+)
+
+
+@pytest.fixture
+def token_cache(monkeypatch: pytest.MonkeyPatch) -> VerifiedTokenCache:
+    """Use an empty verified token cache."""
+    cache = VerifiedTokenCache(max_size=2)
+    monkeypatch.setattr(security, "token_cache", cache)
+    return cache
+
+
+class TestVerifiedTokenCache:
+    """Verified token cache test cases."""
+
+    def test_repeat_tokens_skip_decoding(
+        self, token_cache: VerifiedTokenCache, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test a token is only decoded the first time it is presented."""
+        token = create_access_token(subject=7)
+        assert verify_token(token) == "7"
+
+        def fail(*args, **kwargs):
+            raise AssertionError("token decoded twice")
+
+        monkeypatch.setattr(signing.jwt, "decode", fail)
+        assert verify_token(token) == "7"
+        assert len(token_cache) == 1
+
+    def test_token_type_checked_on_hits(self, token_cache: VerifiedTokenCache):
+        """Test a cached refresh token is still not accepted as an access token."""
+        token = create_refresh_token(subject=7)
+
+        assert verify_token(token, "refresh") == "7"
+        assert verify_token(token, "access") is None
+
+    def test_payloads_are_copied(self, token_cache: VerifiedTokenCache):
+        """Test changing a returned payload does not change the cached one."""
+        token = create_access_token(subject=7)
+        decode_token(token)["sub"] = "8"
+
+        assert decode_token(token)["sub"] == "7"
+        assert verify_token(token) == "7"
+
+    def test_entries_expire_with_token(self, token_cache: VerifiedTokenCache):
+        """Test entries are dropped once the token's exp has passed."""
+        token_cache.set("token", {"sub": "7", "exp": time.time() - 1})
+
+        assert token_cache.get("token") is None
+        assert len(token_cache) == 0
+
+    def test_least_recently_used_evicted(self, token_cache: VerifiedTokenCache):
+        """Test the cache never grows beyond its bound."""
+        exp = time.time() + 60
+        for token in ("a", "b", "c"):
+            token_cache.set(token, {"sub": token, "exp": exp})
+
+        assert token_cache.get("a") is None
+        assert token_cache.get("c") == {"sub": "c", "exp": exp}
+
+    def test_revocation_check(self, token_cache: VerifiedTokenCache):
+        """Test revocation checks reject cached and fresh tokens alike."""
+        revoked = set()
+        token_cache.add_revocation_check(lambda payload: payload["sub"] in revoked)
+        token = create_access_token(subject=7)
+        assert verify_token(token) == "7"
+
+        revoked.add("7")
+
+        assert verify_token(token) is None
+        assert verify_token(create_access_token(subject=7)) is None
+        assert len(token_cache) == 0
+
+    def test_expired_token_rejected(self, token_cache: VerifiedTokenCache):
+        """Test expired tokens are neither accepted nor cached."""
+        token = create_access_token(subject=7, expires_delta=timedelta(seconds=-1))
+
+        assert verify_token(token) is None
+        assert len(token_cache) == 0
@@ -0,0 +1,167 @@
+"""
+Bulk user import tests.
+"""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.services.user_import import UserImportService
+from app.utils import records as records_module
+from app.utils.records import (
+    RecordFormat,
+    RecordFormatError,
+    iter_csv_records,
+    iter_ndjson_records,
+    iter_records,
+)
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _collect(records):
+    return [record async for record in records]
+
+
+class TestRecordReaders:
+    """Streaming record reader test cases."""
+
+    @pytest.mark.asyncio
+    async def test_csv_records(self):
+        """Test CSV rows are keyed by header and empty fields dropped."""
+        records = await _collect(
+            iter_csv_records(
+                _chunks(b"\xef\xbb\xbfusername,email,full_name\r\n", b"ann,a@x.io,\r\n")
+            )
+        )
+
+        assert len(records) == 1
+        assert records[0].row == 1
+        assert records[0].data == {"username": "ann", "email": "a@x.io"}
+
+    @pytest.mark.asyncio
+    async def test_csv_split_across_chunks(self):
+        """Test records and multi-byte characters may span chunks."""
+        body = 'username,full_name\nzoe,"Zoë ""Z""\nSmith"\nbob,Bob\n'.encode()
+
+        records = await _collect(
+            iter_csv_records(
+                _chunks(*(body[i : i + 3] for i in range(0, len(body), 3)))
+            )
+        )
+
+        assert [record.data for record in records] == [
+            {"username": "zoe", "full_name": 'Zoë "Z"\nSmith'},
+            {"username": "bob", "full_name": "Bob"},
+        ]
+        assert [record.row for record in records] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_csv_row_errors(self):
+        """Test malformed rows are reported without stopping the stream."""
+        records = await _collect(
+            iter_csv_records(_chunks(b'username\nann,extra\nbob\n"open'))
+        )
+
+        assert records[0].error == "Expected at most 1 fields, got 2"
+        assert records[1].data == {"username": "bob"}
+        assert records[2].error == "Unterminated quoted field"
+
+    @pytest.mark.asyncio
+    async def test_csv_literal_quote_in_unquoted_field(self):
+        """Test a quote inside an unquoted field does not open a quoted field."""
+        records = await _collect(
+            iter_csv_records(
+                _chunks(b'username,full_name\nann,Ann O"Neil\nbob,"B, ""Bo"""\ncy,Cy\n')
+            )
+        )
+
+        assert [record.data for record in records] == [
+            {"username": "ann", "full_name": 'Ann O"Neil'},
+            {"username": "bob", "full_name": 'B, "Bo"'},
+            {"username": "cy", "full_name": "Cy"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_overlong_records_rejected(self, monkeypatch: pytest.MonkeyPatch):
+        """Test unterminated fields and lines cannot buffer without limit."""
+        monkeypatch.setattr(records_module, "MAX_RECORD_LENGTH", 16)
+
+        with pytest.raises(RecordFormatError, match="Record longer"):
+            await _collect(
+                iter_csv_records(_chunks(b'username\n"open\n', b"more text\n" * 3))
+            )
+        with pytest.raises(RecordFormatError, match="Line longer"):
+            await _collect(iter_ndjson_records(_chunks(b"x" * 10, b"x" * 10)))
+
+    @pytest.mark.asyncio
+    async def test_ndjson_records(self):
+        """Test NDJSON lines are parsed as objects, skipping blank lines."""
+        records = await _collect(
+            iter_ndjson_records(_chunks(b'{"username": "ann"}\n\n[1]\n{bad\n'))
+        )
+
+        assert records[0].data == {"username": "ann"}
+        assert records[1].error == "Expected a JSON object"
+        assert records[2].row == 3
+        assert records[2].error.startswith("Invalid JSON")
+
+    @pytest.mark.asyncio
+    async def test_invalid_utf8(self):
+        """Test undecodable bodies are rejected as a whole."""
+        with pytest.raises(RecordFormatError):
+            await _collect(iter_records(_chunks(b"\xff\xfe"), RecordFormat.NDJSON))
+
+
+class TestUserImportService:
+    """User import service test cases."""
+
+    @pytest.mark.asyncio
+    async def test_import_users(self, db_session: AsyncSession, test_user: User):
+        """Test valid rows are imported and failures reported per row."""
+        body = (
+            b"username,email,password,department\n"
+            b"alice,alice@example.com,AlicePass123!,Sales\n"
+            b"bob,bob@example.com,weak,Sales\n"
+            b"testuser,other@example.com,OtherPass123!,\n"
+            b"alice,alice2@example.com,AlicePass123!,\n"
+            b"carol,carol@example.com,CarolPass123!,\n"
+        )
+
+        result = await UserImportService(db_session).import_users(
+            iter_csv_records(_chunks(body)), batch_size=2
+        )
+
+        assert (result.total, result.imported, result.failed) == (5, 2, 3)
+        assert [(error.row, error.field) for error in result.errors] == [
+            (2, "password"),
+            (3, "username"),
+            (4, "username"),
+        ]
+        assert result.errors[1].message == "Username already exists"
+        assert result.errors[2].message == "Duplicate username in import"
+
+        alice = (
+            await db_session.execute(select(User).where(User.username == "alice"))
+        ).scalar_one()
+        assert alice.department == "Sales"
+        assert alice.hashed_password != "AlicePass123!"
+        count = await db_session.scalar(select(func.count()).select_from(User))
+        assert count == 3
+
+    @pytest.mark.asyncio
+    async def test_errors_truncated(self, db_session: AsyncSession):
+        """Test the error list is capped while failures are still counted."""
+        body = b'{"username": "x"}\n' * 3
+
+        result = await UserImportService(db_session).import_users(
+            iter_ndjson_records(_chunks(body)), max_errors=1
+        )
+
+        assert result.failed == 3
+        assert result.errors_truncated is True
+        assert {error.row for error in result.errors} == {1}
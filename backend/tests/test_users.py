@@ -7,6 +7,7 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
+from app.schemas.user import UserProfile, UserUpdate
 from app.services.user import UserService
 
 
@@ -294,3 +295,105 @@ class TestUsersAPI:
         response = await client.post(f"/api/users/{test_user.id}/deactivate", headers=admin_headers)
 
         assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_get_users_with_cursor_pagination(self, client: AsyncClient, admin_headers: dict, test_user: User):
+        """Test walking the users list with cursors."""
+        response = await client.get(
+            "/api/users/?pagination=cursor&size=1",
+            headers=admin_headers
+        )
+
+        assert response.status_code == 200
+        first_page = response.json()
+        assert len(first_page["items"]) == 1
+        assert first_page["pagination"]["page"] is None
+        assert first_page["pagination"]["prev_cursor"] is None
+        next_cursor = first_page["pagination"]["next_cursor"]
+        assert next_cursor
+
+        response = await client.get(
+            f"/api/users/?cursor={next_cursor}&size=1",
+            headers=admin_headers
+        )
+
+        assert response.status_code == 200
+        second_page = response.json()
+        assert len(second_page["items"]) == 1
+        assert second_page["items"][0]["id"] != first_page["items"][0]["id"]
+        assert second_page["pagination"]["has_prev"] is True
+
+        response = await client.get(
+            f"/api/users/?cursor={second_page['pagination']['prev_cursor']}&size=1",
+            headers=admin_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["items"][0]["id"] == first_page["items"][0]["id"]
+
+    @pytest.mark.asyncio
+    async def test_get_users_with_invalid_cursor(self, client: AsyncClient, admin_headers: dict):
+        """Test malformed cursors are rejected."""
+        response = await client.get("/api/users/?cursor=garbage", headers=admin_headers)
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_suggest_users(self, client: AsyncClient, admin_headers: dict, test_user: User):
+        """Test user suggestions match username and full name prefixes."""
+        response = await client.get("/api/users/suggest?q=TESTU", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": test_user.id, "username": "testuser", "display_name": "Test User"}
+        ]
+
+        response = await client.get("/api/users/suggest?q=test%20a", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert [item["username"] for item in response.json()] == ["testadmin"]
+
+    @pytest.mark.asyncio
+    async def test_suggest_users_treats_wildcards_literally(self, client: AsyncClient, admin_headers: dict):
+        """Test LIKE wildcards in the prefix do not match everything."""
+        response = await client.get("/api/users/suggest?q=%25", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+
+class TestUserUpdates:
+    """Single-statement user update test cases."""
+
+    @pytest.mark.asyncio
+    async def test_update_returns_fresh_user(self, db_session: AsyncSession, admin_user: User):
+        """Test the returned user carries the new values and its roles."""
+        previous_updated_at = admin_user.updated_at
+
+        user = await UserService(db_session).update_profile(
+            admin_user.id, UserProfile(full_name="Renamed User")
+        )
+
+        assert user is admin_user
+        assert user.full_name == "Renamed User"
+        assert user.updated_at >= previous_updated_at
+        assert [role.name for role in user.roles] == ["super_admin"]
+
+    @pytest.mark.asyncio
+    async def test_update_missing_user(self, db_session: AsyncSession):
+        """Test updating an unknown id returns nothing."""
+        user_service = UserService(db_session)
+
+        assert await user_service.update(999, UserUpdate(full_name="Nobody")) is None
+        assert await user_service.deactivate(999) is False
+
+    @pytest.mark.asyncio
+    async def test_deactivate(self, db_session: AsyncSession, test_user: User):
+        """Test column-only updates are visible in the session."""
+        user_service = UserService(db_session)
+
+        assert await user_service.deactivate(test_user.id) is True
+
+        db_session.expire_all()
+        user = await user_service.get_by_id(test_user.id)
+        assert user.is_active is False
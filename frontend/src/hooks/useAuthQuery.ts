@@ -112,15 +112,21 @@ export const useRefreshToken = () => {
 
   return useMutation({
     mutationFn: async () => {
-      if (!refreshToken) {
+      // 其他标签页可能已轮换refresh token，以localStorage中的为准
+      const currentRefreshToken = localStorage.getItem('refresh_token') || refreshToken;
+      if (!currentRefreshToken) {
         throw new Error('Refresh token不存在');
       }
       
-      const response = await AuthService.refreshToken(refreshToken);
+      const response = await AuthService.refreshToken(currentRefreshToken);
       return response;
     },
     onSuccess: (data) => {
-      updateToken(data.access_token);
+      // 未返回新的refresh token时（并发刷新），沿用其他标签页保存的
+      updateToken(
+        data.access_token,
+        data.refresh_token || localStorage.getItem('refresh_token') || undefined
+      );
     },
     onError: () => {
       clearAuth();
@@ -32,6 +32,31 @@ apiClient.interceptors.request.use(
   }
 );
 
+// Refresh in flight, shared by every request that failed with a 401: each
+// refresh rotates the refresh token, so only one may use it at a time
+let refreshRequest: Promise<string> | null = null;
+
+const refreshAccessToken = (refreshToken: string): Promise<string> => {
+  if (!refreshRequest) {
+    refreshRequest = axios
+      .post(`${API_BASE_URL}/api/auth/refresh`, { refresh_token: refreshToken })
+      .then((response) => {
+        const { access_token, refresh_token } = response.data;
+        localStorage.setItem('access_token', access_token);
+        // Left out when another tab rotated the token moments ago; keep
+        // the one it stored
+        if (refresh_token) {
+          localStorage.setItem('refresh_token', refresh_token);
+        }
+        return access_token;
+      })
+      .finally(() => {
+        refreshRequest = null;
+      });
+  }
+  return refreshRequest;
+};
+
 // Response interceptor to handle common errors
 apiClient.interceptors.response.use(
   (response: AxiosResponse) => {
@@ -48,12 +73,7 @@ apiClient.interceptors.response.use(
         // Try to refresh token
         const refreshToken = localStorage.getItem('refresh_token');
         if (refreshToken) {
-          const response = await axios.post(`${API_BASE_URL}/api/auth/refresh`, {
-            refresh_token: refreshToken,
-          });
-
-          const { access_token } = response.data;
-          localStorage.setItem('access_token', access_token);
+          const access_token = await refreshAccessToken(refreshToken);
 
           // Retry original request with new token
           originalRequest.headers.Authorization = `Bearer ${access_token}`;
@@ -44,8 +44,11 @@ export class AuthService {
       refresh_token: refreshToken
     });
     
-    // 更新localStorage中的token
+    // 更新localStorage中的token；refresh token每次刷新都会轮换
     localStorage.setItem('access_token', response.access_token);
+    if (response.refresh_token) {
+      localStorage.setItem('refresh_token', response.refresh_token);
+    }
     
     return response;
   }
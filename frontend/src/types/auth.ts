@@ -129,6 +129,9 @@ export interface RefreshTokenRequest {
 
 export interface RefreshTokenResponse {
   access_token: string;
+  // 刷新会轮换refresh token；并发刷新（如另一个标签页）已轮换时不返回
+  refresh_token?: string;
+  token_type: string;
   expires_in: number;
 }
 
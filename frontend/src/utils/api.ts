@@ -88,8 +88,20 @@ const handleApiError = (error: any) => {
   }
 };
 
+// 进行中的刷新，由所有401请求共享：每次刷新都会轮换refresh token
+let refreshRequest: Promise<boolean> | null = null;
+
 // Token刷新函数
-const refreshToken = async (): Promise<boolean> => {
+const refreshToken = (): Promise<boolean> => {
+  if (!refreshRequest) {
+    refreshRequest = doRefreshToken().finally(() => {
+      refreshRequest = null;
+    });
+  }
+  return refreshRequest;
+};
+
+const doRefreshToken = async (): Promise<boolean> => {
   try {
     const refreshTokenValue = localStorage.getItem('refresh_token');
     if (!refreshTokenValue) return false;
@@ -100,6 +112,10 @@ const refreshToken = async (): Promise<boolean> => {
     
     if (response.data?.access_token) {
       localStorage.setItem('access_token', response.data.access_token);
+      // 其他标签页刚轮换过时不返回，沿用其保存的refresh token
+      if (response.data.refresh_token) {
+        localStorage.setItem('refresh_token', response.data.refresh_token);
+      }
       return true;
     }
     